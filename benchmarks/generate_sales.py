@@ -0,0 +1,148 @@
+"""
+Gerador determinístico de arquivos CSV de vendas sintéticos para os benchmarks.
+
+Uso:
+    python -m benchmarks.generate_sales vendas.csv --rows 1000000 --products 5000
+"""
+import argparse
+import bz2
+import gzip
+import io
+import lzma
+import random
+from datetime import date, timedelta
+from typing import Optional, TextIO
+
+COMPRESSIONS = ('none', 'gzip', 'bz2', 'xz')
+HEADER = "produto,quantidade,preco_unitario,data_venda\n"
+WRITE_BATCH_ROWS = 10000
+
+# Tipos de linha suja, na proporção em que aparecem: erros de formatação (rejeitados),
+# campos vazios (ignorados) e datas inválidas (mantidas sem filtro de datas).
+DIRTY_ROWS = (
+    'invalid_quantity',
+    'invalid_price',
+    'missing_column',
+    'empty_quantity',
+    'invalid_date',
+)
+
+
+def open_output(file_path: str, compression: Optional[str] = None) -> TextIO:
+    """
+    Abre o arquivo de saída em modo texto, comprimido se solicitado.
+
+    O cabeçalho gzip é gravado com mtime 0 para que a mesma semente gere os mesmos bytes.
+    """
+    if not compression or compression == 'none':
+        return open(file_path, 'w', encoding='utf-8', newline='')
+    if compression == 'gzip':
+        raw = gzip.GzipFile(file_path, 'wb', mtime=0)
+    elif compression == 'bz2':
+        raw = bz2.BZ2File(file_path, 'wb')
+    elif compression == 'xz':
+        raw = lzma.LZMAFile(file_path, 'wb')
+    else:
+        raise ValueError(f"Compressão inválida: '{compression}'. Escolha entre {list(COMPRESSIONS)}")
+    return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+
+def _dirty_row(kind: str, product: str, quantity: int, price: str, sale_date: str) -> str:
+    if kind == 'invalid_quantity':
+        return f"{product},x{quantity},{price},{sale_date}\n"
+    if kind == 'invalid_price':
+        return f"{product},{quantity},R${price},{sale_date}\n"
+    if kind == 'missing_column':
+        return f"{product},{quantity}\n"
+    if kind == 'empty_quantity':
+        return f"{product},,{price},{sale_date}\n"
+    return f"{product},{quantity},{price},data-invalida\n"
+
+
+def generate_sales(
+    file_path: str,
+    rows: int = 100000,
+    products: int = 1000,
+    start_date: str = "2024-01-01",
+    days: int = 365,
+    dirty_ratio: float = 0.0,
+    compression: Optional[str] = None,
+    seed: int = 42
+) -> int:
+    """
+    Gera um CSV de vendas sintético e determinístico.
+
+    Os produtos seguem uma distribuição de cauda longa (peso 1/posição), como em vendas
+    reais, e as datas são uniformes em days dias a partir de start_date. A mesma
+    combinação de parâmetros e semente gera sempre o mesmo conteúdo.
+
+    Args:
+        file_path (str): O caminho do arquivo a ser gerado.
+        rows (int): A quantidade de linhas de dados (sem contar o cabeçalho).
+        products (int): A quantidade de produtos distintos (cardinalidade).
+        start_date (str): A primeira data de venda (YYYY-MM-DD).
+        days (int): A quantidade de dias cobertos pelas vendas.
+        dirty_ratio (float): A fração de linhas sujas, entre 0 e 1.
+        compression (Optional[str]): 'gzip', 'bz2', 'xz' ou None/'none'.
+        seed (int): A semente do gerador pseudoaleatório.
+
+    Returns:
+        int: A quantidade de linhas sujas geradas.
+    """
+    if rows < 0 or products < 1 or days < 1:
+        raise ValueError("rows deve ser >= 0; products e days devem ser >= 1.")
+    if not 0.0 <= dirty_ratio <= 1.0:
+        raise ValueError("dirty_ratio deve estar entre 0 e 1.")
+
+    rng = random.Random(seed)
+    names = [f"Produto{idx:06d}" for idx in range(products)]
+    prices = [f"{rng.randint(100, 50000) / 100:.2f}" for _ in range(products)]
+    cum_weights = []
+    total = 0.0
+    for idx in range(products):
+        total += 1.0 / (idx + 1)
+        cum_weights.append(total)
+    first_day = date.fromisoformat(start_date)
+    dates = [(first_day + timedelta(days=offset)).isoformat() for offset in range(days)]
+
+    dirty = 0
+    with open_output(file_path, compression) as output:
+        output.write(HEADER)
+        written = 0
+        while written < rows:
+            batch = min(WRITE_BATCH_ROWS, rows - written)
+            picks = rng.choices(range(products), cum_weights=cum_weights, k=batch)
+            lines = []
+            for product_id in picks:
+                product = names[product_id]
+                quantity = rng.randint(1, 10)
+                sale_date = dates[rng.randrange(days)]
+                if dirty_ratio and rng.random() < dirty_ratio:
+                    dirty += 1
+                    lines.append(_dirty_row(
+                        rng.choice(DIRTY_ROWS), product, quantity, prices[product_id], sale_date))
+                else:
+                    lines.append(f"{product},{quantity},{prices[product_id]},{sale_date}\n")
+            output.write("".join(lines))
+            written += batch
+    return dirty
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Gera um CSV de vendas sintético e determinístico.")
+    parser.add_argument('output', help="Arquivo CSV a ser gerado.")
+    parser.add_argument('--rows', type=int, default=100000, help="Quantidade de linhas (padrão: 100000).")
+    parser.add_argument('--products', type=int, default=1000, help="Quantidade de produtos distintos (padrão: 1000).")
+    parser.add_argument('--start-date', default="2024-01-01", help="Primeira data de venda (padrão: 2024-01-01).")
+    parser.add_argument('--days', type=int, default=365, help="Dias cobertos pelas vendas (padrão: 365).")
+    parser.add_argument('--dirty-ratio', type=float, default=0.0, help="Fração de linhas sujas (padrão: 0).")
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='none', help="Compressão do arquivo.")
+    parser.add_argument('--seed', type=int, default=42, help="Semente do gerador (padrão: 42).")
+    args = parser.parse_args(argv)
+    generate_sales(
+        args.output, args.rows, args.products, args.start_date, args.days,
+        args.dirty_ratio, args.compression, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+"""
+Benchmarks de CSVProcessor.process_data e SalesReport.generate.
+
+Gera (uma vez) um conjunto de dados sintético e determinístico, mede cada cenário
+(motores e opções do vendas-cli) em um processo próprio e grava os resultados em JSON,
+para que execuções em commits ou máquinas diferentes possam ser comparadas.
+
+Uso:
+    python -m benchmarks.run_benchmarks --rows 1000000 --output resultados.json
+    python -m benchmarks.run_benchmarks --scenario python --scenario mmap --repeat 5
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / 'src') not in sys.path:
+    sys.path.insert(0, str(ROOT / 'src'))
+
+from benchmarks.generate_sales import generate_sales  # noqa: E402
+from core.csv_processor import CSVProcessor  # noqa: E402
+from core.date_index import build_index  # noqa: E402
+from core.metrics import Metrics  # noqa: E402
+from reports.sales_report import SalesReport  # noqa: E402
+
+RESULTS_VERSION = 1
+logger = logging.getLogger("benchmarks")
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Cada cenário mede process_data (ou generate, com 'report') com as opções indicadas.
+# 'input' escolhe o arquivo (plain, gzip, bz2 ou xz); 'filter' aplica o filtro de datas
+# do primeiro trimestre; 'prime' executa uma vez antes das medições (cache e índice).
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'python': {},
+    'numpy': {'engine': 'numpy'},
+    'mmap': {'engine': 'mmap'},
+    'cents': {'engine': 'cents'},
+    'workers': {'workers': DEFAULT_WORKERS},
+    'date_filter': {'filter': True},
+    'date_index': {'filter': True, 'index': True},
+    'cache_warm': {'cache': True, 'prime': True},
+    'incremental': {'state_file': True},
+    'windows': {'windows': True},
+    'rollup': {'rollup': True},
+    'top': {'top': 10},
+    'heavy_hitters': {'heavy_hitters': 1000},
+    'quarantine': {'quarantine': True},
+    'metrics': {'metrics': True},
+    'gzip': {'input': 'gzip'},
+    'bz2': {'input': 'bz2'},
+    'xz': {'input': 'xz'},
+    'report_text': {'report': 'text'},
+    'report_json': {'report': 'json'},
+    'report_ndjson': {'report': 'ndjson'},
+    'report_csv': {'report': 'csv'},
+}
+
+QUARTERS = [
+    ("T1", "2024-01-01", "2024-03-31"),
+    ("T2", "2024-04-01", "2024-06-30"),
+    ("T3", "2024-07-01", "2024-09-30"),
+    ("T4", "2024-10-01", "2024-12-31"),
+]
+
+
+def dataset_paths(data_dir: str, params: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Gera (se ainda não existirem) o CSV do conjunto de dados e suas versões comprimidas.
+
+    Returns:
+        Dict[str, str]: O caminho de cada arquivo, por compressão ('plain', 'gzip', 'bz2', 'xz').
+    """
+    stem = "vendas_{rows}_{products}_{start_date}_{days}_{dirty_ratio}_{seed}".format(**params)
+    paths = {}
+    for compression, suffix in (('plain', '.csv'), ('gzip', '.csv.gz'), ('bz2', '.csv.bz2'), ('xz', '.csv.xz')):
+        path = os.path.join(data_dir, stem + suffix)
+        if not os.path.exists(path):
+            generate_sales(path, compression=None if compression == 'plain' else compression, **params)
+        paths[compression] = path
+    return paths
+
+
+def configure(processor: CSVProcessor, scenario: Dict[str, Any], workdir: str) -> None:
+    """Aplica as opções de um cenário ao processador."""
+    processor.set_engine(scenario.get('engine', 'python'))
+    processor.set_workers(scenario.get('workers', 1))
+    if scenario.get('filter'):
+        processor.set_date_filters(QUARTERS[0][1], QUARTERS[0][2])
+    if scenario.get('cache'):
+        processor.set_cache_dir(os.path.join(workdir, 'cache'))
+    if scenario.get('state_file'):
+        processor.set_state_file(os.path.join(workdir, 'state.json'))
+    if scenario.get('windows'):
+        processor.set_windows(QUARTERS)
+    processor.set_rollup(scenario.get('rollup', False))
+    processor.set_top(scenario.get('top'))
+    processor.set_heavy_hitters(scenario.get('heavy_hitters'))
+    if scenario.get('quarantine'):
+        processor.set_quarantine_file(os.path.join(workdir, 'rejeitadas.csv'))
+    if scenario.get('metrics'):
+        processor.set_metrics(Metrics())
+
+
+def make_operation(
+    scenario: Dict[str, Any],
+    paths: Dict[str, str],
+    workdir: str
+) -> Callable[[], int]:
+    """
+    Monta a operação medida de um cenário, executando antes o seu preparo (não medido).
+
+    Returns:
+        Callable[[], int]: A operação; retorna a quantidade de linhas (ou de produtos, no
+        relatório) processadas.
+    """
+    file_path = paths[scenario.get('input', 'plain')]
+
+    def process() -> int:
+        if scenario.get('state_file'):
+            state_path = os.path.join(workdir, 'state.json')
+            if os.path.exists(state_path):
+                os.remove(state_path)
+        processor = CSVProcessor(file_path)
+        configure(processor, scenario, workdir)
+        processor.process_data()
+        return processor.rows_read
+
+    report_format = scenario.get('report')
+    if report_format:
+        data = CSVProcessor(file_path).process_data()
+        output = os.path.join(workdir, f'relatorio.{report_format}')
+
+        def report() -> int:
+            sales_report = SalesReport()
+            sales_report.set_output(output)
+            sales_report.generate(json.loads(json.dumps(data)), report_format)
+            return len(data['revenue_per_product'])
+        return report
+
+    if scenario.get('index'):
+        build_index(file_path)
+    if scenario.get('prime'):
+        process()
+    return process
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é informado em kilobytes no Linux e em bytes no macOS.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(
+    name: str,
+    scenario: Dict[str, Any],
+    paths: Dict[str, str],
+    repeat: int,
+    input_rows: int,
+    trace_memory: bool = True
+) -> Dict[str, Any]:
+    """
+    Mede um cenário: repeat execuções cronometradas e, opcionalmente, uma execução extra
+    com tracemalloc para o pico de memória alocada pelo Python (tracemalloc deixa a
+    execução mais lenta, por isso não entra no tempo).
+
+    A vazão é calculada sobre as input_rows linhas do conjunto de dados, e não sobre as
+    linhas efetivamente lidas, para que o índice de datas (que salta blocos) e o cache
+    sejam comparáveis à leitura completa; nos relatórios, sobre os produtos escritos.
+
+    Returns:
+        Dict[str, Any]: O resultado do cenário (tempos, linhas por segundo e memória).
+    """
+    with tempfile.TemporaryDirectory(prefix=f"vendas-bench-{name}-") as workdir:
+        operation = make_operation(scenario, paths, workdir)
+        timings = []
+        rows = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = operation()
+            timings.append(time.perf_counter() - start)
+
+        peak_traced = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                operation()
+                peak_traced = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    best = min(timings)
+    if scenario.get('report'):
+        counts = {"operation": "generate", "products": rows}
+        per_second = {"products_per_second": rows / best if best else None}
+    else:
+        counts = {"operation": "process_data", "input_rows": input_rows, "rows_read": rows}
+        per_second = {"rows_per_second": input_rows / best if best else None}
+    return {
+        "scenario": name,
+        **counts,
+        "options": scenario,
+        "wall_seconds": timings,
+        "best_seconds": best,
+        "median_seconds": statistics.median(timings),
+        **per_second,
+        "peak_traced_bytes": peak_traced,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def _measure_child(connection, *args) -> None:
+    try:
+        connection.send(measure(*args))
+    except Exception as _err:  # pylint: disable=broad-except
+        connection.send({"scenario": args[0], "error": f"{type(_err).__name__}: {_err}"})
+    finally:
+        connection.close()
+
+
+def run_isolated(*args) -> Dict[str, Any]:
+    """
+    Executa measure() em um processo novo, de modo que o pico de RSS e os caches de
+    um cenário não contaminem os demais. Sem 'fork', executa no próprio processo.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return measure(*args)
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_measure_child, args=(sender,) + args)
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {"scenario": args[0], "error": f"benchmark process exited with code {process.exitcode}"}
+    process.join()
+    return result
+
+
+def git_commit() -> Optional[str]:
+    """Retorna o commit atual do repositório (None fora de um repositório git)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    scenarios: List[str],
+    params: Dict[str, Any],
+    repeat: int = 3,
+    data_dir: Optional[str] = None,
+    trace_memory: bool = True,
+    isolate: bool = True
+) -> Dict[str, Any]:
+    """
+    Executa os cenários e retorna o documento de resultados.
+
+    Args:
+        scenarios (List[str]): Os nomes dos cenários (chaves de SCENARIOS).
+        params (Dict[str, Any]): Os parâmetros do conjunto de dados (de generate_sales).
+        repeat (int): A quantidade de execuções cronometradas por cenário.
+        data_dir (Optional[str]): Diretório dos dados gerados, reaproveitados entre
+            execuções; None usa um diretório temporário.
+        trace_memory (bool): Se deve medir o pico de memória com tracemalloc.
+        isolate (bool): Se cada cenário executa em um processo próprio.
+
+    Returns:
+        Dict[str, Any]: Metadados da execução e um resultado por cenário.
+    """
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Cenário(s) inválido(s): {unknown}. Escolha entre {list(SCENARIOS)}")
+
+    with tempfile.TemporaryDirectory(prefix="vendas-bench-data-") as temp_dir:
+        data_dir = data_dir or temp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        paths = dataset_paths(data_dir, params)
+        runner = run_isolated if isolate else measure
+        results = []
+        for name in scenarios:
+            result = runner(name, SCENARIOS[name], paths, repeat, params['rows'], trace_memory)
+            if 'error' in result:
+                logger.error("Benchmark %s failed: %s", name, result['error'])
+            else:
+                logger.info("%-14s %8.3fs", name, result['best_seconds'])
+            results.append(result)
+        sizes = {compression: os.path.getsize(path) for compression, path in paths.items()}
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "dataset": {**params, "file_bytes": sizes},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks do vendas-cli com dados sintéticos.")
+    parser.add_argument('--rows', type=int, default=200000, help="Linhas do conjunto de dados (padrão: 200000).")
+    parser.add_argument('--products', type=int, default=1000, help="Produtos distintos (padrão: 1000).")
+    parser.add_argument('--days', type=int, default=365, help="Dias cobertos pelas vendas (padrão: 365).")
+    parser.add_argument('--dirty-ratio', type=float, default=0.01, help="Fração de linhas sujas (padrão: 0.01).")
+    parser.add_argument('--seed', type=int, default=42, help="Semente do gerador (padrão: 42).")
+    parser.add_argument('--repeat', type=int, default=3, help="Execuções cronometradas por cenário (padrão: 3).")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help="Cenário a medir (pode ser repetido; padrão: todos).")
+    parser.add_argument('--data-dir', help="Diretório para gerar e reaproveitar os dados.")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Não mede o pico de memória com tracemalloc.")
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: saída padrão).")
+    args = parser.parse_args(argv)
+
+    # Os avisos do processador sobre linhas sujas distorceriam as medições.
+    logging.basicConfig(level=logging.ERROR, format='%(levelname)s: %(message)s')
+    logger.setLevel(logging.INFO)
+    params = {
+        "rows": args.rows,
+        "products": args.products,
+        "start_date": QUARTERS[0][1],
+        "days": args.days,
+        "dirty_ratio": args.dirty_ratio,
+        "seed": args.seed,
+    }
+    results = run_benchmarks(
+        args.scenario or list(SCENARIOS), params, args.repeat, args.data_dir,
+        trace_memory=not args.no_tracemalloc)
+
+    document = json.dumps(results, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark de inicialização do CLI: tempo até a primeira saída em um arquivo pequeno.
+
+Mede, em processos novos, o tempo entre iniciar o vendas-cli e receber o primeiro byte
+do relatório, comparado ao tempo de iniciar o interpretador sem importar nada, e lista
+os módulos de maior tempo de importação (-X importtime). Os resultados são gravados em
+JSON, como em run_benchmarks.
+
+Uso:
+    python -m benchmarks.startup --runs 30 --output inicializacao.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.run_benchmarks import ROOT, git_commit
+
+TINY_CSV = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-02\n"
+    "Tênis,1,199.9,2025-01-03\n"
+)
+IMPORT_TOP = 15
+
+
+def _environment(pycache_prefix: Optional[str] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(ROOT / 'src')] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    if pycache_prefix:
+        # Sem bytecode em cache, cada execução recompila os módulos do projeto.
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        env['PYTHONPYCACHEPREFIX'] = pycache_prefix
+    return env
+
+
+def time_to_first_output(command: List[str], env: Dict[str, str]) -> float:
+    """
+    Executa o comando e retorna os segundos até o primeiro byte da saída padrão (ou até
+    o fim do processo, se nada for escrito).
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+    process.stdout.read(1)
+    elapsed = time.perf_counter() - start
+    process.stdout.read()
+    process.stdout.close()
+    process.wait()
+    return elapsed
+
+
+def import_profile(env: Dict[str, str], top: int = IMPORT_TOP) -> Dict[str, Any]:
+    """
+    Importa cli.main com -X importtime e retorna o tempo total da importação e os top
+    módulos por tempo próprio, em microssegundos.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import cli.main'],
+        env=env, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        modules.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    total = next((item['cumulative_us'] for item in modules if item['module'] == 'cli.main'), None)
+    return {
+        "cli_main_us": total,
+        "modules": len(modules),
+        "top": sorted(modules, key=lambda item: item['self_us'], reverse=True)[:top],
+    }
+
+
+def _summary(timings: List[float]) -> Dict[str, Any]:
+    return {
+        "best_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "wall_seconds": timings,
+    }
+
+
+def run_startup(runs: int = 20, pycache_prefix: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Mede a inicialização do CLI em runs execuções (após uma execução de aquecimento).
+
+    Args:
+        runs (int): A quantidade de execuções medidas de cada comando.
+        pycache_prefix (Optional[str]): Diretório para o bytecode em cache (necessário
+            quando PYTHONDONTWRITEBYTECODE está definido).
+
+    Returns:
+        Dict[str, Any]: Metadados da execução, o tempo até a primeira saída do CLI e do
+        interpretador vazio, a diferença entre eles e o perfil de importação.
+    """
+    env = _environment(pycache_prefix)
+    with tempfile.TemporaryDirectory(prefix="vendas-startup-") as workdir:
+        csv_file = os.path.join(workdir, 'vendas.csv')
+        with open(csv_file, 'w', encoding='utf-8') as handle:
+            handle.write(TINY_CSV)
+        commands = {
+            "interpreter": [sys.executable, '-c', 'print()'],
+            "cli": [sys.executable, '-m', 'cli.main', csv_file],
+        }
+        results = {}
+        for name, command in commands.items():
+            time_to_first_output(command, env)
+            results[name] = _summary([time_to_first_output(command, env) for _ in range(runs)])
+        imports = import_profile(env)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "bytecode_cache": 'PYTHONDONTWRITEBYTECODE' not in env,
+        "runs": runs,
+        "time_to_first_output": results,
+        "cli_overhead_seconds": results['cli']['best_seconds'] - results['interpreter']['best_seconds'],
+        "imports": imports,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização do vendas-cli.")
+    parser.add_argument('--runs', type=int, default=20, help="Execuções medidas (padrão: 20).")
+    parser.add_argument('--pycache-prefix', help="Diretório para o bytecode em cache.")
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: saída padrão).")
+    args = parser.parse_args(argv)
+
+    document = json.dumps(run_startup(args.runs, args.pycache_prefix), indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,13 +3,16 @@ from core.csv_processor import CSVProcessor
 from reports.sales_report import SalesReport
 from cli.parsers import CliParser
 
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
-
 def main():
     """
     Função principal que inicializa o sistema, injeta dependências e executa o CLI Parser.
     Esta função é o ponto de entrada (entry point) da aplicação.
+
+    O logging é configurado aqui, e não na importação do módulo, e os módulos de cada
+    modo de processamento e formato de relatório são importados apenas quando usados,
+    para que chamadas frequentes em arquivos pequenos iniciem rapidamente.
     """
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
     try:
         csv_processor = CSVProcessor()
     except TypeError:
@@ -1,7 +1,17 @@
 import argparse
 import logging
-from interfaces.reader_interface import Reader
+import sys
+from typing import List, Optional
+from core.windows import load_windows_file, parse_window_spec
+from interfaces.reader_interface import BatchReader, Reader, UnsupportedOptions
 from interfaces.report_interface import Report
+from utils.helpers import (
+    parse_group_by,
+    parse_memory_size,
+    parse_positive_float,
+    parse_positive_int,
+    parse_sample_fraction
+)
 
 
 class CliParser:
@@ -12,16 +22,29 @@ class CliParser:
         self.csv_processor: Reader = csv_processor
         self.sales_report: Report = sales_report
 
-    def main(self):
+    def main(self, argv: Optional[List[str]] = None):
         """
 		Executa a análise de um arquivo CSV de vendas com filtros de data e formatos de saída.
+
+		O subcomando "index" (vendas-cli index arquivo.csv) constrói o índice de datas do arquivo
+		e o subcomando "serve" (vendas-cli serve arquivo.csv) mantém os arquivos em memória e
+		responde consultas de relatório por HTTP.
 		"""
+        argv = sys.argv[1:] if argv is None else argv
+        if self.is_subcommand(argv, 'index'):
+            self.run_index(argv[1:])
+            return
+        if self.is_subcommand(argv, 'serve'):
+            self.run_serve(argv[1:])
+            return
+
         parser = argparse.ArgumentParser(
 			description='Analisa um arquivo CSV de vendas com filtros de data e formatos de saída.')
         parser.add_argument(
 			'csv_file',
 			type=str,
-			help='O caminho para o arquivo CSV de vendas.'
+			nargs='+',
+			help='O caminho para o arquivo CSV de vendas. Aceita vários arquivos, padrões glob e "-" para a entrada padrão.'
 		)
         parser.add_argument(
 			'--data_inicio',
@@ -36,15 +59,439 @@ class CliParser:
         parser.add_argument(
 			'--format',
 			type=str,
-			choices=['text', 'json'],
+			choices=['text', 'json', 'ndjson', 'csv'],
 			default='text',
-			help='Formato de saída do relatório: "text" (padrão) ou "json".'
+			help='Formato de saída do relatório: "text" (padrão), "json", "ndjson" (um produto por linha) '
+				 'ou "csv" (produto e receita).'
+		)
+        parser.add_argument(
+			'--max-errors',
+			type=int,
+			default=None,
+			help='Interrompe o processamento (código de saída 1) se mais de N linhas tiverem erro de formatação.'
+		)
+        parser.add_argument(
+			'--quarantine-file',
+			type=str,
+			default=None,
+			help='Arquivo em que as linhas rejeitadas por erro de formatação são gravadas sem alteração.'
+		)
+        parser.add_argument(
+			'--output',
+			type=str,
+			default=None,
+			help='Arquivo em que o relatório será escrito (padrão: saída padrão).'
+		)
+        parser.add_argument(
+			'--engine',
+			type=str,
+			choices=['python', 'numpy', 'mmap', 'cents'],
+			default='python',
+			help='Motor de processamento: "python" (padrão, linha a linha), "numpy" (colunar, vetorizado), '
+				 '"mmap" (tokenizador de bytes sobre o arquivo mapeado em memória) ou "cents" (linha a linha, '
+				 'com valores exatos em centavos inteiros).'
+		)
+        parser.add_argument(
+			'--workers',
+			type=parse_positive_int,
+			default=1,
+			help='Quantidade de processos para processar o arquivo em paralelo (padrão: 1). As receitas parciais '
+				 'de cada processo são somadas com math.fsum, mas o caminho serial soma venda a venda: as receitas '
+				 'não arredondadas podem diferir das do serial em poucos ulps, e os valores do relatório (2 casas) '
+				 'apenas quando caem no limite do arredondamento. Com o motor "cents" as somas são inteiras e o '
+				 'resultado é idêntico ao serial.'
+		)
+        parser.add_argument(
+			'--pipeline',
+			action='store_true',
+			help='Lê o arquivo à frente em uma thread e decodifica as linhas em outra, sobrepondo a espera '
+				 'pelo disco (ou pela rede) ao processamento; usado na leitura serial.'
+		)
+        parser.add_argument(
+			'--stream',
+			type=int,
+			nargs='?',
+			const=0,
+			default=None,
+			metavar='LOTES',
+			help='Lê as vendas em lotes de colunas e gera o relatório a partir dos agregadores; no formato '
+				 'ndjson, com LOTES, escreve um resultado parcial (type "partial") a cada LOTES lotes.'
+		)
+        parser.add_argument(
+			'--cache-dir',
+			type=str,
+			default=None,
+			help='Diretório para o cache colunar do arquivo; execuções seguintes leem o cache em vez do CSV.'
+		)
+        parser.add_argument(
+			'--state-file',
+			type=str,
+			default=None,
+			help='Arquivo de estado para processamento incremental: cada execução lê apenas as linhas novas.'
+		)
+        parser.add_argument(
+			'--window',
+			type=parse_window_spec,
+			action='append',
+			default=[],
+			help='Janela de datas nomeada, no formato nome=AAAA-MM-DD:AAAA-MM-DD (pode ser repetida). '
+				 'Todas as janelas são calculadas em uma única leitura, com um relatório por janela.'
 		)
-        args = parser.parse_args()
+        parser.add_argument(
+			'--windows-file',
+			type=str,
+			default=None,
+			help='Arquivo JSON ou CSV (colunas name,start,end) com janelas de datas nomeadas.'
+		)
+        parser.add_argument(
+			'--rollup',
+			action='store_true',
+			help='Agrega as vendas por dia em uma única leitura e responde o período (e as janelas) '
+				 'com somas de prefixo; o relatório inclui as séries diária, semanal e mensal '
+				 '(com os produtos de cada período apenas junto com --top N).'
+		)
+        parser.add_argument(
+			'--top',
+			type=parse_positive_int,
+			default=None,
+			help='Lista apenas os K produtos de maior receita (seleção por heap, sem ordenar todos).'
+		)
+        parser.add_argument(
+			'--heavy-hitters',
+			type=parse_positive_int,
+			default=None,
+			metavar='CONTADORES',
+			help='Modo aproximado de memória fixa: mantém receita e quantidade em CONTADORES contadores '
+				 'Space-Saving por produto e informa os limites de erro no relatório.'
+		)
+        parser.add_argument(
+			'--group-by',
+			type=parse_group_by,
+			default=None,
+			metavar='COLUNAS',
+			help='Agrupa as vendas pelas COLUNAS separadas por vírgula (ex.: produto,loja,data_venda:mes; '
+				 'a data aceita :dia, :semana, :mes e :ano) e lista receita, unidades e vendas por grupo.'
+		)
+        parser.add_argument(
+			'--memory-limit',
+			type=parse_memory_size,
+			default=None,
+			metavar='TAMANHO',
+			help='Limite de memória da tabela do --group-by (ex.: 512M, 2G); acima dele, os grupos são '
+				 'gravados em arquivos temporários e mesclados ao final, com resultados exatos. Exige '
+				 '--top, pois sem ele todos os grupos ficam em memória.'
+		)
+        parser.add_argument(
+			'--approx',
+			type=parse_sample_fraction,
+			nargs='?',
+			const=0.01,
+			default=None,
+			metavar='FRACAO',
+			help='Modo aproximado por amostragem: lê apenas a FRACAO (padrão: 0.01) dos blocos do arquivo, '
+				 'sorteados, e estima os totais com intervalos de 95%% de confiança.'
+		)
+        parser.add_argument(
+			'--time-budget',
+			type=parse_positive_float,
+			default=None,
+			metavar='SEGUNDOS',
+			help='Tempo máximo da amostragem do --approx (sem --approx, lê blocos sorteados até o tempo acabar).'
+		)
+        parser.add_argument(
+			'--seed',
+			type=int,
+			default=None,
+			help='Semente do sorteio dos blocos do --approx, para resultados reproduzíveis.'
+		)
+        parser.add_argument(
+			'--backend',
+			type=str,
+			choices=['csv', 'sqlite'],
+			default='csv',
+			help='Origem dos dados: "csv" (padrão, lê os arquivos a cada execução) ou "sqlite" (carrega os '
+				 'arquivos uma vez em um banco SQLite indexado e responde com consultas ao banco).'
+		)
+        parser.add_argument(
+			'--database',
+			type=str,
+			default='vendas.db',
+			metavar='ARQUIVO',
+			help='Arquivo do banco SQLite do --backend sqlite (padrão: vendas.db).'
+		)
+        parser.add_argument(
+			'--metrics',
+			action='store_true',
+			help='Mede o tempo de cada etapa (leitura, tokenização, datas, conversão, agregação e relatório), '
+				 'os bytes lidos e as linhas por segundo, e escreve as métricas em JSON na saída de erros.'
+		)
+        parser.add_argument(
+			'--metrics-file',
+			type=str,
+			default=None,
+			metavar='ARQUIVO',
+			help='Como --metrics, mas grava as métricas em JSON no ARQUIVO.'
+		)
+        parser.add_argument(
+			'--profile',
+			type=str,
+			default=None,
+			metavar='ARQUIVO',
+			help='Grava o perfil cProfile da execução em ARQUIVO (leia com "python -m pstats ARQUIVO").'
+		)
+        args = parser.parse_args(argv)
         logging.info("Argumentos recebidos: %s", args)
 
-        self.csv_processor.set_file_path(args.csv_file)
+        if args.backend == 'sqlite':
+            self.use_sqlite_backend(args)
+        if args.stream is not None:
+            self.check_stream_options(args)
+
+        self.csv_processor.set_file_paths(args.csv_file)
         self.csv_processor.set_date_filters(args.data_inicio, args.data_fim)
-        results = self.csv_processor.process_data()
+        if args.backend == 'csv':
+            self.csv_processor.set_engine(args.engine)
+            self.csv_processor.set_workers(args.workers)
+            self.csv_processor.set_pipeline(args.pipeline)
+            self.csv_processor.set_cache_dir(args.cache_dir)
+            self.csv_processor.set_state_file(args.state_file)
+            windows = list(args.window)
+            if args.windows_file:
+                try:
+                    windows.extend(load_windows_file(args.windows_file))
+                except (OSError, ValueError, KeyError) as _err:
+                    logging.error("Error: Could not read windows file '%s': %s", args.windows_file, _err)
+                    sys.exit(1)
+            self.csv_processor.set_windows(windows)
+            self.csv_processor.set_rollup(args.rollup)
+            self.csv_processor.set_heavy_hitters(args.heavy_hitters)
+            self.csv_processor.set_group_by(args.group_by)
+            self.csv_processor.set_memory_limit(args.memory_limit)
+            self.csv_processor.set_approx(args.approx, args.time_budget, args.seed)
+        self.csv_processor.set_top(args.top)
+        self.csv_processor.set_max_errors(args.max_errors)
+        self.csv_processor.set_quarantine_file(args.quarantine_file)
+        metrics = None
+        if args.metrics or args.metrics_file:
+            from core.metrics import Metrics
+            metrics = Metrics()
+        self.csv_processor.set_metrics(metrics)
+
+        profiler = None
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            if args.stream is not None:
+                if metrics is None:
+                    self.stream_report(args)
+                else:
+                    with metrics.stage('scan'):
+                        self.stream_report(args)
+            else:
+                results = self.csv_processor.process_data()
+
+                self.sales_report.set_output(args.output)
+                if metrics is None:
+                    self.sales_report.generate(data=results, report_format=args.format)
+                else:
+                    with metrics.stage('render'):
+                        self.sales_report.generate(data=results, report_format=args.format)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+                logging.info("Profile written to '%s'.", args.profile)
+
+        if metrics is not None:
+            from core.metrics import write_metrics
+            write_metrics(metrics.report(self.csv_processor.rows_read), args.metrics_file)
+
+    @staticmethod
+    def is_subcommand(argv: List[str], name: str) -> bool:
+        """
+		Indica se o primeiro argumento é o subcomando name. Um CSV com o nome de um
+		subcomando é informado como ./index ou depois de -- (vendas-cli -- index).
+		"""
+        return argv[:1] == [name]
+
+    def check_stream_options(self, args: argparse.Namespace):
+        """
+		Encerra com erro se o leitor não entrega lotes (BatchReader) ou se foram usadas
+		opções que dependem dos outros modos de leitura (--stream).
+		"""
+        if not isinstance(self.csv_processor, BatchReader):
+            logging.error("Error: --stream requires a reader that produces batches (--backend csv).")
+            sys.exit(1)
+        unsupported = [
+            option for option, used in (
+                ('--engine', args.engine not in ('python', 'cents')),
+                ('--workers', args.workers != 1),
+                ('--pipeline', args.pipeline),
+                ('--cache-dir', args.cache_dir),
+                ('--state-file', args.state_file),
+                ('--window', args.window or args.windows_file),
+                ('--heavy-hitters', args.heavy_hitters),
+                ('--group-by', args.group_by),
+                ('--approx', args.approx is not None or args.time_budget is not None),
+            ) if used
+        ]
+        if unsupported:
+            logging.error("Error: %s cannot be used with --stream.", ", ".join(unsupported))
+            sys.exit(1)
+
+    def stream_report(self, args: argparse.Namespace):
+        """
+		Gera o relatório consumindo os lotes do leitor no agregador padrão (--stream), com
+		resultados parciais no formato ndjson.
+		"""
+        from core.rejects import TooManyRejectedRows
+        self.sales_report.set_output(args.output)
+        try:
+            self.sales_report.stream(
+                self.csv_processor.iter_batches(),
+                self.csv_processor.make_aggregator(),
+                args.format,
+                args.stream or None
+            )
+        except FileNotFoundError as _err:
+            logging.error("Error: The file '%s' was not found.", _err.filename)
+            sys.exit(1)
+        except UnsupportedOptions as _err:
+            logging.error("Error: %s", _err)
+            sys.exit(1)
+        except ValueError as _err:
+            logging.error("Error: Date format is incorrect or missing column. %s", _err)
+            sys.exit(1)
+        except TooManyRejectedRows as _err:
+            logging.error("Error: Too many rows with formatting errors. %s", _err)
+            sys.exit(1)
+
+    def use_sqlite_backend(self, args: argparse.Namespace):
+        """
+		Troca o leitor injetado pelo SQLiteReader (--backend sqlite). Opções que dependem
+		da leitura do CSV a cada execução não se aplicam ao banco e encerram com erro.
+		"""
+        unsupported = [
+            option for option, used in (
+                ('--engine', args.engine != 'python'),
+                ('--workers', args.workers != 1),
+                ('--pipeline', args.pipeline),
+                ('--cache-dir', args.cache_dir),
+                ('--state-file', args.state_file),
+                ('--window', args.window or args.windows_file),
+                ('--rollup', args.rollup),
+                ('--heavy-hitters', args.heavy_hitters),
+                ('--group-by', args.group_by),
+                ('--memory-limit', args.memory_limit),
+                ('--approx', args.approx is not None or args.time_budget is not None),
+            ) if used
+        ]
+        if unsupported:
+            logging.error("Error: %s cannot be used with --backend sqlite.", ", ".join(unsupported))
+            sys.exit(1)
+        from core.sqlite_reader import SQLiteReader
+        self.csv_processor = SQLiteReader(args.database)
+
+    def run_index(self, argv: List[str]):
+        """
+		Constrói o índice esparso de datas de um arquivo CSV, usado para que consultas com
+		--data_inicio/--data_fim leiam apenas os blocos do período.
+
+		Com --sort, o arquivo é antes reescrito ordenado por data (ordenação externa) e o
+		índice é construído para o arquivo ordenado.
+		"""
+        parser = argparse.ArgumentParser(
+			prog='vendas-cli index',
+			description='Constrói o índice de datas de um arquivo CSV de vendas.')
+        parser.add_argument(
+			'csv_file',
+			type=str,
+			help='O caminho para o arquivo CSV de vendas.'
+		)
+        parser.add_argument(
+			'--sort',
+			action='store_true',
+			help='Reescreve o arquivo ordenado por data antes de indexar.'
+		)
+        parser.add_argument(
+			'--output',
+			type=str,
+			default=None,
+			help='Arquivo de saída do --sort (padrão: <arquivo>.sorted.csv).'
+		)
+        args = parser.parse_args(argv)
+
+        from core.date_index import build_index, sort_csv_by_date
+        csv_file = args.csv_file
+        try:
+            if args.sort:
+                output = args.output or f"{csv_file.rsplit('.csv', 1)[0]}.sorted.csv"
+                sort_csv_by_date(csv_file, output)
+                logging.info("Sorted file written to '%s'.", output)
+                csv_file = output
+            index = build_index(csv_file)
+        except FileNotFoundError:
+            logging.error("Error: The file '%s' was not found.", csv_file)
+            sys.exit(1)
+        except ValueError as _err:
+            logging.error("Error: %s", _err)
+            sys.exit(1)
+
+        logging.info("Index written with %d block(s).", len(index["blocks"]))
+        if not index["ordered"]:
+            logging.warning(
+                "The file is not ordered by date; queries will scan every block whose "
+                "date range overlaps the filter. Use 'vendas-cli index --sort' to fix it.")
+
+    def run_serve(self, argv: List[str]):
+        """
+		Carrega os arquivos CSV uma única vez, mantém as vendas em memória e responde
+		consultas de relatório por HTTP (em host:porta ou em um socket Unix) até ser
+		interrompido.
+
+		Exemplo de consulta: GET /report?data_inicio=2025-01-01&data_fim=2025-01-31&top=10&format=json
+		"""
+        from core.server import DEFAULT_HOST, DEFAULT_PORT, SalesStore, serve
+        from utils.helpers import expand_paths
+        parser = argparse.ArgumentParser(
+			prog='vendas-cli serve',
+			description='Mantém arquivos CSV de vendas em memória e responde consultas de relatório por HTTP.')
+        parser.add_argument(
+			'csv_file',
+			type=str,
+			nargs='+',
+			help='Os arquivos CSV de vendas (aceita padrões glob). Arquivos alterados são recarregados na consulta seguinte.'
+		)
+        parser.add_argument(
+			'--host',
+			type=str,
+			default=DEFAULT_HOST,
+			help=f'Endereço em que o servidor escuta (padrão: {DEFAULT_HOST}).'
+		)
+        parser.add_argument(
+			'--port',
+			type=int,
+			default=DEFAULT_PORT,
+			help=f'Porta em que o servidor escuta (padrão: {DEFAULT_PORT}).'
+		)
+        parser.add_argument(
+			'--socket',
+			type=str,
+			default=None,
+			help='Escuta em um socket Unix neste caminho em vez de host e porta.'
+		)
+        args = parser.parse_args(argv)
 
-        self.sales_report.generate(data=results, report_format=args.format)
+        try:
+            file_paths = expand_paths(args.csv_file)
+            if '-' in file_paths:
+                raise ValueError("Standard input ('-') cannot be served.")
+            serve(SalesStore(file_paths), args.host, args.port, args.socket)
+        except FileNotFoundError as _err:
+            logging.error("Error: The file '%s' was not found.", _err.filename)
+            sys.exit(1)
+        except (OSError, ValueError) as _err:
+            logging.error("Error: %s", _err)
+            sys.exit(1)
@@ -0,0 +1,211 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.batches import UNPARSED_DATE, SalesBatch
+from core.counters import ProductCounters
+from core.rollup import GRANULARITIES, period_series
+from interfaces.aggregator_interface import Aggregator
+from utils.helpers import parser_to_dict_list
+
+
+def translate_ids(
+    sources: List[Tuple[List[str], List[int]]],
+    products: List[str],
+    intern: Callable[[str], int]
+) -> List[int]:
+    """
+    Retorna a tradução dos ids de um dicionário de produtos (leitor) para os ids do
+    agregador, internando com intern os produtos ainda não traduzidos. As traduções ficam
+    em sources, uma por dicionário visto.
+    """
+    for source, ids in sources:
+        if source is products:
+            break
+    else:
+        ids = []
+        sources.append((products, ids))
+    for product in products[len(ids):]:
+        ids.append(intern(product))
+    return ids
+
+
+class TotalsAggregator(Aggregator):
+    """
+    Receita total das vendas (em centavos inteiros com cents=True).
+    """
+
+    def __init__(self, cents: bool = False):
+        self.cents = cents
+        self.total = 0 if cents else 0.0
+
+    def consume(self, batch: SalesBatch) -> None:
+        # Soma venda a venda, na mesma ordem de process_csv_rows, para o mesmo resultado.
+        total = self.total
+        for sale_value in batch.revenues:
+            total += sale_value
+        self.total = total
+
+    def results(self) -> Dict[str, Any]:
+        results: Dict[str, Any] = {"total_global_revenue": round(self.total, 2)}
+        if self.cents:
+            results["currency_unit"] = "cents"
+        return results
+
+
+class ProductAggregator(Aggregator):
+    """
+    Receita e quantidade por produto, o produto mais vendido e a receita por produto
+    (apenas dos top produtos com top).
+
+    Os ids dos lotes são traduzidos para os ids dos contadores uma vez por produto, para
+    cada dicionário de produtos (leitor) visto.
+    """
+
+    def __init__(self, top: Optional[int] = None, cents: bool = False):
+        self.top = top
+        self.counters = ProductCounters(cents)
+        self._sources: List[Tuple[List[str], List[int]]] = []
+
+    def consume(self, batch: SalesBatch) -> None:
+        # Os lotes de um leitor só trazem somas válidas (iter_line_batches rejeita as
+        # demais); add_id ainda verifica o intervalo ao mesclar leitores diferentes.
+        ids = translate_ids(self._sources, batch.products, self.counters.intern)
+        add_id = self.counters.add_id
+        for product_id, sale_quantity, sale_value in zip(batch.product_ids, batch.quantities, batch.revenues):
+            add_id(ids[product_id], sale_quantity, sale_value)
+
+    def results(self) -> Dict[str, Any]:
+        revenue_per_product, quantity_per_product = self.counters.to_dicts()
+        best_selling_product = "None"
+        best_selling_quantity = 0
+        if quantity_per_product:
+            best_selling_product = max(quantity_per_product, key=lambda k: quantity_per_product[k])
+            best_selling_quantity = quantity_per_product[best_selling_product]
+
+        if self.top is None:
+            sorted_revenue = sorted(revenue_per_product.items(), key=lambda item: item[1], reverse=True)
+        else:
+            import heapq
+            sorted_revenue = heapq.nlargest(self.top, revenue_per_product.items(), key=lambda item: item[1])
+        return {
+            "best_selling_product": {"product": best_selling_product, "quantity": best_selling_quantity},
+            "revenue_per_product": parser_to_dict_list(sorted_revenue),
+        }
+
+
+class RowsAggregator(Aggregator):
+    """
+    Linhas lidas, filtradas e rejeitadas (no total, por categoria de erro e por arquivo).
+    """
+
+    def __init__(self):
+        self.files: Dict[Optional[str], List[int]] = {}
+        self.rows_read = 0
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+        self.reject_counts: Dict[str, int] = {}
+
+    def consume(self, batch: SalesBatch) -> None:
+        counts = self.files.setdefault(batch.file, [0, 0])
+        counts[0] += batch.rows_read
+        counts[1] += batch.rows_rejected
+        self.rows_read += batch.rows_read
+        self.rows_accepted += len(batch)
+        self.rows_rejected += batch.rows_rejected
+        for category, count in batch.reject_counts.items():
+            self.reject_counts[category] = self.reject_counts.get(category, 0) + count
+
+    def results(self) -> Dict[str, Any]:
+        return {
+            "files": [
+                {"file": file, "rows": rows, "errors": errors}
+                for file, (rows, errors) in self.files.items()
+            ],
+            "rows": {
+                "read": self.rows_read,
+                "filtered": self.rows_read - self.rows_rejected - self.rows_accepted,
+                "rejected": self.rows_rejected,
+                "rejected_by_category": dict(self.reject_counts)
+            }
+        }
+
+
+class PeriodAggregator(Aggregator):
+    """
+    Receita e quantidade por dia, semana e mês (as mesmas séries do --rollup), com o
+    detalhe dos top produtos de cada período quando top é informado. Vendas com datas
+    inválidas não entram nas séries.
+
+    Os totais são mantidos por dia e produto, como em SalesRollup, e agrupados nos
+    períodos a cada resultado, para a mesma ordem e as mesmas somas das séries do
+    --rollup.
+    """
+
+    def __init__(self, granularities: Sequence[str] = GRANULARITIES, top: Optional[int] = None):
+        self.granularities = tuple(granularities)
+        self.top = top
+        self.products: List[str] = []
+        self.daily: Dict[int, Dict[int, List[Any]]] = {}
+        self._product_index: Dict[str, int] = {}
+        self._sources: List[Tuple[List[str], List[int]]] = []
+
+    def _intern(self, product: str) -> int:
+        product_id = self._product_index.get(product)
+        if product_id is None:
+            product_id = self._product_index[product] = len(self.products)
+            self.products.append(product)
+        return product_id
+
+    def consume(self, batch: SalesBatch) -> None:
+        ids = translate_ids(self._sources, batch.products, self._intern)
+        daily = self.daily
+        for product_id, ordinal, sale_quantity, sale_value in zip(
+                batch.product_ids, batch.ordinals, batch.quantities, batch.revenues):
+            if ordinal == UNPARSED_DATE:
+                continue
+            day = daily.get(ordinal)
+            if day is None:
+                day = daily[ordinal] = {}
+            totals = day.get(ids[product_id])
+            if totals is None:
+                day[ids[product_id]] = [sale_value, sale_quantity]
+            else:
+                totals[0] += sale_value
+                totals[1] += sale_quantity
+
+    def series(self, granularity: str) -> List[Dict[str, Any]]:
+        """Retorna a série de um período (no formato de SalesRollup.series), em ordem cronológica."""
+        return period_series(
+            ((day, self.daily[day]) for day in sorted(self.daily)), granularity, self.products, self.top)
+
+    def results(self) -> Dict[str, Any]:
+        return {"rollup": {granularity: self.series(granularity) for granularity in self.granularities}}
+
+
+class CompositeAggregator(Aggregator):
+    """
+    Combina agregadores: cada lote é entregue a todos, e os resultados são unidos, na
+    ordem dos agregadores, após a data do relatório e os campos fixos de fields (como o
+    filtro de datas).
+    """
+
+    def __init__(self, aggregators: Sequence[Aggregator], fields: Optional[Dict[str, Any]] = None):
+        self.aggregators = list(aggregators)
+        self.fields = dict(fields or {})
+        self.batches = 0
+
+    def consume(self, batch: SalesBatch) -> None:
+        self.batches += 1
+        for aggregator in self.aggregators:
+            aggregator.consume(batch)
+
+    def results(self) -> Dict[str, Any]:
+        results: Dict[str, Any] = {
+            "report_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **self.fields
+        }
+        for aggregator in self.aggregators:
+            results.update(aggregator.results())
+        if "currency_unit" in results:
+            results["currency_unit"] = results.pop("currency_unit")
+        return results
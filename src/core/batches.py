@@ -0,0 +1,134 @@
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.counters import ProductCounters
+from core.rejects import RejectedRows, error_category
+from utils.helpers import calculate_sales, convert_sale_cents, convert_sale_values, parse_date_cached
+
+BATCH_ROWS = 65536
+UNPARSED_DATE = 0
+
+
+class SalesBatch:
+    """
+    Lote de vendas válidas em colunas tipadas, entregue por um BatchReader.
+
+    Os produtos são codificados em um dicionário compartilhado por todos os lotes do
+    mesmo leitor (products, ids densos na ordem de primeira ocorrência, que só cresce),
+    de modo que um id vale para todos os lotes seguintes. As datas são ordinais
+    (``date.toordinal()``), com UNPARSED_DATE para datas que não puderam ser
+    convertidas. As contagens de linhas referem-se às linhas lidas para montar o lote,
+    inclusive as filtradas e as rejeitadas.
+
+    Attributes:
+        products (List[str]): Nomes dos produtos, indexados pelo id (compartilhado).
+        product_ids (array): Id do produto de cada venda.
+        quantities (array): Quantidade de cada venda.
+        revenues (array): Valor de cada venda ('d', ou 'q' em centavos no motor 'cents').
+        ordinals (array): Data de cada venda como ordinal.
+        file (Optional[str]): O arquivo de origem.
+        rows_read (int): Linhas lidas.
+        rows_rejected (int): Linhas descartadas por erro de formatação.
+        reject_counts (Dict[str, int]): Linhas descartadas por categoria de erro.
+    """
+
+    def __init__(self, products: List[str], cents: bool = False, file: Optional[str] = None):
+        self.products = products
+        self.cents = cents
+        self.product_ids = array('i')
+        self.quantities = array('q')
+        self.revenues = array('q' if cents else 'd')
+        self.ordinals = array('i')
+        self.file = file
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self.reject_counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+
+def iter_line_batches(
+    lines: Iterable[str],
+    products: List[str],
+    product_ids: Dict[str, int],
+    in_window: Optional[Callable[[str], bool]] = None,
+    date_format: str = "%Y-%m-%d",
+    cents: bool = False,
+    rejects: Optional[RejectedRows] = None,
+    batch_size: int = BATCH_ROWS,
+    file: Optional[str] = None,
+    totals: Optional[ProductCounters] = None
+) -> Iterator[SalesBatch]:
+    """
+    Converte as linhas de um CSV (começando pelo cabeçalho) em lotes de até batch_size
+    vendas, com a mesma validação e o mesmo filtro de datas de process_csv_rows.
+
+    O último lote do arquivo é sempre entregue, mesmo vazio, com as contagens das linhas
+    restantes. Novos produtos são acrescentados a products e product_ids.
+
+    As somas de cada produto são acumuladas em totals, como nos demais motores: uma
+    linha cuja soma não caiba nos contadores é rejeitada como 'out_of_range' e não entra
+    nos lotes, de modo que os agregadores recebem apenas somas válidas.
+
+    Args:
+        lines (Iterable[str]): As linhas do CSV.
+        products (List[str]): O dicionário de produtos compartilhado entre os lotes.
+        product_ids (Dict[str, int]): O id de cada produto de products.
+        in_window (Optional[Callable[[str], bool]]): O filtro de datas (make_date_filter).
+        date_format (str): O formato das datas de venda.
+        cents (bool): Se os valores são somados em centavos inteiros (motor 'cents').
+        rejects (Optional[RejectedRows]): Onde registrar as linhas com erro.
+        batch_size (int): A quantidade máxima de vendas por lote.
+        file (Optional[str]): O arquivo de origem, registrado nos lotes.
+        totals (Optional[ProductCounters]): As somas por produto, compartilhadas entre os
+            arquivos do mesmo leitor (None: somas apenas deste arquivo).
+
+    Yields:
+        SalesBatch: Os lotes de vendas, na ordem do arquivo.
+    """
+    rejects = rejects or RejectedRows()
+    totals = totals if totals is not None else ProductCounters(cents)
+    batch = SalesBatch(products, cents, file)
+    for row in rejects.dict_reader(lines):
+        batch.rows_read += 1
+        try:
+            sale_date_str = row.get('data_venda', '').strip()
+            if not sale_date_str:
+                continue
+            if in_window is not None and not in_window(sale_date_str):
+                continue
+
+            quantity_str = row.get('quantidade', '').strip()
+            price_str = row.get('preco_unitario', '').strip()
+            if not quantity_str or not price_str:
+                continue
+            product = row.get('produto', 'Unknown').strip()
+
+            if cents:
+                quantity, sale_value = convert_sale_cents(quantity_str, price_str)
+            else:
+                quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                sale_value = calculate_sales(quantity, unit_price)
+            totals.add(product, quantity, sale_value)
+        except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+            batch.rows_rejected += 1
+            category = error_category(_err)
+            batch.reject_counts[category] = batch.reject_counts.get(category, 0) + 1
+            rejects.reject(_err, row, category)
+            continue
+
+        product_id = product_ids.get(product)
+        if product_id is None:
+            product_id = len(products)
+            product_ids[product] = product_id
+            products.append(product)
+        batch.product_ids.append(product_id)
+        batch.quantities.append(quantity)
+        batch.revenues.append(sale_value)
+        sale_date = parse_date_cached(sale_date_str, date_format)
+        batch.ordinals.append(sale_date.toordinal() if sale_date else UNPARSED_DATE)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = SalesBatch(products, cents, file)
+    yield batch
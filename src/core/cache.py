@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from core.columns import SalesColumns
+from core.compression import open_sales_file
+from core.rejects import RejectedRows
+
+CACHE_MAGIC = b"VENDASCACHE2\n"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_fingerprint(file_path: str) -> Dict[str, Any]:
+    """
+    Calcula a impressão digital de um arquivo: caminho, tamanho, mtime e hash de conteúdo.
+
+    O hash cobre o arquivo inteiro (lido em blocos de 1 MiB), de modo que uma alteração
+    em qualquer posição invalida o cache, mesmo com tamanho e mtime preservados. Ler o
+    arquivo é bem mais barato do que converter as suas linhas.
+
+    Args:
+        file_path (str): O caminho do arquivo.
+
+    Returns:
+        Dict[str, Any]: A impressão digital do arquivo.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(str(stat.st_size).encode(), digest_size=16)
+    with open(file_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return {
+        "path": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content_hash": digest.hexdigest(),
+    }
+
+
+def sidecar_path(cache_dir: str, file_path: str, date_format: str) -> str:
+    """
+    Retorna o caminho do arquivo de cache associado a um CSV e a um formato de data.
+    """
+    key = hashlib.sha1(
+        f"{os.path.abspath(file_path)}\0{date_format}".encode()).hexdigest()[:20]
+    return os.path.join(cache_dir, f"{key}.vcache")
+
+
+def write_sidecar(path: str, columns: SalesColumns, fingerprint: Dict[str, Any], date_format: str) -> None:
+    """
+    Grava as colunas em um arquivo binário de cache.
+
+    O arquivo contém uma assinatura, uma linha JSON de metadados (impressão digital,
+    formato de data, produtos, categorias de erro e quantidade de linhas) e, em seguida,
+    os bytes brutos das colunas das vendas e das linhas rejeitadas. A escrita é atômica
+    (arquivo temporário + rename).
+    """
+    metadata = {
+        "fingerprint": fingerprint,
+        "date_format": date_format,
+        "rows": len(columns),
+        "rows_read": columns.rows_read,
+        "rejects": len(columns.reject_ordinals),
+        "reject_categories": columns.reject_categories,
+        "products": columns.products,
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as handle:
+        handle.write(CACHE_MAGIC)
+        handle.write(json.dumps(metadata, ensure_ascii=False).encode('utf-8') + b"\n")
+        for column in (columns.product_ids, columns.quantities, columns.prices, columns.ordinals):
+            column.tofile(handle)
+        for column in (columns.reject_ordinals, columns.reject_category_ids):
+            column.tofile(handle)
+    os.replace(tmp_path, path)
+
+
+def read_sidecar(path: str, fingerprint: Dict[str, Any], date_format: str) -> Optional[SalesColumns]:
+    """
+    Lê um arquivo de cache se ele existir e corresponder à impressão digital informada.
+
+    Returns:
+        Optional[SalesColumns]: As colunas em cache, ou None se o cache estiver ausente,
+        inválido ou desatualizado.
+    """
+    try:
+        with open(path, 'rb') as handle:
+            if handle.readline() != CACHE_MAGIC:
+                return None
+            metadata = json.loads(handle.readline().decode('utf-8'))
+            if metadata.get("fingerprint") != fingerprint or metadata.get("date_format") != date_format:
+                return None
+            columns = SalesColumns()
+            columns.set_products(metadata["products"])
+            rows = metadata["rows"]
+            columns.rows_read = metadata["rows_read"]
+            columns.reject_categories = list(metadata["reject_categories"])
+            for column in (columns.product_ids, columns.quantities, columns.prices, columns.ordinals):
+                column.fromfile(handle, rows)
+            for column in (columns.reject_ordinals, columns.reject_category_ids):
+                column.fromfile(handle, metadata["rejects"])
+            return columns
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, KeyError) as _err:
+        logging.warning("Ignoring invalid cache file '%s': %s", path, _err)
+        return None
+
+
+def load_columns(
+    file_path: str,
+    cache_dir: str,
+    date_format: str = "%Y-%m-%d",
+    rejects: Optional[RejectedRows] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None
+) -> SalesColumns:
+    """
+    Carrega as colunas de vendas de um CSV, usando o cache quando ele estiver válido.
+
+    Se o cache estiver ausente ou desatualizado, o CSV é lido por completo e um novo
+    cache é gravado. Falhas de escrita do cache são apenas registradas no log.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        cache_dir (str): O diretório dos arquivos de cache.
+        date_format (str): O formato das datas de venda.
+        rejects (Optional[RejectedRows]): Onde registrar as linhas com erro dentro do
+            filtro de datas; com o cache válido, recebe apenas as contagens por categoria.
+        start (Optional[int]): Início (ordinal, inclusivo) do filtro de datas.
+        end (Optional[int]): Fim (ordinal, exclusivo) do filtro de datas.
+
+    Returns:
+        SalesColumns: As colunas de vendas do arquivo.
+    """
+    fingerprint = file_fingerprint(file_path)
+    path = sidecar_path(cache_dir, file_path, date_format)
+    columns = read_sidecar(path, fingerprint, date_format)
+    if columns is not None:
+        logging.info("Using cached data from '%s'.", path)
+        if rejects is not None:
+            rejects.merge(columns.rejected_in_range(start, end))
+        return columns
+
+    columns = SalesColumns()
+    with open_sales_file(file_path) as csv_file:
+        columns.extend_from_lines(csv_file, date_format, rejects, start, end)
+    try:
+        write_sidecar(path, columns, fingerprint, date_format)
+    except OSError as _err:
+        logging.warning("Could not write cache file '%s': %s", path, _err)
+    return columns
+
@@ -0,0 +1,286 @@
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from core.counters import ProductCounters
+from core.rejects import RejectedRows, error_category
+from utils.helpers import convert_sale_values, parse_date_cached
+
+UNPARSED_DATE = 0
+
+# Abaixo deste limite, nenhuma soma de quantidades sai de int64 e as somas vetorizadas
+# (que dariam a volta em silêncio) são exatas.
+SAFE_QUANTITY_BOUND = 2.0 ** 62
+
+
+def in_range(ordinal: int, start: Optional[int], end: Optional[int]) -> bool:
+    """Indica se um ordinal está em [start, end); datas não convertidas estão em todos."""
+    return ordinal == UNPARSED_DATE or (
+        (start is None or ordinal >= start) and (end is None or ordinal < end))
+
+
+class SalesColumns:
+    """
+    Representação colunar e compacta das vendas válidas de um arquivo CSV.
+
+    Os produtos são codificados em dicionário (ids inteiros densos na ordem de primeira
+    ocorrência) e as datas são guardadas como ordinais (``date.toordinal()``). Datas que
+    não puderam ser convertidas recebem o ordinal 0 e nunca são filtradas, como em
+    process_csv_rows.
+
+    As linhas rejeitadas são guardadas com a data (quando convertida) e a categoria do
+    erro, para que cada agregação conte apenas as rejeitadas dentro do filtro de datas,
+    como a leitura linha a linha, que verifica a data antes dos valores.
+
+    Attributes:
+        products (List[str]): Nomes dos produtos, indexados pelo id.
+        product_ids (array): Id do produto de cada venda.
+        quantities (array): Quantidade de cada venda.
+        prices (array): Preço unitário de cada venda.
+        ordinals (array): Data de cada venda como ordinal.
+        reject_ordinals (array): Data de cada linha rejeitada como ordinal.
+        reject_category_ids (array): Categoria de cada linha rejeitada, como índice em
+            reject_categories.
+        reject_categories (List[str]): Nomes das categorias de erro.
+        rows_read (int): Linhas lidas do CSV.
+        rows_accepted (int): Vendas selecionadas pela última chamada de aggregate().
+        rows_rejected (int): Linhas rejeitadas dentro do filtro da última chamada de
+            aggregate() (inclusive as somas fora do intervalo).
+        reject_counts (Dict[str, int]): As mesmas linhas, por categoria de erro.
+        rows_out_of_range (int): Vendas rejeitadas pela última chamada de aggregate()
+            porque a soma do produto não caberia em int64.
+    """
+
+    def __init__(self):
+        self.products: List[str] = []
+        self.product_ids = array('i')
+        self.quantities = array('q')
+        self.prices = array('d')
+        self.ordinals = array('i')
+        self.reject_ordinals = array('i')
+        self.reject_category_ids = array('i')
+        self.reject_categories: List[str] = []
+        self.rows_read = 0
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+        self.reject_counts: Dict[str, int] = {}
+        self.rows_out_of_range = 0
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def set_products(self, products: List[str]) -> None:
+        """Define a tabela de produtos (usado ao carregar colunas já codificadas)."""
+        self.products = list(products)
+        self._index = {name: idx for idx, name in enumerate(self.products)}
+
+    def copy(self) -> 'SalesColumns':
+        """Retorna uma cópia independente das colunas e das contagens."""
+        columns = SalesColumns()
+        columns.set_products(self.products)
+        columns.product_ids = array(self.product_ids.typecode, self.product_ids)
+        columns.quantities = array(self.quantities.typecode, self.quantities)
+        columns.prices = array(self.prices.typecode, self.prices)
+        columns.ordinals = array(self.ordinals.typecode, self.ordinals)
+        columns.reject_ordinals = array(self.reject_ordinals.typecode, self.reject_ordinals)
+        columns.reject_category_ids = array(self.reject_category_ids.typecode, self.reject_category_ids)
+        columns.reject_categories = list(self.reject_categories)
+        columns.rows_read = self.rows_read
+        return columns
+
+    def append(self, product: str, quantity: int, unit_price: float, ordinal: int) -> None:
+        """Acrescenta uma venda às colunas."""
+        self.quantities.append(quantity)
+        product_id = self._index.get(product)
+        if product_id is None:
+            product_id = len(self.products)
+            self._index[product] = product_id
+            self.products.append(product)
+        self.product_ids.append(product_id)
+        self.prices.append(unit_price)
+        self.ordinals.append(ordinal)
+
+    def add_reject(self, category: str, ordinal: int) -> None:
+        """Registra uma linha rejeitada, com a categoria do erro e a data como ordinal."""
+        if category not in self.reject_categories:
+            self.reject_categories.append(category)
+        self.reject_category_ids.append(self.reject_categories.index(category))
+        self.reject_ordinals.append(ordinal)
+
+    def rejected_in_range(self, start: Optional[int], end: Optional[int]) -> Dict[str, int]:
+        """Conta, por categoria de erro, as linhas rejeitadas com data em [start, end)."""
+        counts: Dict[str, int] = {}
+        for category_id, ordinal in zip(self.reject_category_ids, self.reject_ordinals):
+            if in_range(ordinal, start, end):
+                category = self.reject_categories[category_id]
+                counts[category] = counts.get(category, 0) + 1
+        return counts
+
+    def extend_from_lines(
+        self,
+        lines: Iterable[str],
+        date_format: str = "%Y-%m-%d",
+        rejects: Optional[RejectedRows] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> None:
+        """
+        Converte todas as vendas válidas de um CSV (começando pelo cabeçalho) em colunas,
+        sem aplicar filtro de datas.
+
+        Args:
+            lines (Iterable[str]): As linhas do CSV.
+            date_format (str): O formato das datas de venda.
+            rejects (Optional[RejectedRows]): Onde registrar as linhas com erro.
+            start (Optional[int]): Início (ordinal, inclusivo) do filtro de datas da
+                leitura; apenas as linhas com erro dentro do filtro vão para rejects.
+            end (Optional[int]): Fim (ordinal, exclusivo) do filtro de datas da leitura.
+        """
+        rejects = rejects or RejectedRows()
+        for row in rejects.dict_reader(lines):
+            self.rows_read += 1
+            ordinal = UNPARSED_DATE
+            try:
+                sale_date_str = row.get('data_venda', '').strip()
+                quantity_str = row.get('quantidade', '').strip()
+                price_str = row.get('preco_unitario', '').strip()
+                if not sale_date_str or not quantity_str or not price_str:
+                    continue
+                sale_date = parse_date_cached(sale_date_str, date_format)
+                ordinal = sale_date.toordinal() if sale_date else UNPARSED_DATE
+                quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                self.append(
+                    row.get('produto', 'Unknown').strip(), quantity, unit_price, ordinal)
+            except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                category = error_category(_err)
+                self.add_reject(category, ordinal)
+                if in_range(ordinal, start, end):
+                    rejects.reject(_err, row, category)
+
+    def aggregate(
+        self,
+        filter_start_date: Optional[datetime],
+        filter_end_date: Optional[datetime],
+        revenue_dict: Dict[str, float],
+        quantity_dict: Dict[str, int]
+    ) -> float:
+        """
+        Agrega as vendas dentro do filtro de datas nos dicionários de receita e quantidade.
+
+        Usa NumPy quando disponível; caso contrário, ou se alguma soma de quantidades
+        puder sair de int64, percorre as colunas em Python. Em ambos os casos, as somas
+        seguem a ordem do arquivo, como em process_csv_rows, e uma venda cuja soma não
+        caiba em int64 é rejeitada como 'out_of_range'. A quantidade de vendas
+        selecionadas fica em rows_accepted, e as rejeitadas dentro do filtro, em
+        rows_rejected e reject_counts.
+
+        Returns:
+            float: A receita total das vendas agregadas.
+        """
+        start = filter_start_date.toordinal() if filter_start_date else None
+        end = filter_end_date.toordinal() if filter_end_date else None
+        self.rows_out_of_range = 0
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            total = self._aggregate_python(start, end, revenue_dict, quantity_dict)
+        else:
+            if self._sums_fit(quantity_dict):
+                total = self._aggregate_numpy(start, end, revenue_dict, quantity_dict)
+            else:
+                total = self._aggregate_python(start, end, revenue_dict, quantity_dict)
+        self.reject_counts = self.rejected_in_range(start, end)
+        if self.rows_out_of_range:
+            self.reject_counts['out_of_range'] = \
+                self.reject_counts.get('out_of_range', 0) + self.rows_out_of_range
+        self.rows_rejected = sum(self.reject_counts.values())
+        return total
+
+    def _sums_fit(self, quantity_dict: Dict[str, int]) -> bool:
+        """
+        Verifica, sem percorrer as vendas, que nenhuma soma de quantidades pode sair de
+        int64 (limite em float, que não dá a volta).
+        """
+        import numpy as np
+
+        bound = float(max(map(abs, quantity_dict.values()), default=0))
+        quantities = np.frombuffer(self.quantities, dtype=np.int64).astype(np.float64)
+        return bound + float(np.abs(quantities).sum()) < SAFE_QUANTITY_BOUND
+
+    def _aggregate_python(
+        self,
+        start: Optional[int],
+        end: Optional[int],
+        revenue_dict: Dict[str, float],
+        quantity_dict: Dict[str, int]
+    ) -> float:
+        total = 0.0
+        accepted = 0
+        products = self.products
+        counters = ProductCounters.from_dicts(revenue_dict, quantity_dict)
+        for product_id, quantity, unit_price, ordinal in zip(
+                self.product_ids, self.quantities, self.prices, self.ordinals):
+            if ordinal != UNPARSED_DATE:
+                if start is not None and ordinal < start:
+                    continue
+                if end is not None and ordinal >= end:
+                    continue
+            sale_value = quantity * unit_price
+            try:
+                counters.add(products[product_id], quantity, sale_value)
+            except OverflowError:
+                self.rows_out_of_range += 1
+                continue
+            total += sale_value
+            accepted += 1
+        revenue, quantity = counters.to_dicts()
+        revenue_dict.update(revenue)
+        quantity_dict.update(quantity)
+        self.rows_accepted = accepted
+        return total
+
+    def _aggregate_numpy(
+        self,
+        start: Optional[int],
+        end: Optional[int],
+        revenue_dict: Dict[str, float],
+        quantity_dict: Dict[str, int]
+    ) -> float:
+        import numpy as np
+
+        self.rows_accepted = 0
+        if len(self) == 0:
+            return 0.0
+        product_ids = np.frombuffer(self.product_ids, dtype=np.int32)
+        quantities = np.frombuffer(self.quantities, dtype=np.int64)
+        prices = np.frombuffer(self.prices, dtype=np.float64)
+        ordinals = np.frombuffer(self.ordinals, dtype=np.int32)
+
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= ordinals >= start
+        if end is not None:
+            mask &= ordinals < end
+        mask |= ordinals == UNPARSED_DATE
+        selected = np.flatnonzero(mask)
+        self.rows_accepted = int(selected.size)
+        if selected.size == 0:
+            return 0.0
+
+        selected_ids = product_ids[selected]
+        selected_quantities = quantities[selected]
+        sale_values = selected_quantities * prices[selected]
+        revenue = np.zeros(len(self.products), dtype=np.float64)
+        quantity = np.zeros(len(self.products), dtype=np.int64)
+        total = np.zeros(1, dtype=np.float64)
+        np.add.at(revenue, selected_ids, sale_values)
+        np.add.at(quantity, selected_ids, selected_quantities)
+        np.add.at(total, np.zeros(sale_values.size, dtype=np.intp), sale_values)
+
+        unique_ids, first_index = np.unique(selected_ids, return_index=True)
+        for product_id in unique_ids[np.argsort(first_index, kind='stable')].tolist():
+            product = self.products[product_id]
+            revenue_dict[product] = revenue_dict.get(product, 0.0) + float(revenue[product_id])
+            quantity_dict[product] = quantity_dict.get(product, 0) + int(quantity[product_id])
+        return float(total[0])
@@ -0,0 +1,168 @@
+import io
+import threading
+from typing import BinaryIO, Optional, TextIO, Union
+
+DECOMPRESS_BLOCK_SIZE = 1 << 20
+DECOMPRESS_QUEUE_BLOCKS = 4
+
+MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+
+
+def open_decompressor(compression: str, raw: BinaryIO) -> BinaryIO:
+    """
+    Abre o descompressor de um fluxo binário. Os módulos de compressão são importados
+    apenas aqui, quando a entrada está de fato comprimida.
+    """
+    if compression == "gzip":
+        import gzip
+        return gzip.GzipFile(fileobj=raw)
+    if compression == "bz2":
+        import bz2
+        return bz2.BZ2File(raw)
+    import lzma
+    return lzma.LZMAFile(raw)
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """
+    Identifica a compressão de um arquivo pelos seus primeiros bytes.
+
+    Args:
+        header (bytes): Os primeiros bytes do arquivo (ao menos 6).
+
+    Returns:
+        Optional[str]: 'gzip', 'bz2', 'xz' ou None se o arquivo não estiver comprimido.
+    """
+    for magic, name in MAGIC_BYTES:
+        if header.startswith(magic):
+            return name
+    return None
+
+
+def file_compression(file_path: str) -> Optional[str]:
+    """Identifica a compressão de um arquivo em disco pelos seus bytes iniciais."""
+    with open(file_path, 'rb') as handle:
+        return detect_compression(handle.read(6))
+
+
+class BackgroundReader(io.RawIOBase):
+    """
+    Fluxo binário somente leitura que lê (e descomprime) a origem em uma thread.
+
+    A thread produtora lê blocos de block_size bytes e os entrega por uma fila limitada a
+    max_blocks blocos, de modo que a descompressão e o processamento das linhas se
+    sobrepõem e o uso de memória permanece constante. Erros da thread produtora são
+    relançados na leitura. Ao fechar, a origem e o arquivo subjacente (owned) são fechados.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        owned: Optional[BinaryIO] = None,
+        block_size: int = DECOMPRESS_BLOCK_SIZE,
+        max_blocks: int = DECOMPRESS_QUEUE_BLOCKS
+    ):
+        super().__init__()
+        self._source = source
+        self._owned = owned
+        self._block_size = block_size
+        import queue
+        self._queue: "queue.Queue[Union[bytes, BaseException]]" = queue.Queue(maxsize=max_blocks)
+        self._stop = threading.Event()
+        self._block = b""
+        self._offset = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Union[bytes, BaseException]) -> None:
+        import queue
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _produce(self) -> None:
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(self._block_size)
+                self._put(block)
+                if not block:
+                    return
+        except BaseException as _err:  # pylint: disable=broad-except
+            self._put(_err)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._offset >= len(self._block):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._block, self._offset = item, 0
+        size = min(len(buffer), len(self._block) - self._offset)
+        buffer[:size] = self._block[self._offset:self._offset + size]
+        self._offset += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+            if self._owned is not None:
+                self._owned.close()
+        super().close()
+
+
+def open_sales_stream(raw: BinaryIO, encoding: str = 'utf-8') -> TextIO:
+    """
+    Abre um fluxo binário como texto, descomprimindo gzip, bz2 ou xz em segundo plano
+    quando a compressão é detectada pelos bytes iniciais.
+
+    Args:
+        raw (BinaryIO): O fluxo binário (ex.: arquivo aberto em 'rb' ou sys.stdin.buffer).
+        encoding (str): A codificação do texto.
+
+    Returns:
+        TextIO: O fluxo de texto, pronto para o leitor CSV.
+    """
+    if not hasattr(raw, 'peek'):
+        raw = io.BufferedReader(raw)
+    compression = detect_compression(raw.peek(6)[:6])
+    if compression is None:
+        return io.TextIOWrapper(raw, encoding=encoding, newline='')
+    decompressed = BackgroundReader(open_decompressor(compression, raw), owned=raw)
+    return io.TextIOWrapper(
+        io.BufferedReader(decompressed, buffer_size=DECOMPRESS_BLOCK_SIZE),
+        encoding=encoding,
+        newline=''
+    )
+
+
+def open_sales_file(file_path: str, encoding: str = 'utf-8') -> TextIO:
+    """
+    Abre um arquivo de vendas em modo texto, comprimido ou não.
+
+    Args:
+        file_path (str): O caminho do arquivo (.csv, .csv.gz, .csv.bz2, .csv.xz, ...).
+        encoding (str): A codificação do texto.
+
+    Returns:
+        TextIO: O fluxo de texto do arquivo.
+    """
+    return open_sales_stream(open(file_path, 'rb'), encoding)
@@ -0,0 +1,128 @@
+from array import array
+from typing import Dict, List, Tuple
+
+# Faixa dos contadores inteiros ('q'); somas fora dela são rejeitadas como 'out_of_range'.
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+def check_range(quantity: int, revenue: float = 0, cents: bool = False) -> None:
+    """
+    Lança OverflowError se a quantidade (ou, em centavos, a receita) não couber em int64.
+    Todas as somas por produto passam por esta verificação, em todos os modos.
+    """
+    if not INT64_MIN <= quantity <= INT64_MAX or (cents and not INT64_MIN <= revenue <= INT64_MAX):
+        raise OverflowError("quantity or revenue out of range")
+
+
+class ProductCounters:
+    """
+    Receita e quantidade por produto em colunas compactas indexadas por id.
+
+    Cada produto é internado uma única vez em um id inteiro denso (na ordem de primeira
+    ocorrência); receita e quantidade são acumuladas em arrays indexados por esse id, sem
+    um objeto Python por valor. Os nomes só são associados aos valores em to_dicts(), ao
+    montar os resultados. Os arrays podem ser lidos sem cópia com numpy.frombuffer.
+
+    Attributes:
+        cents (bool): Se a receita é acumulada em centavos inteiros.
+        products (List[str]): Nomes dos produtos, indexados pelo id.
+        ids (Dict[str, int]): Id de cada produto.
+        revenue (array): Receita por id ('d', ou 'q' em centavos).
+        quantity (array): Quantidade por id.
+    """
+
+    def __init__(self, cents: bool = False):
+        self.cents = cents
+        self.products: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.revenue = array('q' if cents else 'd')
+        self.quantity = array('q')
+
+    @classmethod
+    def from_dicts(
+        cls,
+        revenue_dict: Dict[str, float],
+        quantity_dict: Dict[str, int],
+        cents: bool = False
+    ) -> 'ProductCounters':
+        """
+        Cria os contadores a partir de agregados já existentes, preservando a ordem dos
+        produtos, para que as somas continuem na mesma sequência.
+        """
+        counters = cls(cents)
+        for product, revenue in revenue_dict.items():
+            product_id = counters.intern(product)
+            counters.revenue[product_id] = revenue
+            counters.quantity[product_id] = quantity_dict.get(product, 0)
+        return counters
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def intern(self, product: str) -> int:
+        """Retorna o id do produto, criando-o (com contadores zerados) se necessário."""
+        product_id = self.ids.get(product)
+        if product_id is None:
+            product_id = len(self.products)
+            self.ids[product] = product_id
+            self.products.append(product)
+            self.revenue.append(0)
+            self.quantity.append(0)
+        return product_id
+
+    def check(self, product: str, quantity: int, sale_value: float) -> None:
+        """
+        Lança OverflowError se as somas do produto com a venda não couberem nos
+        contadores (a quantidade, e a receita em centavos, em int64).
+        """
+        product_id = self.ids.get(product)
+        if product_id is None:
+            check_range(quantity, sale_value, self.cents)
+        else:
+            check_range(self.quantity[product_id] + quantity, self.revenue[product_id] + sale_value,
+                        self.cents)
+
+    def add(self, product: str, quantity: int, sale_value: float) -> int:
+        """
+        Acumula uma venda do produto e retorna o seu id. Se as novas somas não couberem
+        nos contadores, lança OverflowError sem alterar os contadores (nem internar o
+        produto).
+        """
+        # Caminho de cada linha dos motores linha a linha: a verificação de check_range()
+        # é feita em linha.
+        product_id = self.ids.get(product)
+        if product_id is None:
+            new_quantity, new_revenue = quantity, sale_value
+        else:
+            new_quantity = self.quantity[product_id] + quantity
+            new_revenue = self.revenue[product_id] + sale_value
+        if not INT64_MIN <= new_quantity <= INT64_MAX or (
+                self.cents and not INT64_MIN <= new_revenue <= INT64_MAX):
+            raise OverflowError("quantity or revenue out of range")
+        if product_id is None:
+            product_id = self.intern(product)
+        self.revenue[product_id] = new_revenue
+        self.quantity[product_id] = new_quantity
+        return product_id
+
+    def add_id(self, product_id: int, quantity: int, sale_value: float) -> None:
+        """Como add(), para um produto já internado."""
+        new_quantity = self.quantity[product_id] + quantity
+        new_revenue = self.revenue[product_id] + sale_value
+        check_range(new_quantity, new_revenue, self.cents)
+        self.revenue[product_id] = new_revenue
+        self.quantity[product_id] = new_quantity
+
+    def to_dicts(self) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """
+        Converte os contadores nos dicionários de receita e quantidade por produto.
+
+        Returns:
+            Tuple[Dict[str, float], Dict[str, int]]: Receita e quantidade por produto, na
+            ordem de primeira ocorrência.
+        """
+        return (
+            dict(zip(self.products, self.revenue)),
+            dict(zip(self.products, self.quantity))
+        )
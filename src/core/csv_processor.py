@@ -1,20 +1,55 @@
-import csv
 from datetime import datetime
+from itertools import chain
 import logging
+import math
+import os
 import sys
-from typing import Any, Dict, List, Optional
-from interfaces.reader_interface import Reader
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from core.compression import file_compression, open_sales_stream
+from core.counters import ProductCounters
+from core.metrics import NULL_METRICS, Metrics
+from core.parallel import iter_range_lines, split_byte_ranges
+from core.rejects import RejectedRows, TooManyRejectedRows
+from interfaces.reader_interface import BatchReader, UnsupportedOptions
 from utils.helpers import (
     calculate_sales,
+    convert_sale_cents,
     convert_sale_values,
     datetime_treat,
-    parse_date,
-    update_aggregates,
+    expand_paths,
+    make_date_filter,
+    merge_aggregates,
     parser_to_dict_list
 )
 
+if TYPE_CHECKING:
+    from core.aggregators import CompositeAggregator
+    from core.batches import SalesBatch
+    from core.group_by import GroupByAggregator
+    from core.heavy_hitters import HeavyHitterAggregator
+    from core.rollup import SalesRollup
+    from core.sampling import BlockSample, BlockSampler
+    from core.windows import DateWindow
 
-class CSVProcessor(Reader):
+# Os módulos de cada modo (cache, índice de datas, janelas, rollup, workers, ...) são
+# importados apenas quando o modo é usado, para que a inicialização do CLI em arquivos
+# pequenos carregue só o caminho principal.
+ENGINES = ('python', 'numpy', 'mmap', 'cents')
+STDIN_PATH = '-'
+MAX_FILE_THREADS = 8
+
+# Motores aplicados por cada modo de leitura de process_csv_rows(); os modos também não
+# usam --workers, --pipeline, --cache-dir nem --state-file.
+MODE_ENGINES = {
+    '--approx': ENGINES,
+    '--group-by': ('python', 'cents'),
+    '--heavy-hitters': ('python',),
+    '--rollup': ('python',),
+    '--window': ('python',),
+}
+
+
+class CSVProcessor(BatchReader):
     """
     Processador de dados de vendas baseado em CSV.
     """
@@ -26,14 +61,41 @@ class CSVProcessor(Reader):
         end_date: Optional[str] = None,
     ):
         self._data_path: str = file_path
+        self._data_paths: List[str] = [file_path] if file_path else []
         self.start_date: Optional[str] = start_date
         self.end_date: Optional[str] = end_date
         self._headers: List[str] = []
         self.date_format = "%Y-%m-%d"
+        self.engine: str = "python"
+        self.workers: int = 1
+        self.pipeline: bool = False
+        self.cache_dir: Optional[str] = None
+        self.state_file: Optional[str] = None
+        self.windows: List['DateWindow'] = []
+        self._window_processors: List['CSVProcessor'] = []
+        self.rollup: bool = False
+        self._rollup: Optional['SalesRollup'] = None
+        self.top: Optional[int] = None
+        self.heavy_hitters: Optional[int] = None
+        self._heavy_hitters: Optional['HeavyHitterAggregator'] = None
+        self.group_by: List[str] = []
+        self.memory_limit: Optional[int] = None
+        self._group_by: Optional['GroupByAggregator'] = None
+        self.approx: Optional['BlockSampler'] = None
+        self._sample: Optional['BlockSample'] = None
+        self._sample_bytes: int = 0
         self.global_revenue: float = 0.0
         self.total_global_revenue: float = 0.0
         self.revenue_per_product: Dict[str, float] = {}
         self.quantity_per_product: Dict[str, int] = {}
+        self.rows_read: int = 0
+        self.rows_accepted: int = 0
+        self.rows_rejected: int = 0
+        self.max_errors: Optional[int] = None
+        self.quarantine_file: Optional[str] = None
+        self.rejects = RejectedRows()
+        self.metrics: Metrics = NULL_METRICS
+        self.file_stats: List[Dict[str, Any]] = []
 
     def set_file_path(self, file_path: str) -> None:
         """
@@ -42,6 +104,19 @@ class CSVProcessor(Reader):
         if not isinstance(file_path, str) or not file_path:
             raise ValueError("O caminho do arquivo não pode ser vazio.")
         self._data_path = file_path
+        self._data_paths = [file_path]
+
+    def set_file_paths(self, file_paths: List[str]) -> None:
+        """
+        Define vários arquivos CSV a serem processados em uma única agregação.
+
+        Aceita caminhos, padrões glob (ex.: 'vendas/*.csv') e '-' para a entrada padrão.
+        """
+        if not file_paths:
+            raise ValueError("O caminho do arquivo não pode ser vazio.")
+        paths = expand_paths(file_paths)
+        self.set_file_path(paths[0])
+        self._data_paths = paths
 
     def set_date_filters(
         self,
@@ -60,6 +135,140 @@ class CSVProcessor(Reader):
         """
         self.date_format = date_format
 
+    def set_engine(self, engine: str) -> None:
+        """
+        Define o motor de processamento: 'python' (linha a linha), 'numpy' (colunar),
+        'mmap' (tokenizador de bytes sobre o arquivo mapeado em memória) ou 'cents' (linha
+        a linha, com os valores acumulados em centavos inteiros).
+        """
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Motor de processamento inválido: '{engine}'. Escolha entre {list(ENGINES)}")
+        self.engine = engine
+        if engine == 'cents':
+            self.global_revenue = 0
+            self.total_global_revenue = 0
+
+    def set_workers(self, workers: int) -> None:
+        """
+        Define a quantidade de processos usados no processamento (1 = serial).
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("A quantidade de workers deve ser um inteiro maior ou igual a 1.")
+        self.workers = workers
+
+    def set_pipeline(self, enabled: bool) -> None:
+        """
+        Ativa o pipeline de leitura: blocos lidos à frente em uma thread, decodificados em
+        lotes de linhas em outra e agregados na thread principal (leitura serial).
+        """
+        self.pipeline = bool(enabled)
+
+    def set_cache_dir(self, cache_dir: Optional[str]) -> None:
+        """
+        Define o diretório do cache colunar persistente (None desativa o cache).
+        """
+        self.cache_dir = cache_dir or None
+
+    def set_state_file(self, state_file: Optional[str]) -> None:
+        """
+        Define o arquivo de estado do processamento incremental (None desativa).
+        """
+        self.state_file = state_file or None
+
+    def set_windows(self, windows: List['DateWindow']) -> None:
+        """
+        Define janelas de datas nomeadas (nome, início, fim) avaliadas em uma única leitura.
+
+        Com janelas definidas, process_data() retorna um relatório por janela.
+        """
+        self.windows = list(windows)
+
+    def set_rollup(self, enabled: bool) -> None:
+        """
+        Ativa os agregados diários com somas de prefixo: o filtro de datas e as janelas
+        são respondidos a partir deles, e o relatório inclui as séries diária, semanal e
+        mensal do período.
+        """
+        self.rollup = bool(enabled)
+
+    def set_top(self, top: Optional[int]) -> None:
+        """
+        Limita a receita por produto do relatório aos top produtos, selecionados com um
+        heap em vez da ordenação completa (None mantém todos os produtos).
+        """
+        if top is not None and (not isinstance(top, int) or top < 1):
+            raise ValueError("O top deve ser um inteiro maior ou igual a 1.")
+        self.top = top
+
+    def set_heavy_hitters(self, capacity: Optional[int]) -> None:
+        """
+        Ativa o modo aproximado de memória limitada: receita e quantidade por produto são
+        mantidas em capacity contadores Space-Saving (None desativa).
+        """
+        if capacity is not None and (not isinstance(capacity, int) or capacity < 1):
+            raise ValueError("A capacidade deve ser um inteiro maior ou igual a 1.")
+        self.heavy_hitters = capacity
+
+    def set_group_by(self, columns: Optional[List[str]]) -> None:
+        """
+        Agrupa as vendas pelas colunas informadas (ex.: ['produto', 'loja',
+        'data_venda:mes']) em vez de apenas por produto (None ou [] desativa).
+        """
+        self.group_by = list(columns or [])
+
+    def set_memory_limit(self, memory_limit: Optional[int]) -> None:
+        """
+        Limita a memória da tabela de grupos a memory_limit bytes (estimados); acima dele,
+        os agregados parciais são gravados em disco e mesclados ao final (None desativa).
+        Exige set_top(), para que apenas os top grupos sejam mantidos na saída.
+        """
+        if memory_limit is not None and (not isinstance(memory_limit, int) or memory_limit < 1):
+            raise ValueError("O limite de memória deve ser um inteiro maior ou igual a 1.")
+        self.memory_limit = memory_limit
+
+    def set_approx(
+        self,
+        fraction: Optional[float],
+        time_budget: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Ativa o modo aproximado por amostragem: apenas uma fração aleatória dos blocos dos
+        arquivos (ou os blocos lidos em time_budget segundos) é processada, e as
+        estimativas vêm com intervalos de confiança (fraction e time_budget None
+        desativam; seed torna o sorteio reproduzível).
+        """
+        if fraction is None and time_budget is None:
+            self.approx = None
+            return
+        from core.sampling import BlockSampler
+        self.approx = BlockSampler(fraction, time_budget, seed)
+
+    def set_max_errors(self, max_errors: Optional[int]) -> None:
+        """
+        Define a quantidade máxima de linhas com erro de formatação; acima dela, o
+        processamento é interrompido (None desativa o limite).
+        """
+        if max_errors is not None and (not isinstance(max_errors, int) or max_errors < 0):
+            raise ValueError("O limite de erros deve ser um inteiro maior ou igual a 0.")
+        self.max_errors = max_errors
+        self.rejects.max_errors = max_errors
+
+    def set_quarantine_file(self, quarantine_file: Optional[str]) -> None:
+        """
+        Define o arquivo em que as linhas rejeitadas são gravadas (None desativa).
+        """
+        self.quarantine_file = quarantine_file or None
+        self.rejects.quarantine_file = self.quarantine_file
+
+    def set_metrics(self, metrics: Optional[Metrics]) -> None:
+        """
+        Define onde registrar o tempo de cada etapa e os bytes lidos (None desativa; as
+        etapas não são medidas e o processamento não tem custo adicional).
+        """
+        self.metrics = metrics or NULL_METRICS
+
     def process_data(self) -> Dict[str, Any]:
         """
         Processa o arquivo CSV e retorna um dicionário com os resultados agregados.
@@ -71,8 +280,16 @@ class CSVProcessor(Reader):
         Returns:
             Dict[str, Any]: Um dicionário com os resultados agregados.
         """
-        self.process_csv_rows()
-        return self.aggregate_results()
+        with self.metrics.stage('scan'):
+            self.process_csv_rows()
+        with self.metrics.stage('results'):
+            if self.windows:
+                results = self.aggregate_window_results()
+            else:
+                results = self.aggregate_results()
+            if self._rollup is not None:
+                results["rollup"] = self.aggregate_rollup_series()
+        return results
 
     def process_csv_rows(self):
         """
@@ -94,53 +311,786 @@ class CSVProcessor(Reader):
         Returns:
             None: Nenhum valor é retornado.
         """
-        filter_start_date, filter_end_date = datetime_treat(
-            self.start_date, self.end_date)
         try:
-            with open(self._data_path, mode='r', newline='', encoding='utf-8') as csv_file:
-                reader = csv.DictReader(csv_file)
-                for row in reader:
-                    try:
-                        product = row.get('produto', 'Unknown').strip()
-                        quantity_str = row.get('quantidade', '').strip()
-                        price_str = row.get('preco_unitario', '').strip()
-                        sale_date_str = row.get('data_venda', '').strip()
-
-                        if not quantity_str or not price_str or not sale_date_str:
-                            continue
-
-                        sale_date = parse_date(sale_date_str, self.date_format)
-
-                        if filter_start_date and sale_date and sale_date < filter_start_date:
-                            continue
-                        if filter_end_date and sale_date and sale_date >= filter_end_date:
-                            continue
-
-                        quantity, unit_price = convert_sale_values(
-                            quantity_str, price_str)
-                        row_sale_value = calculate_sales(quantity, unit_price)
-
-                        new_global_revenue = update_aggregates(
-                            product,
-                            quantity,
-                            row_sale_value,
-                            self.global_revenue,
-                            self.revenue_per_product,
-                            self.quantity_per_product
-                        )
-                        self.total_global_revenue += new_global_revenue
-                    except (ValueError, KeyError) as _err:
-                        logging.warning(
-                            "Row skipped due to formatting error: %s - Data: %s", _err, row)
-                        continue
-        except FileNotFoundError:
+            self.check_mode_options()
+            if self.approx is not None:
+                self.process_sampled_files()
+            elif self.group_by:
+                self.process_group_by_files()
+            elif self.heavy_hitters:
+                self.process_heavy_hitter_files()
+            elif self.rollup:
+                self.process_rollup_files()
+            elif self.windows:
+                self.process_window_files()
+            elif len(self._data_paths) > 1:
+                self.process_many_files()
+            else:
+                self.process_single_file()
+        except FileNotFoundError as _err:
             logging.error("Error: The file '%s' was not found.",
-                          self._data_path)
+                          _err.filename or self._data_path)
+            sys.exit(1)
+        except UnsupportedOptions as _err:
+            logging.error("Error: %s", _err)
             sys.exit(1)
         except ValueError as _err:
             logging.error(
                 "Error: Date format is incorrect or missing column. %s", _err)
             sys.exit(1)
+        except TooManyRejectedRows as _err:
+            logging.error("Error: Too many rows with formatting errors. %s", _err)
+            sys.exit(1)
+        finally:
+            self.rejects.close()
+        self.rejects.log_summary()
+
+    def check_mode_options(self) -> None:
+        """
+        Lança UnsupportedOptions se o modo de leitura (--approx, --group-by,
+        --heavy-hitters, --rollup ou --window, nesta ordem de prioridade) for combinado
+        com opções que ele não aplica, em vez de ignorá-las.
+        """
+        mode = next((option for option, used in (
+            ('--approx', self.approx is not None),
+            ('--group-by', self.group_by),
+            ('--heavy-hitters', self.heavy_hitters),
+            ('--rollup', self.rollup),
+            ('--window', self.windows),
+        ) if used), None)
+        if mode is None:
+            return
+        unsupported = [
+            option for option, used in (
+                (f'--engine {self.engine}', self.engine not in MODE_ENGINES[mode]),
+                ('--workers', self.workers > 1),
+                ('--pipeline', self.pipeline),
+                ('--cache-dir', self.cache_dir),
+                ('--state-file', self.state_file),
+            ) if used
+        ]
+        if unsupported:
+            raise UnsupportedOptions(f"{', '.join(unsupported)} cannot be combined with {mode}.")
+
+    def process_single_file(self) -> None:
+        """
+        Processa o arquivo em _data_path no modo configurado (incremental, cache, índice
+        de datas, paralelo, mmap, pipeline ou serial) e registra suas contagens de linhas e
+        erros.
+
+        Arquivos gzip, bz2 e xz são detectados pelos bytes iniciais e descomprimidos em
+        uma thread em segundo plano; nesse caso o índice de datas e os workers, que
+        dependem de posições no arquivo, não são usados.
+        """
+        rows_read, rows_rejected = self.rows_read, self.rows_rejected
+        compression = None
+        if self._data_path != STDIN_PATH:
+            compression = file_compression(self._data_path)
+        if compression and self.state_file:
+            raise UnsupportedOptions("--state-file requires an uncompressed file.")
+        if compression and self.workers > 1:
+            logging.warning(
+                "Compressed input (%s) is processed by a single worker.", compression)
+        if self.quarantine_file and self.workers > 1:
+            logging.warning("--quarantine-file is written by a single worker.")
+        if self.cache_dir and self.engine == 'cents':
+            logging.warning("The cents engine does not use the columnar cache.")
+        use_cache = self.cache_dir and self.engine != 'cents'
+
+        if self._data_path == STDIN_PATH:
+            self.process_lines(self.open_input(STDIN_PATH))
+        else:
+            index = None
+            if not (compression or self.state_file or use_cache) \
+                    and (self.start_date or self.end_date):
+                from core.date_index import load_index
+                index = load_index(self._data_path, self.date_format)
+            if self.state_file:
+                self.process_incremental()
+            elif use_cache:
+                self.process_cached_columns()
+            elif index is not None:
+                self.process_indexed_ranges(index)
+            elif self.workers > 1 and not (compression or self.quarantine_file):
+                self.process_csv_parallel()
+            else:
+                self.process_serial(compression)
+        self.file_stats.append({
+            "file": self._data_path,
+            "rows": self.rows_read - rows_read,
+            "errors": self.rows_rejected - rows_rejected,
+        })
+
+    def process_serial(self, compression: Optional[str] = None) -> None:
+        """
+        Agrega o arquivo em _data_path em um único processo: com o motor 'mmap' (se o
+        arquivo não for comprimido), com o pipeline de leitura ou linha a linha.
+        """
+        if self.engine == 'mmap' and not compression:
+            self.process_mmap_ranges()
+        elif self.pipeline:
+            self.process_pipelined()
+        else:
+            with self.open_input(self._data_path) as csv_file:
+                self.process_lines(csv_file)
+
+    def sums_out_of_range(self, partials: Iterable[Tuple[Dict[str, Any], Dict[str, int]]]) -> bool:
+        """
+        Indica se a mesclagem de agregados parciais (receita e quantidade por produto)
+        aos atuais, na ordem dada, tem alguma soma fora do intervalo dos contadores.
+        """
+        counters = ProductCounters.from_dicts(
+            self.revenue_per_product, self.quantity_per_product, self.engine == 'cents')
+        try:
+            for revenue_dict, quantity_dict in partials:
+                for product, quantity in quantity_dict.items():
+                    counters.add(product, quantity, revenue_dict.get(product, 0))
+        except OverflowError:
+            return True
+        return False
+
+    def process_pipelined(self) -> None:
+        """
+        Agrega o arquivo em _data_path com a leitura (e descompressão), a decodificação e
+        a agregação sobrepostas em threads ligadas por filas limitadas.
+        """
+        from core.pipeline import pipelined_lines
+        with pipelined_lines(self.metrics.reader(open(self._data_path, 'rb'))) as lines:
+            self.process_lines(lines)
+
+    def open_input(self, file_path: str) -> TextIO:
+        """
+        Abre um arquivo de entrada (ou a entrada padrão, com '-') como texto,
+        descomprimindo-o se necessário e contando os bytes lidos nas métricas.
+        """
+        raw = sys.stdin.buffer if file_path == STDIN_PATH else open(file_path, 'rb')
+        return open_sales_stream(self.metrics.reader(raw))
+
+    def iter_batches(self, batch_size: Optional[int] = None) -> Iterator['SalesBatch']:
+        """
+        Lê cada arquivo de entrada uma única vez e retorna as vendas dentro do filtro de
+        datas em lotes de colunas tipadas (até batch_size vendas; padrão BATCH_ROWS), com a
+        mesma validação de process_csv_rows. Todos os lotes compartilham o mesmo
+        dicionário de produtos e as mesmas somas por produto, verificadas como em
+        process_dict_rows. As contagens de linhas e de cada arquivo são atualizadas
+        à medida que os lotes são lidos.
+        """
+        from core.batches import BATCH_ROWS, iter_line_batches
+        if self._data_paths.count(STDIN_PATH) > 1:
+            raise UnsupportedOptions("Standard input ('-') can only be read once.")
+        filter_start_date, filter_end_date = datetime_treat(self.start_date, self.end_date)
+        in_window = make_date_filter(filter_start_date, filter_end_date, self.date_format)
+        products: List[str] = []
+        product_ids: Dict[str, int] = {}
+        totals = ProductCounters(self.engine == 'cents')
+        try:
+            for file_path in self._data_paths:
+                file_stats = {"file": file_path, "rows": 0, "errors": 0}
+                self.file_stats.append(file_stats)
+                csv_file = self.open_input(file_path)
+                try:
+                    for batch in iter_line_batches(
+                            self.metrics.timed_iter('read', csv_file), products, product_ids, in_window,
+                            self.date_format, self.engine == 'cents', self.rejects,
+                            batch_size or BATCH_ROWS, file_path, totals):
+                        self.rows_read += batch.rows_read
+                        self.rows_accepted += len(batch)
+                        self.rows_rejected += batch.rows_rejected
+                        file_stats["rows"] += batch.rows_read
+                        file_stats["errors"] += batch.rows_rejected
+                        yield batch
+                finally:
+                    if file_path != STDIN_PATH:
+                        csv_file.close()
+        finally:
+            self.rejects.close()
+        self.rejects.log_summary()
+
+    def make_aggregator(self) -> 'CompositeAggregator':
+        """
+        Retorna o agregador dos lotes de iter_batches() com os campos de
+        aggregate_results() (e as séries por período, com set_rollup()).
+        """
+        from core.aggregators import (
+            CompositeAggregator,
+            PeriodAggregator,
+            ProductAggregator,
+            RowsAggregator,
+            TotalsAggregator
+        )
+        cents = self.engine == 'cents'
+        aggregators = [TotalsAggregator(cents), ProductAggregator(self.top, cents), RowsAggregator()]
+        if self.rollup:
+            aggregators.append(PeriodAggregator(top=self.top))
+        return CompositeAggregator(
+            aggregators, {"filter_dates": {"start": self.start_date, "end": self.end_date}})
+
+    def consume_files(self, consumer: Any) -> None:
+        """
+        Lê cada arquivo de entrada uma única vez, entregando suas linhas ao consumidor
+        (um objeto com consume(lines), rows_read e rows_rejected), e registra as
+        contagens de linhas e erros de cada arquivo.
+        """
+        if self._data_paths.count(STDIN_PATH) > 1:
+            raise UnsupportedOptions("Standard input ('-') can only be read once.")
+        for file_path in self._data_paths:
+            rows_read, rows_rejected = consumer.rows_read, consumer.rows_rejected
+            with self.metrics.stage('aggregate'):
+                if file_path == STDIN_PATH:
+                    consumer.consume(self.metrics.timed_iter('read', self.open_input(STDIN_PATH)))
+                else:
+                    with self.open_input(file_path) as csv_file:
+                        consumer.consume(self.metrics.timed_iter('read', csv_file))
+            self.file_stats.append({
+                "file": file_path,
+                "rows": consumer.rows_read - rows_read,
+                "errors": consumer.rows_rejected - rows_rejected,
+            })
+        self.rows_read += consumer.rows_read
+        self.rows_accepted += getattr(consumer, 'rows_accepted', 0)
+        self.rows_rejected += consumer.rows_rejected
+
+    def process_window_files(self) -> None:
+        """
+        Lê cada arquivo uma única vez e agrega suas linhas em todas as janelas de datas
+        definidas em set_windows(), cada uma em um processador próprio.
+        """
+        self._window_processors = [
+            CSVProcessor(self._data_path, start, end) for _, start, end in self.windows
+        ]
+        from core.windows import WindowAggregator
+        self.consume_files(WindowAggregator(self._window_processors, self.date_format, self.rejects))
+
+    def process_rollup_files(self) -> None:
+        """
+        Lê cada arquivo uma única vez para montar os agregados diários por produto e
+        responde o filtro de datas (e cada janela, se houver) com as somas de prefixo.
+        """
+        from core.rollup import SalesRollup
+        self._rollup = SalesRollup(self.date_format, self.rejects)
+        self.consume_files(self._rollup)
+        self._rollup.build()
+        self.apply_rollup_range(self)
+        self._window_processors = []
+        for _, start, end in self.windows:
+            processor = CSVProcessor(self._data_path, start, end)
+            self.apply_rollup_range(processor)
+            self._window_processors.append(processor)
+
+    def process_heavy_hitter_files(self) -> None:
+        """
+        Lê cada arquivo uma única vez mantendo receita e quantidade por produto em
+        contadores Space-Saving de memória fixa; a receita total continua exata.
+        """
+        if self.windows or self.rollup:
+            raise UnsupportedOptions("--heavy-hitters cannot be combined with --window or --rollup.")
+        filter_start_date, filter_end_date = datetime_treat(self.start_date, self.end_date)
+        from core.heavy_hitters import HeavyHitterAggregator
+        self._heavy_hitters = HeavyHitterAggregator(
+            self.heavy_hitters, filter_start_date, filter_end_date, self.date_format, self.rejects)
+        self.consume_files(self._heavy_hitters)
+        self.revenue_per_product = {
+            product: count for product, (count, _) in self._heavy_hitters.revenue.counters.items()}
+        self.quantity_per_product = {
+            product: count for product, (count, _) in self._heavy_hitters.quantity.counters.items()}
+        self.total_global_revenue = self._heavy_hitters.total_revenue
+
+    def process_group_by_files(self) -> None:
+        """
+        Lê cada arquivo uma única vez agregando receita, quantidade e vendas por grupo das
+        colunas de set_group_by(), com a memória limitada por set_memory_limit().
+
+        O limite só vale com set_top(): sem ele, todos os grupos do relatório ficam em
+        memória.
+        """
+        if self.windows or self.rollup or self.heavy_hitters:
+            raise UnsupportedOptions("--group-by cannot be combined with --window, --rollup or --heavy-hitters.")
+        if self.memory_limit is not None and self.top is None:
+            raise UnsupportedOptions("--memory-limit requires --top: without it, every group is kept in memory.")
+        filter_start_date, filter_end_date = datetime_treat(self.start_date, self.end_date)
+        from core.group_by import GroupByAggregator
+        self._group_by = GroupByAggregator(
+            self.group_by, self.memory_limit, filter_start_date, filter_end_date,
+            self.date_format, self.rejects, self.engine == 'cents')
+        try:
+            self.consume_files(self._group_by)
+        except BaseException:
+            self._group_by.close()
+            raise
+        self.total_global_revenue = self._group_by.total_revenue
+
+    def process_sampled_files(self) -> None:
+        """
+        Processa apenas os blocos sorteados por set_approx() e estima receita e
+        quantidade por produto e a receita total, expandindo os totais da amostra.
+
+        As contagens de linhas do relatório são as da amostra.
+        """
+        if self.windows or self.rollup or self.heavy_hitters or self.group_by:
+            raise UnsupportedOptions("--approx cannot be combined with --window, --rollup, --heavy-hitters or --group-by.")
+        if STDIN_PATH in self._data_paths or any(file_compression(path) for path in self._data_paths):
+            raise UnsupportedOptions("--approx requires uncompressed files, read at random offsets.")
+        import time
+        from core.sampling import BlockSample, plan_blocks
+        blocks, self._sample_bytes = plan_blocks(self._data_paths, self.approx.block_size)
+        sample = BlockSample(len(blocks))
+        file_rows = {file_path: [0, 0] for file_path in self._data_paths}
+        started = time.perf_counter()
+        with self.metrics.stage('aggregate'):
+            for file_path, header, start, end in self.approx.order(blocks):
+                if self.approx.exhausted(time.perf_counter() - started, sample.blocks_sampled):
+                    break
+                processor = CSVProcessor(file_path, self.start_date, self.end_date)
+                processor.set_date_format(self.date_format)
+                processor.set_engine(self.engine)
+                processor.rejects = self.rejects
+                if self.engine == 'mmap':
+                    processor.process_mmap_ranges([(start, end)])
+                else:
+                    processor.process_lines(chain(
+                        [header.decode('utf-8')], iter_range_lines(file_path, start, end)))
+                sample.add(
+                    processor.revenue_per_product,
+                    processor.quantity_per_product,
+                    processor.total_global_revenue,
+                    end - start
+                )
+                self.rows_read += processor.rows_read
+                self.rows_accepted += processor.rows_accepted
+                self.rows_rejected += processor.rows_rejected
+                file_rows[file_path][0] += processor.rows_read
+                file_rows[file_path][1] += processor.rows_rejected
+        self.metrics.count('bytes_read', sample.bytes_sampled)
+        logging.info("Sampled %d of %d block(s).", sample.blocks_sampled, sample.blocks_total)
+
+        # No motor 'cents', as estimativas são arredondadas para centavos inteiros.
+        to_unit = round if self.engine == 'cents' else float
+        self.revenue_per_product = {
+            product: to_unit(sample.estimate(sums)) for product, sums in sample.revenue.items()}
+        self.quantity_per_product = {
+            product: round(sample.estimate(sums)) for product, sums in sample.quantity.items()}
+        self.total_global_revenue = to_unit(sample.estimate(sample.total))
+        self.file_stats.extend(
+            {"file": file_path, "rows": rows, "errors": errors}
+            for file_path, (rows, errors) in file_rows.items())
+        self._sample = sample
+
+    def _rollup_bounds(self, processor: 'CSVProcessor') -> Tuple[Optional[int], Optional[int]]:
+        filter_start_date, filter_end_date = datetime_treat(processor.start_date, processor.end_date)
+        return (
+            filter_start_date.toordinal() if filter_start_date else None,
+            filter_end_date.toordinal() if filter_end_date else None
+        )
+
+    def apply_rollup_range(self, processor: 'CSVProcessor') -> None:
+        """
+        Preenche os agregados de um processador com o período das suas datas de filtro,
+        consultado nas somas de prefixo dos agregados diários.
+        """
+        bounds = self._rollup_bounds(processor)
+        revenue, quantity, total = self._rollup.query(*bounds)
+        processor.revenue_per_product = revenue
+        processor.quantity_per_product = quantity
+        processor.total_global_revenue = total
+        processor.rows_accepted = self._rollup.sales_count(*bounds)
+
+    def aggregate_rollup_series(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retorna as séries diária, semanal e mensal do período do filtro de datas (com os
+        top produtos de cada período quando --top é informado).
+        """
+        bounds = self._rollup_bounds(self)
+        from core.rollup import GRANULARITIES
+        return {
+            granularity: self._rollup.series(granularity, *bounds, top=self.top)
+            for granularity in GRANULARITIES
+        }
+
+    def process_many_files(self) -> None:
+        """
+        Processa vários arquivos em um pool limitado de threads, cada um em um
+        processador próprio com as mesmas configurações, e mescla os agregados na ordem
+        dos arquivos de entrada.
+
+        Se alguma soma sair do intervalo dos contadores, os arquivos são reprocessados em
+        série, para que as mesmas linhas do processamento serial sejam rejeitadas. Com a
+        entrada padrão ('-'), que não pode ser relida, os arquivos são sempre processados
+        em série.
+        """
+        if self.state_file:
+            raise UnsupportedOptions("--state-file supports a single input file.")
+        if self._data_paths.count(STDIN_PATH) > 1:
+            raise UnsupportedOptions("Standard input ('-') can only be read once.")
+
+        def process_file(file_path: str) -> 'CSVProcessor':
+            processor = CSVProcessor(file_path, self.start_date, self.end_date)
+            processor.set_date_format(self.date_format)
+            processor.set_engine(self.engine)
+            processor.set_workers(self.workers)
+            processor.set_pipeline(self.pipeline)
+            processor.set_cache_dir(self.cache_dir)
+            processor.rejects = self.rejects
+            processor.metrics = self.metrics
+            processor.process_single_file()
+            return processor
+
+        if STDIN_PATH in self._data_paths:
+            # A entrada padrão não pode ser relida, então não há como reprocessar os
+            # arquivos em série se as somas mescladas saírem do intervalo.
+            self.process_files_serially()
+            return
+        max_threads = min(MAX_FILE_THREADS, len(self._data_paths))
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_threads) as executor:
+            processors = list(executor.map(process_file, self._data_paths))
+        # Cada arquivo soma a partir de zero: se alguma soma saiu do intervalo (em um
+        # arquivo ou na mesclagem), as linhas rejeitadas podem diferir das do
+        # processamento serial, e os arquivos são reprocessados em série.
+        if self.rejects.counts.get('out_of_range') or self.sums_out_of_range(
+                (processor.revenue_per_product, processor.quantity_per_product) for processor in processors):
+            logging.info("Sums out of range in concurrent files; processing them serially.")
+            self.rejects.reset()
+            self.process_files_serially()
+            return
+        for processor in processors:
+            merge_aggregates(
+                processor.revenue_per_product,
+                processor.quantity_per_product,
+                self.revenue_per_product,
+                self.quantity_per_product
+            )
+            self.total_global_revenue += processor.total_global_revenue
+            self.rows_read += processor.rows_read
+            self.rows_accepted += processor.rows_accepted
+            self.rows_rejected += processor.rows_rejected
+            self.file_stats.extend(processor.file_stats)
+
+    def process_files_serially(self) -> None:
+        """
+        Processa os arquivos de entrada um após o outro, cada um continuando a partir dos
+        agregados dos anteriores, como um único arquivo.
+        """
+        first_path = self._data_path
+        try:
+            for file_path in self._data_paths:
+                self._data_path = file_path
+                self.process_single_file()
+        finally:
+            self._data_path = first_path
+
+    def process_mmap_ranges(self, ranges: Optional[List[Tuple[int, int]]] = None) -> None:
+        """
+        Agrega as vendas com o tokenizador de bytes sobre o arquivo mapeado em memória
+        (motor 'mmap'), opcionalmente restrito a intervalos de bytes alinhados a linhas.
+        """
+        from core.mmap_reader import aggregate_mmap
+        filter_start_date, filter_end_date = datetime_treat(
+            self.start_date, self.end_date)
+        in_window = make_date_filter(
+            filter_start_date, filter_end_date, self.date_format)
+        if ranges is None:
+            self.metrics.count('bytes_read', os.path.getsize(self._data_path))
+        with self.metrics.stage('aggregate'):
+            self.total_global_revenue, rows_read, rows_accepted, rows_rejected = aggregate_mmap(
+                self._data_path,
+                ranges,
+                in_window,
+                self.revenue_per_product,
+                self.quantity_per_product,
+                self.total_global_revenue,
+                rejects=self.rejects
+            )
+        self.rows_read += rows_read
+        self.rows_accepted += rows_accepted
+        self.rows_rejected += rows_rejected
+
+    def process_lines(self, lines: Iterable[str]) -> None:
+        """
+        Agrega as vendas de um iterável de linhas CSV, começando pelo cabeçalho,
+        usando o motor de processamento configurado. O motor 'mmap' depende de um arquivo
+        em disco; para linhas já lidas (entrada padrão, arquivos comprimidos, modo
+        incremental), o motor 'python' é usado.
+        """
+        filter_start_date, filter_end_date = datetime_treat(
+            self.start_date, self.end_date)
+        lines = self.metrics.timed_iter('read', lines)
+        if self.engine == 'numpy':
+            self.process_numpy_blocks(lines, filter_start_date, filter_end_date)
+        else:
+            self.process_dict_rows(
+                self.rejects.dict_reader(lines), filter_start_date, filter_end_date)
+
+    def process_incremental(self) -> None:
+        """
+        Processa apenas as linhas acrescentadas ao arquivo desde a última execução.
+
+        Os agregados, as contagens de linhas e a posição final da execução anterior são
+        lidos de state_file, de modo que o relatório cubra o arquivo inteiro; se o
+        arquivo foi truncado ou reescrito, ou se os filtros mudaram, o arquivo é
+        reprocessado por completo. Ao final, o novo estado é gravado.
+        """
+        from core.incremental import (
+            AppendedLines, file_checksums, load_state, resume_offset, save_state)
+        settings = {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "date_format": self.date_format,
+            "engine": self.engine,
+        }
+        state = load_state(self.state_file)
+        header, _ = split_byte_ranges(self._data_path, 1)
+        offset = resume_offset(state, self._data_path, settings)
+        if offset is None:
+            offset = len(header)
+            self.revenue_per_product = {}
+            self.quantity_per_product = {}
+            self.total_global_revenue = 0 if self.engine == 'cents' else 0.0
+        else:
+            self.revenue_per_product = dict(state["revenue_per_product"])
+            self.quantity_per_product = dict(state["quantity_per_product"])
+            self.total_global_revenue = state["total_global_revenue"]
+            rows = state["rows"]
+            self.rows_read += rows["read"]
+            self.rows_accepted += rows["accepted"]
+            self.rows_rejected += rows["rejected"]
+            self.rejects.merge(rows["rejected_by_category"])
+
+        appended = AppendedLines(self._data_path, offset)
+        self.process_lines(chain([header.decode('utf-8')], appended))
+        logging.info("Processed %d new byte(s).", appended.offset - offset)
+        self.metrics.count('bytes_read', appended.offset - offset)
+
+        save_state(self.state_file, {
+            "file": os.path.abspath(self._data_path),
+            "settings": settings,
+            "offset": appended.offset,
+            "checksums": file_checksums(self._data_path, appended.offset),
+            "total_global_revenue": self.total_global_revenue,
+            "revenue_per_product": self.revenue_per_product,
+            "quantity_per_product": self.quantity_per_product,
+            "rows": {
+                "read": self.rows_read,
+                "accepted": self.rows_accepted,
+                "rejected": self.rows_rejected,
+                "rejected_by_category": dict(self.rejects.counts),
+            },
+        })
+
+    def process_cached_columns(self) -> None:
+        """
+        Agrega as vendas a partir do cache colunar persistente em cache_dir.
+
+        Na primeira execução (ou quando o arquivo muda), o CSV é lido por completo e o
+        cache é gravado; nas seguintes, apenas o cache é lido e o filtro de datas é
+        aplicado sobre as colunas. Como na leitura linha a linha, apenas as linhas
+        rejeitadas dentro do filtro de datas são contadas.
+        """
+        from core.cache import load_columns
+        filter_start_date, filter_end_date = datetime_treat(
+            self.start_date, self.end_date)
+        start = filter_start_date.toordinal() if filter_start_date else None
+        end = filter_end_date.toordinal() if filter_end_date else None
+        with self.metrics.stage('read'):
+            columns = load_columns(
+                self._data_path, self.cache_dir, self.date_format, self.rejects, start, end)
+        self.rows_read += columns.rows_read
+        with self.metrics.stage('aggregate'):
+            self.total_global_revenue += columns.aggregate(
+                filter_start_date,
+                filter_end_date,
+                self.revenue_per_product,
+                self.quantity_per_product
+            )
+        self.rows_accepted += columns.rows_accepted
+        self.rows_rejected += columns.rows_rejected
+        if columns.rows_out_of_range:
+            self.rejects.merge({'out_of_range': columns.rows_out_of_range})
+
+    def process_indexed_ranges(self, index: Dict[str, Any]) -> None:
+        """
+        Agrega apenas os blocos do arquivo que o índice de datas aponta como
+        possivelmente dentro do filtro, usando busca binária em arquivos ordenados.
+        """
+        from core.date_index import select_ranges
+        filter_start_date, filter_end_date = datetime_treat(
+            self.start_date, self.end_date)
+        ranges = select_ranges(
+            index,
+            filter_start_date.toordinal() if filter_start_date else None,
+            filter_end_date.toordinal() if filter_end_date else None
+        )
+        logging.info("Using date index: reading %d byte range(s).", len(ranges))
+        self.metrics.count('bytes_read', sum(end - start for start, end in ranges))
+        if self.engine == 'mmap':
+            self.process_mmap_ranges(ranges)
+            return
+        header, _ = split_byte_ranges(self._data_path, 1)
+        lines = chain(
+            [header.decode('utf-8')],
+            *(iter_range_lines(self._data_path, start, end) for start, end in ranges)
+        )
+        self.process_lines(lines)
+
+    def process_csv_parallel(self) -> None:
+        """
+        Processa o arquivo CSV em paralelo, dividindo-o em intervalos de bytes
+        alinhados a quebras de linha, e mescla os agregados parciais de cada intervalo
+        na ordem do arquivo.
+
+        Se algum intervalo rejeitar uma soma fora do intervalo dos contadores, ou se a
+        soma mesclada de algum produto não couber neles, o arquivo é reprocessado em
+        série, com as mesmas linhas rejeitadas do caminho serial.
+
+        As receitas parciais são somadas com math.fsum, sem erro de arredondamento na
+        mesclagem. Como o caminho serial acumula venda a venda, as receitas não
+        arredondadas ainda podem diferir dele em poucos ulps (erro relativo da ordem de
+        n * 2**-53 para n vendas); no motor 'cents' as somas são inteiras e o resultado é
+        idêntico ao serial.
+        """
+        from core.parallel import process_in_parallel
+        self.metrics.count('bytes_read', os.path.getsize(self._data_path))
+        with self.metrics.stage('aggregate'):
+            partials = process_in_parallel(
+                self._data_path,
+                self.workers,
+                self.start_date,
+                self.end_date,
+                self.date_format,
+                self.engine,
+                self.max_errors
+            )
+            partials = list(partials)
+        if any(partial[-1].get('out_of_range') for partial in partials) or self.sums_out_of_range(
+                (partial[0], partial[1]) for partial in partials):
+            logging.info("Sums out of range in parallel ranges; processing '%s' serially.", self._data_path)
+            self.process_serial()
+            return
+        exact_sum = sum if self.engine == 'cents' else math.fsum
+        revenue_parts: Dict[str, List[float]] = {}
+        total_parts: List[float] = [self.total_global_revenue]
+        for revenue_dict, quantity_dict, total_revenue, rows_read, rows_accepted, rows_rejected, \
+                reject_counts in partials:
+            for product, revenue in revenue_dict.items():
+                revenue_parts.setdefault(product, []).append(revenue)
+            for product, quantity in quantity_dict.items():
+                self.quantity_per_product[product] = self.quantity_per_product.get(product, 0) + quantity
+            total_parts.append(total_revenue)
+            self.rows_read += rows_read
+            self.rows_accepted += rows_accepted
+            self.rows_rejected += rows_rejected
+            self.rejects.merge(reject_counts)
+        for product, parts in revenue_parts.items():
+            self.revenue_per_product[product] = exact_sum([self.revenue_per_product.get(product, 0), *parts])
+        self.total_global_revenue = exact_sum(total_parts)
+
+    def process_dict_rows(
+        self,
+        reader: Iterable[Dict[str, str]],
+        filter_start_date: Optional[datetime],
+        filter_end_date: Optional[datetime]
+    ) -> None:
+        """
+        Agrega, linha a linha, as vendas de um iterável de dicionários (motores 'python'
+        e 'cents').
+
+        O filtro de datas é verificado antes de qualquer conversão numérica, e linhas
+        com erro de formatação são ignoradas e registradas em rejects. No motor 'cents', o
+        preço é convertido diretamente em centavos e os valores são somados como inteiros.
+        """
+        metrics = self.metrics
+        in_window = make_date_filter(
+            filter_start_date, filter_end_date, self.date_format)
+        if in_window is not None:
+            in_window = metrics.timed('date_parse', in_window)
+        in_cents = self.engine == 'cents'
+        convert = metrics.timed('convert', convert_sale_cents if in_cents else convert_sale_values)
+        reader = metrics.timed_iter('tokenize', reader)
+        counters = ProductCounters.from_dicts(
+            self.revenue_per_product, self.quantity_per_product, in_cents)
+        add = counters.add
+        metrics.start('aggregate')
+        try:
+            for row in reader:
+                self.rows_read += 1
+                try:
+                    sale_date_str = row.get('data_venda', '').strip()
+                    if not sale_date_str:
+                        continue
+                    if in_window is not None and not in_window(sale_date_str):
+                        continue
+
+                    quantity_str = row.get('quantidade', '').strip()
+                    price_str = row.get('preco_unitario', '').strip()
+                    if not quantity_str or not price_str:
+                        continue
+                    product = row.get('produto', 'Unknown').strip()
+
+                    if in_cents:
+                        quantity, row_sale_value = convert(quantity_str, price_str)
+                    else:
+                        quantity, unit_price = convert(quantity_str, price_str)
+                        row_sale_value = calculate_sales(quantity, unit_price)
+
+                    # Somas fora do intervalo dos contadores lançam OverflowError sem
+                    # alterá-los, e a linha é rejeitada.
+                    add(product, quantity, row_sale_value)
+                    self.total_global_revenue += row_sale_value
+                    self.rows_accepted += 1
+                except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                    self.rows_rejected += 1
+                    self.rejects.reject(_err, row)
+                    continue
+        finally:
+            metrics.stop()
+            self.revenue_per_product, self.quantity_per_product = counters.to_dicts()
+
+    def process_numpy_blocks(
+        self,
+        lines: Iterable[str],
+        filter_start_date: Optional[datetime],
+        filter_end_date: Optional[datetime]
+    ) -> None:
+        """
+        Agrega as vendas com o motor colunar NumPy (motor 'numpy').
+
+        O motor continua a partir dos agregados atuais e os escreve de volta nos
+        atributos de receita e quantidade, produzindo o mesmo resultado do motor 'python'.
+        """
+        try:
+            from core.numpy_engine import NumpyEngine
+        except ImportError:
+            logging.error(
+                "Error: The 'numpy' engine requires the numpy package (pip install numpy).")
+            sys.exit(1)
+
+        engine = NumpyEngine(date_format=self.date_format, rejects=self.rejects)
+        engine.load_state(
+            self.revenue_per_product, self.quantity_per_product, self.total_global_revenue)
+        with self.metrics.stage('aggregate'):
+            engine.consume(lines, filter_start_date, filter_end_date)
+        self.total_global_revenue = engine.store_state(
+            self.revenue_per_product, self.quantity_per_product)
+        self.rows_read += engine.rows_read
+        self.rows_accepted += engine.rows_accepted
+        self.rows_rejected += engine.rows_rejected
+
+    def aggregate_window_results(self) -> Dict[str, Any]:
+        """
+        Retorna um relatório no formato de aggregate_results() para cada janela de datas,
+        acrescido do nome da janela, reunidos em um único documento.
+        """
+        reports = []
+        for (name, _, _), processor in zip(self.windows, self._window_processors):
+            processor.file_stats = self.file_stats
+            processor.top = self.top
+            processor.rows_read = self.rows_read
+            processor.rows_rejected = self.rows_rejected
+            processor.rejects = self.rejects
+            reports.append({"window": name, **processor.aggregate_results()})
+        return {
+            "report_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "windows": reports
+        }
 
     def aggregate_results(self) -> Dict[str, Any]:
         """
@@ -150,7 +1100,24 @@ class CSVProcessor(Reader):
         - total_global_revenue: Valor total de todas as vendas.
         - best_selling_product: Dicionário com o produto mais vendido e a quantidade total de unidades vendidas.
         - revenue_per_product: Lista de dicionários com produtos e respectivas receitas.
+        - files: Lista com a quantidade de linhas lidas e de linhas com erro de cada arquivo.
+        - rows: Linhas lidas, filtradas (fora do filtro de datas ou com campos vazios) e
+          rejeitadas por erro de formatação, com as rejeitadas por categoria de erro.
+        - approximation: Limites de erro do modo aproximado (apenas com set_heavy_hitters()) ou
+          intervalos de confiança das estimativas por amostragem (apenas com set_approx()).
+        - group_by e groups: As colunas de agrupamento e, para cada grupo, os valores da
+          chave, a receita, a quantidade e o número de vendas, por receita decrescente
+          (apenas com set_group_by(), que substitui best_selling_product e
+          revenue_per_product).
+        - currency_unit: 'cents' quando os valores estão em centavos inteiros (motor 'cents');
+          a conversão para reais é feita pelo relatório.
+
+        Com set_top(), revenue_per_product (ou groups) contém apenas os top produtos (ou
+        grupos) por receita.
         """
+        if self._group_by is not None:
+            return self.aggregate_group_results()
+
         best_selling_product = "None"
         best_selling_quantity = 0
         if self.quantity_per_product:
@@ -158,14 +1125,85 @@ class CSVProcessor(Reader):
                 self.quantity_per_product, key=lambda k: self.quantity_per_product[k])
             best_selling_quantity = self.quantity_per_product[best_selling_product]
 
-        sorted_revenue = sorted(
-            self.revenue_per_product.items(), key=lambda item: item[1], reverse=True)
+        if self.top is None:
+            sorted_revenue = sorted(
+                self.revenue_per_product.items(), key=lambda item: item[1], reverse=True)
+        else:
+            import heapq
+            sorted_revenue = heapq.nlargest(
+                self.top, self.revenue_per_product.items(), key=lambda item: item[1])
         product_list = parser_to_dict_list(sorted_revenue)
 
-        return {
+        results = {
             "report_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "filter_dates": {"start": self.start_date, "end": self.end_date},
             "total_global_revenue": round(self.total_global_revenue, 2),
             "best_selling_product": {"product": best_selling_product, "quantity": best_selling_quantity},
-            "revenue_per_product": product_list
+            "revenue_per_product": product_list,
+            "files": self.file_stats,
+            "rows": {
+                "read": self.rows_read,
+                "filtered": self.rows_read - self.rows_rejected - self.rows_accepted,
+                "rejected": self.rows_rejected,
+                "rejected_by_category": dict(self.rejects.counts)
+            }
+        }
+        if self._heavy_hitters is not None:
+            results["approximation"] = self.aggregate_approximation(len(product_list))
+        if self._sample is not None:
+            results["approximation"] = self._sample.summary(
+                [item["product"] for item in product_list],
+                best_selling_product if self.quantity_per_product else None,
+                self._sample_bytes
+            )
+        if self.engine == 'cents' and isinstance(self.total_global_revenue, int):
+            results["currency_unit"] = "cents"
+        return results
+
+    def aggregate_group_results(self) -> Dict[str, Any]:
+        """
+        Retorna os resultados do agrupamento por set_group_by(), no formato de
+        aggregate_results().
+        """
+        groups = [
+            {
+                "key": dict(zip(self.group_by, key)),
+                "revenue": round(revenue, 2),
+                "quantity": quantity,
+                "sales": sales
+            }
+            for key, revenue, quantity, sales in self._group_by.groups(self.top)
+        ]
+        results = {
+            "report_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "filter_dates": {"start": self.start_date, "end": self.end_date},
+            "total_global_revenue": round(self.total_global_revenue, 2),
+            "group_by": list(self.group_by),
+            "groups": groups,
+            "files": self.file_stats,
+            "rows": {
+                "read": self.rows_read,
+                "filtered": self.rows_read - self.rows_rejected - self.rows_accepted,
+                "rejected": self.rows_rejected,
+                "rejected_by_category": dict(self.rejects.counts)
+            }
+        }
+        if self.engine == 'cents' and isinstance(self.total_global_revenue, int):
+            results["currency_unit"] = "cents"
+        return results
+
+    def aggregate_approximation(self, top: int) -> Dict[str, Any]:
+        """
+        Retorna os limites de erro do modo aproximado: o erro máximo de qualquer receita
+        ou quantidade (total / contadores) e se o produto mais vendido e os top produtos
+        por receita são garantidamente os corretos.
+        """
+        revenue, quantity = self._heavy_hitters.revenue, self._heavy_hitters.quantity
+        return {
+            "method": "space-saving",
+            "counters": revenue.capacity,
+            "max_revenue_error": round(revenue.error_bound(), 2),
+            "max_quantity_error": round(quantity.error_bound(), 2),
+            "best_selling_guaranteed": quantity.guaranteed(1),
+            "top_revenue_guaranteed": revenue.guaranteed(top) if top else True
         }
@@ -0,0 +1,237 @@
+import csv
+import heapq
+import json
+import logging
+import os
+import tempfile
+from bisect import bisect_left
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.cache import file_fingerprint
+from utils.helpers import parse_date_cached
+
+INDEX_SUFFIX = ".vidx"
+DEFAULT_INDEX_BLOCK_BYTES = 1 << 16
+DEFAULT_SORT_RUN_ROWS = 500000
+
+# Cada bloco é [início, fim, menor ordinal, maior ordinal, possui datas inválidas].
+Block = List[Any]
+
+
+def index_path(file_path: str) -> str:
+    """Retorna o caminho do índice de datas associado a um CSV."""
+    return f"{file_path}{INDEX_SUFFIX}"
+
+
+def _date_column(header: List[str]) -> int:
+    if 'data_venda' not in header:
+        raise ValueError("Missing column 'data_venda' in CSV header.")
+    return header.index('data_venda')
+
+
+def _line_ordinal(line: str, date_idx: int, date_format: str) -> Optional[int]:
+    """
+    Extrai a data de uma linha CSV como ordinal.
+
+    Returns:
+        Optional[int]: O ordinal da data, 0 se a data não puder ser convertida, ou None
+        se a linha não tiver data (linhas que process_csv_rows sempre ignora).
+    """
+    fields = next(csv.reader([line])) if '"' in line else line.split(',')
+    if len(fields) <= date_idx:
+        return None
+    date_str = fields[date_idx].strip()
+    if not date_str:
+        return None
+    sale_date = parse_date_cached(date_str, date_format)
+    return sale_date.toordinal() if sale_date else 0
+
+
+def build_index(
+    file_path: str,
+    date_format: str = "%Y-%m-%d",
+    block_bytes: int = DEFAULT_INDEX_BLOCK_BYTES
+) -> Dict[str, Any]:
+    """
+    Constrói e grava um índice esparso de data para posição em bytes de um CSV.
+
+    O arquivo é dividido em blocos de aproximadamente block_bytes, alinhados a quebras
+    de linha, e para cada bloco são guardados o menor e o maior ordinal de data. O
+    índice indica também se o arquivo está ordenado por data, o que permite busca
+    binária nas consultas. Campos entre aspas com quebras de linha não são suportados.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        date_format (str): O formato das datas de venda.
+        block_bytes (int): O tamanho aproximado de cada bloco, em bytes.
+
+    Returns:
+        Dict[str, Any]: O índice gravado.
+    """
+    blocks: List[Block] = []
+    ordered = True
+    last_ordinal = 0
+    with open(file_path, 'rb') as handle:
+        header = next(csv.reader([handle.readline().decode('utf-8')]), [])
+        date_idx = _date_column(header)
+        position = handle.tell()
+        block: Block = [position, position, None, None, False]
+        for raw_line in handle:
+            if position - block[0] >= block_bytes:
+                blocks.append(block)
+                block = [position, position, None, None, False]
+            position += len(raw_line)
+            block[1] = position
+            ordinal = _line_ordinal(raw_line.decode('utf-8'), date_idx, date_format)
+            if ordinal is None:
+                continue
+            if ordinal == 0:
+                block[4] = True
+                continue
+            if ordinal < last_ordinal:
+                ordered = False
+            last_ordinal = ordinal
+            block[2] = ordinal if block[2] is None else min(block[2], ordinal)
+            block[3] = ordinal if block[3] is None else max(block[3], ordinal)
+        if block[1] > block[0]:
+            blocks.append(block)
+
+    index = {
+        "fingerprint": file_fingerprint(file_path),
+        "date_format": date_format,
+        "ordered": ordered,
+        "blocks": blocks,
+    }
+    with open(index_path(file_path), 'w', encoding='utf-8') as index_file:
+        json.dump(index, index_file)
+    return index
+
+
+def load_index(file_path: str, date_format: str = "%Y-%m-%d") -> Optional[Dict[str, Any]]:
+    """
+    Carrega o índice de datas de um CSV, se ele existir e estiver atualizado.
+
+    Returns:
+        Optional[Dict[str, Any]]: O índice, ou None se estiver ausente ou desatualizado.
+    """
+    path = index_path(file_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError) as _err:
+        logging.warning("Ignoring invalid index file '%s': %s", path, _err)
+        return None
+    if index.get("date_format") != date_format or index.get("fingerprint") != file_fingerprint(file_path):
+        logging.warning("Index file '%s' is out of date; rebuild it with 'vendas-cli index'.", path)
+        return None
+    return index
+
+
+def select_ranges(
+    index: Dict[str, Any],
+    start_ordinal: Optional[int],
+    end_ordinal: Optional[int]
+) -> List[Tuple[int, int]]:
+    """
+    Seleciona os intervalos de bytes que podem conter vendas no período [início, fim).
+
+    Em arquivos ordenados, o primeiro bloco é encontrado por busca binária e a leitura
+    para no primeiro bloco posterior ao período; caso contrário, os blocos são filtrados
+    pelos seus ordinais mínimo e máximo. Blocos com datas inválidas são sempre lidos,
+    pois essas linhas nunca são filtradas. Blocos adjacentes são unidos.
+
+    Returns:
+        List[Tuple[int, int]]: Os intervalos de bytes, em ordem.
+    """
+    blocks: List[Block] = index["blocks"]
+    low = start_ordinal if start_ordinal is not None else float('-inf')
+    high = end_ordinal if end_ordinal is not None else float('inf')
+
+    def overlaps(block: Block) -> bool:
+        return block[2] is not None and block[3] >= low and block[2] < high
+
+    selected: List[Block] = []
+    if index.get("ordered"):
+        maxima = []
+        running_max = float('-inf')
+        for block in blocks:
+            if block[3] is not None:
+                running_max = block[3]
+            maxima.append(running_max)
+        first = bisect_left(maxima, low)
+        last = first
+        while last < len(blocks) and (blocks[last][2] is None or blocks[last][2] < high):
+            last += 1
+        selected = [
+            block for pos, block in enumerate(blocks)
+            if block[4] or (first <= pos < last and overlaps(block))
+        ]
+    else:
+        selected = [block for block in blocks if block[4] or overlaps(block)]
+
+    ranges: List[Tuple[int, int]] = []
+    for block in selected:
+        if ranges and ranges[-1][1] == block[0]:
+            ranges[-1] = (ranges[-1][0], block[1])
+        else:
+            ranges.append((block[0], block[1]))
+    return ranges
+
+
+def sort_csv_by_date(
+    file_path: str,
+    output_path: str,
+    date_format: str = "%Y-%m-%d",
+    run_rows: int = DEFAULT_SORT_RUN_ROWS
+) -> None:
+    """
+    Reescreve um CSV ordenado por data de venda usando ordenação externa.
+
+    O arquivo é lido em lotes de run_rows linhas; cada lote é ordenado em memória e
+    gravado em um arquivo temporário, e os lotes são então intercalados com heapq.merge.
+    A ordenação é estável. Linhas sem data ou com data inválida vêm primeiro.
+
+    Args:
+        file_path (str): O caminho do CSV de origem.
+        output_path (str): O caminho do CSV ordenado.
+        date_format (str): O formato das datas de venda.
+        run_rows (int): A quantidade de linhas ordenadas em memória por vez.
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8') as source, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("The CSV file is empty.")
+        date_idx = _date_column(header)
+
+        def sort_key(row: List[str]) -> int:
+            if len(row) <= date_idx:
+                return 0
+            sale_date = parse_date_cached(row[date_idx].strip(), date_format)
+            return sale_date.toordinal() if sale_date else 0
+
+        run_paths = []
+        while True:
+            run = [row for row in islice(reader, run_rows) if row]
+            if not run:
+                break
+            run.sort(key=sort_key)
+            run_path = os.path.join(tmp_dir, f"run{len(run_paths)}.csv")
+            with open(run_path, 'w', newline='', encoding='utf-8') as run_file:
+                csv.writer(run_file).writerows(run)
+            run_paths.append(run_path)
+
+        run_files = [open(path, 'r', newline='', encoding='utf-8') for path in run_paths]
+        try:
+            with open(output_path, 'w', newline='', encoding='utf-8') as output:
+                writer = csv.writer(output, lineterminator='\n')
+                writer.writerow(header)
+                runs: List[Iterator[List[str]]] = [csv.reader(run_file) for run_file in run_files]
+                writer.writerows(heapq.merge(*runs, key=sort_key))
+        finally:
+            for run_file in run_files:
+                run_file.close()
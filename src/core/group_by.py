@@ -0,0 +1,265 @@
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.counters import INT64_MAX, INT64_MIN
+from core.rejects import RejectedRows
+from interfaces.reader_interface import UnsupportedOptions
+from utils.helpers import (
+    calculate_sales,
+    convert_sale_cents,
+    convert_sale_values,
+    make_date_filter,
+    parse_date_cached
+)
+
+# Dimensões derivadas da data de venda, no formato 'coluna:parte' (ex.: 'data_venda:mes').
+DATE_PARTS = {
+    'dia': "%Y-%m-%d",
+    'semana': "%G-W%V",
+    'mes': "%Y-%m",
+    'ano': "%Y",
+}
+SPILL_PARTITIONS = 16
+# Cada nível de partições usa 4 bits do hash da chave (16 partições); após 16 níveis, os
+# 64 bits se esgotam e chaves com o mesmo hash ficam juntas, então a tabela não grava mais.
+SPILL_BITS = 4
+MAX_SPILL_LEVEL = 64 // SPILL_BITS
+# Estimativa do custo em memória de um grupo além dos textos da chave: entrada do
+# dicionário, tupla da chave, lista dos agregados e os números.
+GROUP_OVERHEAD_BYTES = 300
+STRING_OVERHEAD_BYTES = 50
+
+GroupKey = Tuple[str, ...]
+GroupRecord = Tuple[GroupKey, float, int, int]
+
+
+def group_size(key: GroupKey) -> int:
+    """Estima os bytes ocupados por um grupo na tabela em memória."""
+    return GROUP_OVERHEAD_BYTES + sum(STRING_OVERHEAD_BYTES + len(value) for value in key)
+
+
+class GroupTable:
+    """
+    Tabela hash de agregados parciais (receita, quantidade, vendas) por chave de grupo,
+    com memória limitada.
+
+    Quando a estimativa de memória atinge memory_limit, todos os grupos são gravados em
+    SPILL_PARTITIONS arquivos temporários, particionados por 4 bits do hash da chave, e a
+    tabela é esvaziada. Ao final, cada partição é agregada separadamente (em uma tabela do
+    nível seguinte, que também pode gravar subpartições, pelos 4 bits seguintes), de modo
+    que as somas de uma mesma chave são sempre mescladas e a memória permanece limitada.
+    """
+
+    def __init__(self, memory_limit: Optional[int], spill_dir: str, level: int = 0):
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.level = level
+        self.groups: Dict[GroupKey, List] = {}
+        self.memory = 0
+        self.spills = 0
+        self._partitions: List[BinaryIO] = []
+
+    def add(self, key: GroupKey, revenue, quantity: int, sales: int = 1) -> None:
+        """Soma uma venda (ou um agregado parcial) ao grupo da chave."""
+        group = self.groups.get(key)
+        if group is not None:
+            group[0] += revenue
+            group[1] += quantity
+            group[2] += sales
+            return
+        if (self.memory_limit is not None and self.memory >= self.memory_limit
+                and self.level < MAX_SPILL_LEVEL):
+            self.spill()
+        self.groups[key] = [revenue, quantity, sales]
+        self.memory += group_size(key)
+
+    def _partition_paths(self) -> List[str]:
+        return [
+            os.path.join(self.spill_dir, f"nivel{self.level}-{id(self)}-{number}.pickle")
+            for number in range(SPILL_PARTITIONS)
+        ]
+
+    def spill(self) -> None:
+        """Grava os grupos em memória nas partições temporárias e esvazia a tabela."""
+        if not self._partitions:
+            self._partitions = [open(path, 'wb') for path in self._partition_paths()]
+        batches: List[List[GroupRecord]] = [[] for _ in range(SPILL_PARTITIONS)]
+        shift = self.level * SPILL_BITS
+        for key, (revenue, quantity, sales) in self.groups.items():
+            batches[(hash(key) >> shift) % SPILL_PARTITIONS].append((key, revenue, quantity, sales))
+        for handle, batch in zip(self._partitions, batches):
+            if batch:
+                pickle.dump(batch, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self.groups = {}
+        self.memory = 0
+        self.spills += 1
+
+    def items(self) -> Iterator[GroupRecord]:
+        """
+        Retorna os agregados finais de todos os grupos (em ordem arbitrária), mesclando as
+        partições gravadas em disco, que são apagadas após a leitura.
+        """
+        if not self.spills:
+            for key, (revenue, quantity, sales) in self.groups.items():
+                yield key, revenue, quantity, sales
+            return
+
+        self.spill()
+        for handle in self._partitions:
+            handle.close()
+        for path in self._partition_paths():
+            partition = GroupTable(self.memory_limit, self.spill_dir, self.level + 1)
+            with open(path, 'rb') as handle:
+                while True:
+                    try:
+                        batch = pickle.load(handle)
+                    except EOFError:
+                        break
+                    for key, revenue, quantity, sales in batch:
+                        partition.add(key, revenue, quantity, sales)
+            os.remove(path)
+            yield from partition.items()
+            self.spills += partition.spills
+
+    def close(self) -> None:
+        """Fecha e apaga as partições que ainda estiverem abertas."""
+        for handle in self._partitions:
+            handle.close()
+        self._partitions = []
+
+
+class GroupByAggregator:
+    """
+    Agrega as vendas por um conjunto qualquer de colunas do CSV (e partes da data de
+    venda, como 'data_venda:mes'), com memória limitada por memory_limit bytes: ao
+    atingir o limite, os agregados parciais são gravados em arquivos temporários e
+    mesclados ao final, com resultados exatos. A receita total é mantida à parte.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        memory_limit: Optional[int] = None,
+        filter_start_date: Optional[datetime] = None,
+        filter_end_date: Optional[datetime] = None,
+        date_format: str = "%Y-%m-%d",
+        rejects: Optional[RejectedRows] = None,
+        in_cents: bool = False
+    ):
+        self.columns = columns
+        self.spill_dir = tempfile.mkdtemp(prefix="vendas-group-by-")
+        self.table = GroupTable(memory_limit, self.spill_dir)
+        self.total_revenue = 0 if in_cents else 0.0
+        self.in_window = make_date_filter(filter_start_date, filter_end_date, date_format)
+        self.date_format = date_format
+        self.in_cents = in_cents
+        self.rejects = rejects or RejectedRows()
+        self.rows_read = 0
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+
+    def key_getters(self, fieldnames: Optional[List[str]]) -> List[Callable[[Dict[str, str], str], str]]:
+        """
+        Retorna, para cada dimensão, a função que extrai o valor da linha (e da data de
+        venda já sem espaços).
+
+        Raises:
+            UnsupportedOptions: Se uma dimensão não for uma coluna do CSV.
+        """
+        date_format = self.date_format
+        getters = []
+        for column in self.columns:
+            name, _, part = column.partition(':')
+            if name not in (fieldnames or []) or (part and part not in DATE_PARTS):
+                raise UnsupportedOptions(
+                    f"Unknown --group-by column '{column}'. Use CSV columns "
+                    f"or data_venda:{'|'.join(DATE_PARTS)}.")
+            if not part:
+                getters.append(lambda row, _date, name=name: row[name].strip())
+            elif name == 'data_venda':
+                getters.append(lambda row, sale_date_str, pattern=DATE_PARTS[part]:
+                               _date_part(sale_date_str, date_format, pattern))
+            else:
+                getters.append(lambda row, _date, name=name, pattern=DATE_PARTS[part]:
+                               _date_part(row[name].strip(), date_format, pattern))
+        return getters
+
+    def consume(self, lines: Iterable[str]) -> None:
+        """
+        Agrega as linhas de um CSV (começando pelo cabeçalho), com a mesma validação e o
+        mesmo filtro de datas de process_csv_rows. No motor 'cents', as receitas são
+        somadas em centavos inteiros. Como nos demais motores, a linha é rejeitada se a
+        quantidade (ou a receita, em centavos) do grupo em memória sair do intervalo de
+        int64.
+        """
+        reader = self.rejects.dict_reader(lines)
+        getters = self.key_getters(reader.fieldnames)
+        in_window, in_cents, table = self.in_window, self.in_cents, self.table
+        for row in reader:
+            self.rows_read += 1
+            try:
+                sale_date_str = row.get('data_venda', '').strip()
+                if not sale_date_str:
+                    continue
+                if in_window is not None and not in_window(sale_date_str):
+                    continue
+
+                quantity_str = row.get('quantidade', '').strip()
+                price_str = row.get('preco_unitario', '').strip()
+                if not quantity_str or not price_str:
+                    continue
+                if in_cents:
+                    quantity, sale_value = convert_sale_cents(quantity_str, price_str)
+                else:
+                    quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                    sale_value = calculate_sales(quantity, unit_price)
+                key = tuple(getter(row, sale_date_str) for getter in getters)
+                group = table.groups.get(key)
+                new_quantity = quantity if group is None else group[1] + quantity
+                new_revenue = sale_value if group is None else group[0] + sale_value
+                if not INT64_MIN <= new_quantity <= INT64_MAX or (
+                        in_cents and not INT64_MIN <= new_revenue <= INT64_MAX):
+                    raise OverflowError("quantity or revenue out of range")
+            except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                self.rows_rejected += 1
+                self.rejects.reject(_err, row)
+                continue
+            table.add(key, sale_value, quantity)
+            self.total_revenue += sale_value
+            self.rows_accepted += 1
+
+    def groups(self, top: Optional[int] = None) -> List[GroupRecord]:
+        """
+        Retorna os grupos em ordem decrescente de receita (e da chave, nos empates), ou
+        apenas os top grupos, selecionados por heap sem ordenar todos. Sem top, todos os
+        grupos são carregados em memória para a ordenação, além do limite da tabela.
+        """
+        try:
+            records = self.table.items()
+            order = lambda record: (-record[1], record[0])  # noqa: E731
+            if top is None:
+                result = sorted(records, key=order)
+            else:
+                import heapq
+                result = heapq.nsmallest(top, records, key=order)
+            if self.table.spills:
+                logging.info("Group-by spilled to disk %d time(s).", self.table.spills)
+            return result
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Apaga os arquivos temporários."""
+        self.table.close()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+def _date_part(date_str: str, date_format: str, pattern: str) -> str:
+    # Datas que não podem ser convertidas formam o próprio grupo, com o texto original.
+    sale_date = parse_date_cached(date_str, date_format)
+    return sale_date.strftime(pattern) if sale_date else date_str
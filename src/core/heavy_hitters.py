@@ -0,0 +1,153 @@
+import heapq
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.counters import check_range
+from core.rejects import RejectedRows
+from utils.helpers import calculate_sales, convert_sale_values, make_date_filter
+
+DEFAULT_CAPACITY = 10000
+
+
+class SpaceSaving:
+    """
+    Contadores Space-Saving ponderados para itens frequentes com memória fixa.
+
+    No máximo capacity itens são monitorados. Um item novo com os contadores cheios
+    substitui o de menor contagem c e herda c como erro, de modo que, para todo item
+    monitorado, a contagem real está entre count - error e count, e qualquer item cuja
+    contagem real supere total / capacity está garantidamente monitorado. Os pesos devem
+    ser não negativos; pesos negativos só são aplicados a itens já monitorados.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("A capacidade deve ser um inteiro maior ou igual a 1.")
+        self.capacity = capacity
+        self.total = 0
+        self.evictions = 0
+        self.counters: Dict[str, List] = {}
+        self._heap: List[Tuple] = []
+
+    def add(self, item: str, weight=1) -> None:
+        """Acumula o peso de um item, substituindo o de menor contagem se necessário."""
+        self.total += weight
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += weight
+        elif weight < 0:
+            return
+        elif len(self.counters) < self.capacity:
+            counter = self.counters[item] = [weight, 0]
+        else:
+            minimum, victim = self._pop_min()
+            del self.counters[victim]
+            self.evictions += 1
+            counter = self.counters[item] = [minimum + weight, minimum]
+        heapq.heappush(self._heap, (counter[0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, (count, _) in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def count(self, item: str):
+        """Retorna a contagem estimada de um item (0 se não monitorado)."""
+        counter = self.counters.get(item)
+        return 0 if counter is None else counter[0]
+
+    def _pop_min(self) -> Tuple:
+        # Entradas desatualizadas do heap são descartadas até encontrar a contagem atual.
+        while True:
+            count, item = heapq.heappop(self._heap)
+            counter = self.counters.get(item)
+            if counter is not None and counter[0] == count:
+                return count, item
+
+    def error_bound(self) -> float:
+        """Retorna o erro máximo de qualquer contagem: total / capacity."""
+        return self.total / self.capacity
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[str, float, float]]:
+        """
+        Retorna os k itens com maior contagem estimada (todos, se k for None).
+
+        Returns:
+            List[Tuple[str, float, float]]: Tuplas (item, contagem, erro), em ordem
+            decrescente de contagem.
+        """
+        items = ((item, count, error) for item, (count, error) in self.counters.items())
+        if k is None:
+            return sorted(items, key=lambda entry: entry[1], reverse=True)
+        return heapq.nlargest(k, items, key=lambda entry: entry[1])
+
+    def guaranteed(self, k: int) -> bool:
+        """
+        Indica se os itens de top(k) são garantidamente os k maiores: sem substituições
+        as contagens são exatas; caso contrário, a contagem mínima de cada um deve superar
+        tanto a contagem estimada do (k+1)-ésimo item quanto a de qualquer item não
+        monitorado (no máximo a menor contagem monitorada).
+        """
+        if not self.evictions:
+            return True
+        ranked = self.top(k + 1)
+        threshold = min(count for count, _ in self.counters.values())
+        if len(ranked) > k:
+            threshold = max(threshold, ranked[k][1])
+        return all(count - error >= threshold for _, count, error in ranked[:k])
+
+
+class HeavyHitterAggregator:
+    """
+    Agrega vendas com memória limitada: receita e quantidade por produto são mantidas em
+    contadores Space-Saving, enquanto a receita total continua exata.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        filter_start_date: Optional[datetime] = None,
+        filter_end_date: Optional[datetime] = None,
+        date_format: str = "%Y-%m-%d",
+        rejects: Optional[RejectedRows] = None
+    ):
+        self.revenue = SpaceSaving(capacity)
+        self.quantity = SpaceSaving(capacity)
+        self.total_revenue = 0.0
+        self.in_window = make_date_filter(filter_start_date, filter_end_date, date_format)
+        self.rejects = rejects or RejectedRows()
+        self.rows_read = 0
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+
+    def consume(self, lines: Iterable[str]) -> None:
+        """
+        Agrega as linhas de um CSV (começando pelo cabeçalho), com a mesma validação e o
+        mesmo filtro de datas de process_csv_rows.
+        """
+        in_window = self.in_window
+        for row in self.rejects.dict_reader(lines):
+            self.rows_read += 1
+            try:
+                sale_date_str = row.get('data_venda', '').strip()
+                if not sale_date_str:
+                    continue
+                if in_window is not None and not in_window(sale_date_str):
+                    continue
+
+                quantity_str = row.get('quantidade', '').strip()
+                price_str = row.get('preco_unitario', '').strip()
+                if not quantity_str or not price_str:
+                    continue
+                product = row.get('produto', 'Unknown').strip()
+
+                quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                row_sale_value = calculate_sales(quantity, unit_price)
+                # Como nos contadores exatos, a quantidade (estimada) do produto deve
+                # caber em int64.
+                check_range(self.quantity.count(product) + quantity)
+                self.revenue.add(product, row_sale_value)
+                self.quantity.add(product, quantity)
+                self.total_revenue += row_sale_value
+                self.rows_accepted += 1
+            except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                self.rows_rejected += 1
+                self.rejects.reject(_err, row)
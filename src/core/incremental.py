@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, Optional
+
+STATE_VERSION = 2
+PREFIX_HASH_BYTES = 1 << 16
+TAIL_HASH_BYTES = 1 << 12
+
+
+def _hash_range(file_path: str, start: int, end: int) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as handle:
+        handle.seek(start)
+        digest.update(handle.read(max(0, end - start)))
+    return digest.hexdigest()
+
+
+def file_checksums(file_path: str, offset: int) -> Dict[str, str]:
+    """
+    Calcula os checksums usados para detectar se a parte já processada do arquivo mudou:
+    o início do arquivo (cabeçalho incluído) e os últimos bytes antes de offset.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        offset (int): A posição até onde o arquivo já foi processado.
+
+    Returns:
+        Dict[str, str]: Os checksums do prefixo e do trecho final processado.
+    """
+    return {
+        "prefix_hash": _hash_range(file_path, 0, min(offset, PREFIX_HASH_BYTES)),
+        "tail_hash": _hash_range(file_path, max(0, offset - TAIL_HASH_BYTES), offset),
+    }
+
+
+class AppendedLines:
+    """
+    Itera sobre as linhas completas de um arquivo a partir de uma posição em bytes.
+
+    Uma linha final sem quebra de linha (ainda sendo escrita) não é consumida. Após a
+    iteração, offset aponta para o fim da última linha completa lida.
+    """
+
+    def __init__(self, file_path: str, offset: int, encoding: str = 'utf-8'):
+        self.file_path = file_path
+        self.offset = offset
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.file_path, 'rb') as handle:
+            handle.seek(self.offset)
+            for raw_line in handle:
+                if not raw_line.endswith(b"\n"):
+                    break
+                self.offset += len(raw_line)
+                yield raw_line.decode(self.encoding)
+
+
+def load_state(state_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Lê o arquivo de estado do processamento incremental.
+
+    Returns:
+        Optional[Dict[str, Any]]: O estado, ou None se o arquivo não existir ou for inválido.
+    """
+    try:
+        with open(state_path, 'r', encoding='utf-8') as state_file:
+            state = json.load(state_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as _err:
+        logging.warning("Ignoring invalid state file '%s': %s", state_path, _err)
+        return None
+    if state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_path: str, state: Dict[str, Any]) -> None:
+    """
+    Grava o arquivo de estado de forma atômica (arquivo temporário + rename).
+    """
+    state = dict(state, version=STATE_VERSION)
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+
+def resume_offset(
+    state: Optional[Dict[str, Any]],
+    file_path: str,
+    settings: Dict[str, Any]
+) -> Optional[int]:
+    """
+    Verifica se o estado salvo pode ser retomado para o arquivo e as configurações atuais.
+
+    O estado só é retomado se for do mesmo arquivo, com os mesmos filtros e formato de
+    data, se o arquivo não tiver encolhido e se os checksums da parte já processada
+    continuarem iguais.
+
+    Args:
+        state (Optional[Dict[str, Any]]): O estado salvo.
+        file_path (str): O caminho do arquivo CSV.
+        settings (Dict[str, Any]): Filtros e formato de data da execução atual.
+
+    Returns:
+        Optional[int]: A posição a partir da qual continuar, ou None para reprocessar
+        o arquivo inteiro.
+    """
+    if state is None:
+        return None
+    if state.get("file") != os.path.abspath(file_path) or state.get("settings") != settings:
+        logging.info("State file does not match this file or filters; rescanning.")
+        return None
+    offset = state.get("offset", 0)
+    if os.path.getsize(file_path) < offset or file_checksums(file_path, offset) != state.get("checksums"):
+        logging.warning("File was truncated or rewritten since the last run; rescanning.")
+        return None
+    return offset
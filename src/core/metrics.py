@@ -0,0 +1,246 @@
+import io
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Etapas medidas, na ordem do relatório. Cada etapa registra o tempo próprio (sem o das
+# etapas aninhadas): 'read' é a espera pelas linhas (leitura, descompressão e
+# decodificação), 'tokenize' a separação dos campos, 'date_parse' o filtro de datas,
+# 'convert' a conversão numérica e 'aggregate' o acúmulo (nos motores vetorizados ou de
+# bytes, todo o processamento que não é leitura). 'scan' e 'results' cobrem o restante de
+# process_csv_rows e aggregate_results, e 'render' a geração do relatório.
+STAGES = ('read', 'tokenize', 'date_parse', 'convert', 'aggregate', 'scan', 'results', 'render')
+
+
+class CountingReader(io.RawIOBase):
+    """Fluxo binário que repassa as leituras de raw e soma os bytes lidos em metrics."""
+
+    def __init__(self, raw: BinaryIO, metrics: 'Metrics'):
+        super().__init__()
+        self._raw = raw
+        self._metrics = metrics
+
+    def readable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self._raw.fileno()
+
+    def readinto(self, buffer) -> int:
+        read = self._raw.readinto(buffer)
+        if read:
+            self._metrics.count('bytes_read', read)
+        return read
+
+    def close(self) -> None:
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+
+class Metrics:
+    """
+    Temporizadores e contadores por etapa de processamento (--metrics).
+
+    Cada thread mantém uma pilha das etapas em andamento, de modo que o tempo de uma etapa
+    aninhada é descontado da etapa que a contém, e acumula os próprios tempos (sem
+    bloqueio no laço por linha); report() soma os tempos de todas as threads.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads: List[Dict[str, List[float]]] = []
+        self._started = time.perf_counter()
+
+    def _state(self) -> Tuple[List[List[float]], Dict[str, List[float]]]:
+        # Pilha de [início, tempo aninhado] e acumuladores [próprio, total, medições].
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = self._local.state = ([], {})
+            with self._lock:
+                self._threads.append(state[1])
+        return state
+
+    def _accumulator(self, stage: str) -> List[float]:
+        accumulators = self._state()[1]
+        accumulator = accumulators.get(stage)
+        if accumulator is None:
+            accumulator = accumulators[stage] = [0.0, 0.0, 0]
+        return accumulator
+
+    def start(self, stage: str) -> None:
+        """Inicia a medição de uma etapa na thread atual."""
+        stack = self._state()[0]
+        stack.append([time.perf_counter(), 0.0, self._accumulator(stage)])
+
+    def stop(self) -> None:
+        """Encerra a etapa iniciada por último na thread atual."""
+        stack = self._state()[0]
+        started, nested, accumulator = stack.pop()
+        elapsed = time.perf_counter() - started
+        if stack:
+            stack[-1][1] += elapsed
+        accumulator[0] += elapsed - nested
+        accumulator[1] += elapsed
+        accumulator[2] += 1
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Mede o bloco como a etapa stage."""
+        self.start(stage)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """
+        Retorna func com cada chamada medida como a etapa stage, na thread que a criou
+        (o invólucro é usado dentro do laço por linha).
+        """
+        stack = self._state()[0]
+        accumulator = self._accumulator(stage)
+        clock = time.perf_counter
+
+        def timed_func(*args):
+            frame = [clock(), 0.0]
+            stack.append(frame)
+            try:
+                return func(*args)
+            finally:
+                stack.pop()
+                elapsed = clock() - frame[0]
+                if stack:
+                    stack[-1][1] += elapsed
+                accumulator[0] += elapsed - frame[1]
+                accumulator[1] += elapsed
+                accumulator[2] += 1
+        return timed_func
+
+    def timed_iter(self, stage: str, iterable: Iterable) -> Iterator:
+        """Itera sobre iterable medindo a obtenção de cada item como a etapa stage."""
+        stack = self._state()[0]
+        accumulator = self._accumulator(stage)
+        clock = time.perf_counter
+        iterator = iter(iterable)
+        while True:
+            frame = [clock(), 0.0]
+            stack.append(frame)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                stack.pop()
+                elapsed = clock() - frame[0]
+                if stack:
+                    stack[-1][1] += elapsed
+                accumulator[0] += elapsed - frame[1]
+                accumulator[1] += elapsed
+                accumulator[2] += 1
+            yield item
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Soma value ao contador."""
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def reader(self, raw: BinaryIO) -> BinaryIO:
+        """Envolve um fluxo binário para contar os bytes lidos em 'bytes_read'."""
+        return CountingReader(raw, self)
+
+    def stages(self) -> Dict[str, List[float]]:
+        """Retorna [tempo próprio, tempo total, medições] de cada etapa, somados entre as threads."""
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            for accumulators in self._threads:
+                for stage, (seconds, total_seconds, calls) in list(accumulators.items()):
+                    merged = totals.setdefault(stage, [0.0, 0.0, 0])
+                    merged[0] += seconds
+                    merged[1] += total_seconds
+                    merged[2] += calls
+        return totals
+
+    def report(self, rows_read: int = 0) -> Dict[str, Any]:
+        """
+        Monta o bloco de métricas.
+
+        Args:
+            rows_read (int): As linhas lidas, para calcular a vazão sobre o tempo de 'scan'.
+
+        Returns:
+            Dict[str, Any]: Tempo total, bytes e linhas lidos, linhas por segundo e, para
+            cada etapa, o tempo próprio, o tempo total (com as etapas aninhadas) e a
+            quantidade de medições.
+        """
+        stages = self.stages()
+        scan_seconds = stages.get('scan', [0.0, 0.0, 0])[1]
+        order = sorted(stages, key=lambda stage: (
+            STAGES.index(stage) if stage in STAGES else len(STAGES), stage))
+        return {
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "bytes_read": self.counters.get('bytes_read', 0),
+            "rows_read": rows_read,
+            "rows_per_second": round(rows_read / scan_seconds, 1) if scan_seconds else None,
+            "stages": {
+                stage: {
+                    "seconds": round(stages[stage][0], 6),
+                    "total_seconds": round(stages[stage][1], 6),
+                    "calls": stages[stage][2],
+                }
+                for stage in order
+            },
+        }
+
+
+class NullMetrics(Metrics):
+    """
+    Métricas desativadas: as etapas não são medidas e as funções e iteráveis são
+    devolvidos sem invólucro, de modo que o custo no laço por linha é nulo.
+    """
+
+    enabled = False
+
+    def start(self, stage: str) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def stage(self, stage: str):
+        return nullcontext()
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        return func
+
+    def timed_iter(self, stage: str, iterable: Iterable) -> Iterable:
+        return iterable
+
+    def count(self, counter: str, value: int = 1) -> None:
+        pass
+
+    def reader(self, raw: BinaryIO) -> BinaryIO:
+        return raw
+
+
+NULL_METRICS = NullMetrics()
+
+
+def write_metrics(metrics: Dict[str, Any], output: Optional[str] = None) -> None:
+    """
+    Escreve o bloco de métricas em JSON no arquivo output ou, sem arquivo (ou com '-'),
+    na saída de erros, para não se misturar ao relatório.
+    """
+    import json
+    document = json.dumps({"metrics": metrics}, indent=4, ensure_ascii=False)
+    if output and output != '-':
+        with open(output, 'w', encoding='utf-8') as handle:
+            handle.write(document + "\n")
+    else:
+        sys.stderr.write(document + "\n")
@@ -0,0 +1,148 @@
+import csv
+import mmap
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.counters import ProductCounters
+from core.rejects import RejectedRows
+
+MmapResult = Tuple[float, int, int, int]
+
+
+def _split_line(line: bytes, encoding: str) -> List[bytes]:
+    """
+    Divide uma linha CSV em campos. Linhas sem aspas são divididas diretamente nos bytes;
+    apenas linhas com aspas passam pelo módulo csv.
+    """
+    if b'"' not in line:
+        return line.split(b',')
+    fields = next(csv.reader([line.decode(encoding)]), [])
+    return [field.encode(encoding) for field in fields]
+
+
+def aggregate_mmap(
+    file_path: str,
+    ranges: Optional[Sequence[Tuple[int, int]]],
+    in_window: Optional[Callable[[str], bool]],
+    revenue_dict: Dict[str, float],
+    quantity_dict: Dict[str, int],
+    total_revenue: float = 0.0,
+    encoding: str = 'utf-8',
+    rejects: Optional[RejectedRows] = None
+) -> MmapResult:
+    """
+    Agrega as vendas de um CSV mapeado em memória, tokenizando diretamente os bytes.
+
+    As linhas são lidas do mapeamento sem passar por objetos de arquivo; quantidade e
+    preço são convertidos a partir dos bytes, a data só é decodificada uma vez por valor
+    distinto e o nome do produto só é decodificado (e internado em um id) uma vez por
+    valor distinto, com receita e quantidade acumuladas em arrays por id. Como as
+    páginas mapeadas pertencem ao arquivo, o uso de memória não cresce com o tamanho do
+    arquivo. Campos entre aspas com quebras de linha não são suportados.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV (não comprimido).
+        ranges (Optional[Sequence[Tuple[int, int]]]): Intervalos de bytes alinhados a
+            linhas a processar; None processa o arquivo inteiro após o cabeçalho.
+        in_window (Optional[Callable[[str], bool]]): O predicado do filtro de datas.
+        revenue_dict (Dict[str, float]): O dicionário de receita por produto.
+        quantity_dict (Dict[str, int]): O dicionário de quantidade por produto.
+        total_revenue (float): A receita total acumulada até aqui.
+        encoding (str): A codificação do arquivo.
+        rejects (Optional[RejectedRows]): Onde registrar as linhas com erro.
+
+    Returns:
+        MmapResult: A nova receita total, as linhas lidas, as linhas agregadas e as
+        linhas com erro.
+    """
+    rejects = rejects or RejectedRows()
+    rows_read = 0
+    rows_accepted = 0
+    rows_rejected = 0
+    if os.path.getsize(file_path) == 0:
+        return total_revenue, rows_read, rows_accepted, rows_rejected
+
+    with open(file_path, 'rb') as handle, \
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+
+        header_end = mapped.find(b'\n')
+        header_end = len(mapped) if header_end == -1 else header_end + 1
+        header = next(csv.reader([mapped[:header_end].decode(encoding)]), [])
+        if ranges is None:
+            ranges = [(header_end, len(mapped))]
+
+        columns = {name: header.index(name) for name in
+                   ('produto', 'quantidade', 'preco_unitario', 'data_venda') if name in header}
+        complete = all(name in columns for name in ('quantidade', 'preco_unitario', 'data_venda'))
+        width = max(columns.values()) + 1 if columns else 0
+        product_idx = columns.get('produto')
+        quantity_idx = columns.get('quantidade', 0)
+        price_idx = columns.get('preco_unitario', 0)
+        date_idx = columns.get('data_venda', 0)
+
+        date_decisions: Dict[bytes, bool] = {}
+        counters = ProductCounters.from_dicts(revenue_dict, quantity_dict)
+        add_id = counters.add_id
+        product_ids: Dict[bytes, int] = {}
+
+        readline = mapped.readline
+        for start, end in ranges:
+            mapped.seek(start)
+            while mapped.tell() < end:
+                line = readline().rstrip(b'\r\n')
+                if not line:
+                    continue
+                rows_read += 1
+                if not complete:
+                    continue
+
+                fields = _split_line(line, encoding)
+                if len(fields) < width:
+                    rows_rejected += 1
+                    rejects.reject("missing fields", line.decode(encoding, 'replace'), 'missing_fields')
+                    continue
+
+                date_raw = fields[date_idx].strip()
+                if not date_raw:
+                    continue
+                if in_window is not None:
+                    decision = date_decisions.get(date_raw)
+                    if decision is None:
+                        decision = in_window(date_raw.decode(encoding))
+                        date_decisions[date_raw] = decision
+                    if not decision:
+                        continue
+
+                quantity_raw = fields[quantity_idx].strip()
+                price_raw = fields[price_idx].strip()
+                if not quantity_raw or not price_raw:
+                    continue
+                try:
+                    quantity = int(quantity_raw)
+                    unit_price = float(price_raw.replace(b',', b'.'))
+                    sale_value = quantity * unit_price
+                    # As somas são verificadas pelos contadores, que lançam OverflowError
+                    # sem alterá-los.
+                    if product_idx is None:
+                        counters.add('Unknown', quantity, sale_value)
+                    else:
+                        product_raw = fields[product_idx].strip()
+                        product_id = product_ids.get(product_raw)
+                        if product_id is None:
+                            product_ids[product_raw] = counters.add(
+                                product_raw.decode(encoding), quantity, sale_value)
+                        else:
+                            add_id(product_id, quantity, sale_value)
+                except (ValueError, OverflowError) as _err:
+                    rows_rejected += 1
+                    rejects.reject(_err, line.decode(encoding, 'replace'))
+                    continue
+
+                total_revenue += sale_value
+                rows_accepted += 1
+
+    revenue_dict.update(zip(counters.products, counters.revenue))
+    quantity_dict.update(zip(counters.products, counters.quantity))
+    return total_revenue, rows_read, rows_accepted, rows_rejected
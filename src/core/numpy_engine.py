@@ -0,0 +1,397 @@
+import csv
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.counters import check_range
+from core.rejects import RejectedRows
+from utils.helpers import make_date_filter
+
+DEFAULT_BLOCK_SIZE = 65536
+SALES_COLUMNS = ('produto', 'quantidade', 'preco_unitario', 'data_venda')
+
+# Abaixo deste limite, nenhuma soma de quantidades de um bloco sai de int64 (a
+# verificação linha a linha só é feita quando o limite pode ser ultrapassado).
+SAFE_QUANTITY_BOUND = 2.0 ** 62
+
+
+class NumpyEngine:
+    """
+    Motor colunar de agregação baseado em NumPy.
+
+    Lê o CSV em blocos de linhas. Um bloco sem aspas e com o número certo de campos é
+    separado de uma vez (str.split sobre o texto do bloco) em colunas; os demais blocos,
+    e os blocos com valores inválidos, passam pelo csv.reader, linha a linha, para que
+    apenas as linhas com erro sejam rejeitadas. O filtro de datas, a multiplicação
+    quantidade × preço e as somas por produto são operações vetorizadas. As somas usam
+    ``np.add.at``, que acumula na mesma ordem do motor por linha, garantindo resultados
+    idênticos aos de ``process_csv_rows``.
+
+    Como nos demais motores, uma linha cuja quantidade somada à do produto não caiba em
+    int64 é rejeitada como 'out_of_range' (o int64 do NumPy daria a volta em silêncio).
+    """
+
+    def __init__(
+        self,
+        date_format: str = "%Y-%m-%d",
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        rejects: Optional[RejectedRows] = None
+    ):
+        self.date_format = date_format
+        self.rejects = rejects or RejectedRows()
+        self.block_size = block_size
+        self.products: List[str] = []
+        self.product_ids: Dict[str, int] = {}
+        self.revenue = np.zeros(0, dtype=np.float64)
+        self.quantity = np.zeros(0, dtype=np.int64)
+        self.total = np.zeros(1, dtype=np.float64)
+        self.rows_read = 0
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+
+    def load_state(
+        self,
+        revenue_dict: Dict[str, float],
+        quantity_dict: Dict[str, int],
+        total_revenue: float
+    ) -> None:
+        """
+        Carrega agregados já existentes para que o motor continue a acumulação a partir deles.
+
+        Args:
+            revenue_dict (Dict[str, float]): Receita por produto já acumulada.
+            quantity_dict (Dict[str, int]): Quantidade por produto já acumulada.
+            total_revenue (float): Receita total já acumulada.
+        """
+        self.products = list(revenue_dict)
+        self.product_ids = {name: idx for idx, name in enumerate(self.products)}
+        self.revenue = np.array(
+            [revenue_dict[name] for name in self.products], dtype=np.float64)
+        self.quantity = np.array(
+            [quantity_dict.get(name, 0) for name in self.products], dtype=np.int64)
+        self.total = np.array([total_revenue], dtype=np.float64)
+
+    def store_state(
+        self,
+        revenue_dict: Dict[str, float],
+        quantity_dict: Dict[str, int]
+    ) -> float:
+        """
+        Escreve os agregados do motor nos dicionários de receita e quantidade.
+
+        Returns:
+            float: A receita total acumulada.
+        """
+        for idx, name in enumerate(self.products):
+            revenue_dict[name] = float(self.revenue[idx])
+            quantity_dict[name] = int(self.quantity[idx])
+        return float(self.total[0])
+
+    def consume(
+        self,
+        lines: Iterable[str],
+        filter_start_date: Optional[datetime],
+        filter_end_date: Optional[datetime]
+    ) -> None:
+        """
+        Processa as linhas CSV bloco a bloco.
+
+        Args:
+            lines (Iterable[str]): As linhas do CSV, começando pelo cabeçalho.
+            filter_start_date (Optional[datetime]): Data inicial do filtro (inclusiva).
+            filter_end_date (Optional[datetime]): Data final do filtro (exclusiva).
+        """
+        in_window = make_date_filter(
+            filter_start_date, filter_end_date, self.date_format)
+        lines = iter(lines)
+        header_line = next(lines, None)
+        if header_line is None:
+            return
+        header = next(csv.reader([header_line]), [])
+        while True:
+            block = list(islice(lines, self.block_size))
+            if not block:
+                break
+            # Um registro entre aspas pode ocupar várias linhas: o bloco só termina com
+            # as aspas fechadas.
+            text = ''.join(block)
+            quotes = text.count('"')
+            while quotes % 2:
+                line = next(lines, None)
+                if line is None:
+                    break
+                block.append(line)
+                quotes += line.count('"')
+            columns = None if quotes else self._split_block(text, len(block), header)
+            if columns is None or not self._process_columns(*columns, in_window):
+                self.process_block(list(self.rejects.list_reader(block)), header, in_window)
+
+    @staticmethod
+    def _split_block(
+        text: str,
+        line_count: int,
+        header: List[str]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Separa o texto de um bloco sem aspas, de line_count linhas, nas colunas de vendas
+        (sem espaços nas bordas), com um único str.split.
+
+        Returns:
+            Optional[Tuple[np.ndarray, ...]]: Produtos, quantidades, preços e datas, ou
+            None se o bloco não puder ser separado assim (colunas ausentes, linhas vazias
+            ou com outro número de campos).
+        """
+        if not all(name in header for name in SALES_COLUMNS):
+            return None
+        text = text.replace('\r\n', '\n')
+        if not text.endswith('\n'):
+            text += '\n'
+        if '\r' in text:
+            return None
+        fields = text.replace('\n', ',').split(',')
+        fields.pop()
+        width = len(header)
+        if len(fields) != width * line_count or text.count('\n') != line_count:
+            return None
+        return tuple(
+            np.char.strip(np.array(fields[header.index(name)::width], dtype=str))
+            for name in SALES_COLUMNS
+        )
+
+    def _process_columns(
+        self,
+        products: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        dates: np.ndarray,
+        in_window: Optional[Callable[[str], bool]] = None
+    ) -> bool:
+        """
+        Agrega um bloco já separado em colunas, se todas as linhas selecionadas tiverem
+        valores válidos e as somas couberem nos contadores.
+
+        Returns:
+            bool: False, sem alterar os agregados, se o bloco precisar ser processado linha
+            a linha (por process_block) para rejeitar as linhas com erro.
+        """
+        mask = (quantities != '') & (prices != '') & (dates != '')
+        if in_window is not None:
+            mask &= self._date_mask(dates, in_window)
+        selected = np.flatnonzero(mask)
+        quantity_strs = quantities[selected].tolist()
+        price_strs = prices[selected].tolist()
+        try:
+            quantity_values = np.fromiter(
+                map(int, quantity_strs), dtype=np.int64, count=len(quantity_strs))
+            price_values = np.fromiter(
+                map(float, price_strs), dtype=np.float64, count=len(price_strs))
+        except (ValueError, OverflowError):
+            return False
+        if not self._sums_fit(quantity_values):
+            return False
+        self.rows_read += products.size
+        if selected.size:
+            self._accumulate(products[selected], quantity_values, price_values)
+        return True
+
+    def process_block(
+        self,
+        block: List[List[str]],
+        header: List[str],
+        in_window: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        """
+        Agrega um bloco de linhas já tokenizadas.
+
+        Args:
+            block (List[List[str]]): As linhas do bloco, como listas de campos.
+            header (List[str]): O cabeçalho do CSV.
+            in_window (Optional[Callable[[str], bool]]): O predicado do filtro de datas,
+                criado por make_date_filter, ou None se não houver filtro.
+        """
+        rows = [row for row in block if row]
+        self.rows_read += len(rows)
+        if not rows:
+            return
+        total_rows = len(rows)
+        rows = self._drop_short_rows(rows, header)
+        self.rows_rejected += total_rows - len(rows)
+        if not rows:
+            return
+
+        products = self._column(rows, header, 'produto', 'Unknown')
+        quantities = self._column(rows, header, 'quantidade', '')
+        prices = self._column(rows, header, 'preco_unitario', '')
+        dates = self._column(rows, header, 'data_venda', '')
+
+        mask = (quantities != '') & (prices != '') & (dates != '')
+        if in_window is not None:
+            mask &= self._date_mask(dates, in_window)
+        selected = np.flatnonzero(mask)
+        if selected.size == 0:
+            return
+
+        selected_rows = selected.size
+        selected, quantity_values, price_values = self._convert(
+            selected, quantities, prices, rows, header)
+        self.rows_rejected += selected_rows - selected.size
+        if selected.size == 0:
+            return
+
+        selected_rows = None
+        if not self._sums_fit(quantity_values):
+            selected_rows = [rows[row_idx] for row_idx in selected.tolist()]
+        self._accumulate(products[selected], quantity_values, price_values, selected_rows)
+
+    def _sums_fit(self, quantity_values: np.ndarray) -> bool:
+        """
+        Verifica, sem percorrer as linhas, que nenhuma soma de quantidades com as do
+        bloco pode sair de int64 (limite em float, que não dá a volta).
+        """
+        bound = np.abs(self.quantity.astype(np.float64)).max(initial=0.0)
+        return bound + np.abs(quantity_values.astype(np.float64)).sum() < SAFE_QUANTITY_BOUND
+
+    def _accumulate(
+        self,
+        products: np.ndarray,
+        quantity_values: np.ndarray,
+        price_values: np.ndarray,
+        rows: Optional[List[List[str]]] = None
+    ) -> None:
+        """
+        Soma as vendas convertidas aos agregados. Com rows (as linhas das vendas, quando
+        alguma soma pode sair de int64), as somas são verificadas na ordem de leitura, e
+        as linhas que não couberem são rejeitadas como 'out_of_range'.
+        """
+        product_ids = self._intern(products)
+        if rows is not None:
+            keep = self._check_sums(product_ids, quantity_values, rows)
+            product_ids, quantity_values, price_values = (
+                product_ids[keep], quantity_values[keep], price_values[keep])
+        self.rows_accepted += int(product_ids.size)
+        sale_values = quantity_values * price_values
+        np.add.at(self.revenue, product_ids, sale_values)
+        np.add.at(self.quantity, product_ids, quantity_values)
+        np.add.at(self.total, np.zeros(sale_values.size, dtype=np.intp), sale_values)
+
+    def _check_sums(
+        self,
+        product_ids: np.ndarray,
+        quantity_values: np.ndarray,
+        rows: List[List[str]]
+    ) -> np.ndarray:
+        """Retorna a máscara das linhas cujas somas cabem em int64, rejeitando as demais."""
+        sums = self.quantity.tolist()
+        keep = np.ones(product_ids.size, dtype=bool)
+        values = zip(product_ids.tolist(), quantity_values.tolist())
+        for pos, (product_id, quantity) in enumerate(values):
+            try:
+                check_range(sums[product_id] + quantity)
+            except OverflowError as _err:
+                self.rows_rejected += 1
+                self.rejects.reject(_err, rows[pos])
+                keep[pos] = False
+                continue
+            sums[product_id] += quantity
+        return keep
+
+    def _drop_short_rows(self, rows: List[List[str]], header: List[str]) -> List[List[str]]:
+        """Descarta, com aviso, as linhas que não alcançam as colunas de vendas."""
+        indexes = [header.index(name) for name in SALES_COLUMNS if name in header]
+        width = max(indexes) + 1 if indexes else 0
+        if all(len(row) >= width for row in rows):
+            return rows
+        kept = []
+        for row in rows:
+            if len(row) >= width:
+                kept.append(row)
+            else:
+                self.rejects.reject("missing fields", row, 'missing_fields')
+        return kept
+
+    @staticmethod
+    def _column(rows: List[List[str]], header: List[str], name: str, default: str) -> np.ndarray:
+        """Extrai uma coluna do bloco como array de strings sem espaços nas bordas."""
+        if name not in header:
+            return np.full(len(rows), default)
+        idx = header.index(name)
+        return np.char.strip(np.array([row[idx] for row in rows], dtype=str))
+
+    @staticmethod
+    def _date_mask(dates: np.ndarray, in_window: Callable[[str], bool]) -> np.ndarray:
+        """Calcula a máscara do filtro de datas avaliando cada data distinta uma única vez."""
+        unique_dates, inverse = np.unique(dates, return_inverse=True)
+        keep = np.fromiter(
+            (not date_str or in_window(date_str) for date_str in unique_dates.tolist()),
+            dtype=bool, count=unique_dates.size)
+        return keep[inverse]
+
+    def _convert(
+        self,
+        selected: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        rows: List[List[str]],
+        header: List[str]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converte quantidades e preços das linhas selecionadas em arrays numéricos.
+
+        Se alguma linha do bloco tiver valores inválidos, o bloco é convertido linha a
+        linha para descartar apenas as linhas com erro.
+        """
+        quantity_strs = quantities[selected].tolist()
+        price_strs = np.char.replace(prices[selected], ',', '.').tolist()
+        try:
+            quantity_values = np.fromiter(
+                map(int, quantity_strs), dtype=np.int64, count=len(quantity_strs))
+            price_values = np.fromiter(
+                map(float, price_strs), dtype=np.float64, count=len(price_strs))
+            return selected, quantity_values, price_values
+        except (ValueError, OverflowError):
+            pass
+
+        kept, quantity_list, price_list = [], [], []
+        for pos, row_idx in enumerate(selected.tolist()):
+            try:
+                quantity = int(quantity_strs[pos])
+                unit_price = float(price_strs[pos])
+                np.int64(quantity)
+            except (ValueError, OverflowError) as _err:
+                self.rejects.reject(_err, rows[row_idx])
+                continue
+            kept.append(row_idx)
+            quantity_list.append(quantity)
+            price_list.append(unit_price)
+        return (
+            np.array(kept, dtype=np.intp),
+            np.array(quantity_list, dtype=np.int64),
+            np.array(price_list, dtype=np.float64)
+        )
+
+    def _intern(self, products: np.ndarray) -> np.ndarray:
+        """
+        Converte os nomes de produtos em ids inteiros densos.
+
+        Novos produtos recebem ids na ordem da primeira ocorrência, preservando a mesma
+        ordem de inserção dos dicionários do motor por linha.
+        """
+        unique_products, first_index, inverse = np.unique(
+            products, return_index=True, return_inverse=True)
+        local_to_global = np.empty(unique_products.size, dtype=np.intp)
+        for local in np.argsort(first_index, kind='stable').tolist():
+            name = str(unique_products[local])
+            product_id = self.product_ids.get(name)
+            if product_id is None:
+                product_id = len(self.products)
+                self.product_ids[name] = product_id
+                self.products.append(name)
+            local_to_global[local] = product_id
+
+        missing = len(self.products) - self.revenue.size
+        if missing > 0:
+            self.revenue = np.concatenate([self.revenue, np.zeros(missing, dtype=np.float64)])
+            self.quantity = np.concatenate([self.quantity, np.zeros(missing, dtype=np.int64)])
+        return local_to_global[inverse]
@@ -0,0 +1,139 @@
+import os
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CHUNKS_PER_WORKER = 4
+
+PartialAggregate = Tuple[Dict[str, float], Dict[str, int], float, int, int, int, Dict[str, int]]
+
+
+def split_byte_ranges(file_path: str, parts: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Divide o arquivo CSV em intervalos de bytes alinhados a quebras de linha.
+
+    O cabeçalho é lido à parte e não pertence a nenhum intervalo. Campos entre aspas
+    contendo quebras de linha não são suportados neste modo.
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        parts (int): A quantidade desejada de intervalos.
+
+    Returns:
+        Tuple[bytes, List[Tuple[int, int]]]: A linha de cabeçalho e a lista de
+        intervalos (início, fim) em bytes.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as handle:
+        header = handle.readline()
+        data_start = handle.tell()
+        if data_start >= size:
+            return header, []
+
+        parts = max(1, parts)
+        step = (size - data_start) / parts
+        boundaries = [data_start]
+        for idx in range(1, parts):
+            handle.seek(data_start + int(step * idx))
+            handle.readline()
+            boundary = handle.tell()
+            if boundaries[-1] < boundary < size:
+                boundaries.append(boundary)
+        boundaries.append(size)
+
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def iter_range_lines(
+    file_path: str,
+    start: int,
+    end: int,
+    encoding: str = 'utf-8'
+) -> Iterator[str]:
+    """
+    Itera sobre as linhas completas contidas no intervalo de bytes [start, end).
+
+    Args:
+        file_path (str): O caminho do arquivo CSV.
+        start (int): Posição inicial, sempre no início de uma linha.
+        end (int): Posição final (exclusiva).
+        encoding (str): A codificação do arquivo.
+
+    Yields:
+        str: Cada linha decodificada, incluindo a quebra de linha.
+    """
+    with open(file_path, 'rb') as handle:
+        handle.seek(start)
+        position = start
+        for raw_line in handle:
+            if position >= end:
+                break
+            position += len(raw_line)
+            yield raw_line.decode(encoding)
+
+
+def process_range(
+    task: Tuple[str, bytes, int, int, Optional[str], Optional[str], str, str, Optional[int]]
+) -> PartialAggregate:
+    """
+    Processa um intervalo de bytes do CSV em um processo de trabalho.
+
+    Args:
+        task: Tupla com caminho, cabeçalho, início, fim, data inicial, data final,
+            formato de data, motor de processamento e limite de linhas com erro.
+
+    Returns:
+        PartialAggregate: Receita por produto, quantidade por produto, receita total,
+        linhas lidas, linhas agregadas, linhas com erro e linhas com erro por categoria
+        do intervalo.
+    """
+    from core.csv_processor import CSVProcessor
+
+    file_path, header, start, end, start_date, end_date, date_format, engine, max_errors = task
+    processor = CSVProcessor(file_path, start_date, end_date)
+    processor.set_date_format(date_format)
+    processor.set_engine(engine)
+    processor.set_max_errors(max_errors)
+    if engine == 'mmap':
+        processor.process_mmap_ranges([(start, end)])
+    else:
+        lines = chain([header.decode('utf-8')], iter_range_lines(file_path, start, end))
+        processor.process_lines(lines)
+    return (
+        processor.revenue_per_product,
+        processor.quantity_per_product,
+        processor.total_global_revenue,
+        processor.rows_read,
+        processor.rows_accepted,
+        processor.rows_rejected,
+        processor.rejects.counts
+    )
+
+
+def process_in_parallel(
+    file_path: str,
+    workers: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    date_format: str,
+    engine: str,
+    max_errors: Optional[int] = None
+) -> Iterator[PartialAggregate]:
+    """
+    Processa o arquivo CSV em um pool de processos, um intervalo de bytes por tarefa.
+
+    Os agregados parciais são devolvidos na ordem do arquivo, para que a mesclagem
+    preserve a ordem de primeira ocorrência dos produtos.
+
+    Yields:
+        PartialAggregate: Os agregados parciais de cada intervalo, em ordem.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    header, ranges = split_byte_ranges(file_path, workers * CHUNKS_PER_WORKER)
+    tasks = [
+        (file_path, header, start, end, start_date, end_date, date_format, engine, max_errors)
+        for start, end in ranges
+    ]
+    if not tasks:
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(process_range, tasks)
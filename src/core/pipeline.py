@@ -0,0 +1,162 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterable, Iterator, List
+
+from core.compression import detect_compression, open_decompressor
+
+PIPELINE_BLOCK_SIZE = 1 << 20
+PIPELINE_QUEUE_BLOCKS = 8
+PIPELINE_QUEUE_BATCHES = 4
+
+_END = object()
+
+
+class PipelineStage:
+    """
+    Estágio do pipeline: uma thread percorre items (por exemplo, a saída do estágio
+    anterior) e entrega cada item por uma fila limitada a max_items itens.
+
+    Com a fila cheia, a thread espera o consumidor (contrapressão), de modo que a memória
+    de cada estágio é limitada. Um erro na thread é relançado no consumidor depois dos
+    itens já produzidos. close() interrompe o estágio mesmo com a fila cheia ou vazia.
+    """
+
+    def __init__(self, items: Iterable[Any], max_items: int, name: str):
+        import queue
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_items)
+        self._stop = threading.Event()
+        self._items = items
+        self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        import queue
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for item in self._items:
+                if not self._put(item):
+                    return
+            self._put(_END)
+        except BaseException as _err:  # pylint: disable=broad-except
+            self._put(_err)
+
+    def __iter__(self) -> Iterator[Any]:
+        import queue
+        while True:
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def stop(self) -> None:
+        """Sinaliza a thread para parar."""
+        self._stop.set()
+
+    def join(self) -> None:
+        """Espera a thread terminar."""
+        self._thread.join()
+
+
+def advise_sequential(raw: BinaryIO) -> None:
+    """
+    Indica ao sistema operacional que o arquivo será lido sequencialmente, o que aumenta
+    a leitura antecipada (readahead) do kernel. Ignorado quando não há descritor de
+    arquivo ou a plataforma não tem posix_fadvise.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+def read_blocks(source: BinaryIO, block_size: int = PIPELINE_BLOCK_SIZE) -> Iterator[bytes]:
+    """Lê a origem em blocos de block_size bytes."""
+    while True:
+        block = source.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+def decode_lines(blocks: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[List[str]]:
+    """
+    Converte blocos de bytes em lotes de linhas de texto, cortando cada bloco na última
+    quebra de linha (o restante segue para o próximo bloco), de modo que nenhuma linha
+    ou caractere multibyte fica dividido. As linhas são separadas como em um arquivo
+    aberto com newline='' (fins de linha preservados, para o leitor CSV).
+    """
+    pending = b""
+    for block in blocks:
+        end = block.rfind(b"\n")
+        if end < 0:
+            pending += block
+            continue
+        data = pending + block[:end + 1] if pending else block[:end + 1]
+        pending = block[end + 1:]
+        yield list(io.StringIO(data.decode(encoding), newline=''))
+    if pending:
+        yield list(io.StringIO(pending.decode(encoding), newline=''))
+
+
+@contextmanager
+def pipelined_lines(
+    raw: BinaryIO,
+    encoding: str = 'utf-8',
+    block_size: int = PIPELINE_BLOCK_SIZE,
+    queue_blocks: int = PIPELINE_QUEUE_BLOCKS,
+    queue_batches: int = PIPELINE_QUEUE_BATCHES
+) -> Iterator[Iterator[str]]:
+    """
+    Lê um fluxo binário em um pipeline de duas threads e fornece as linhas de texto.
+
+    A thread de leitura lê (e descomprime, se for o caso) blocos de block_size bytes à
+    frente do processamento, até queue_blocks blocos; a thread de decodificação os
+    converte em lotes de linhas, até queue_batches lotes. Assim a espera pelo disco (ou
+    pela rede) se sobrepõe à conversão e à agregação das linhas na thread principal.
+    Ao sair do bloco, as threads são interrompidas e raw é fechado.
+
+    Args:
+        raw (BinaryIO): O fluxo binário do arquivo (ou da entrada padrão).
+        encoding (str): A codificação do texto.
+        block_size (int): O tamanho dos blocos lidos.
+        queue_blocks (int): Quantos blocos lidos podem aguardar a decodificação.
+        queue_batches (int): Quantos lotes de linhas podem aguardar a agregação.
+
+    Yields:
+        Iterator[str]: As linhas do arquivo, começando pelo cabeçalho.
+    """
+    advise_sequential(raw)
+    source = raw if hasattr(raw, 'peek') else io.BufferedReader(raw)
+    compression = detect_compression(source.peek(6)[:6])
+    if compression is not None:
+        source = open_decompressor(compression, source)
+    reader = PipelineStage(read_blocks(source, block_size), queue_blocks, "pipeline-read")
+    decoder = PipelineStage(decode_lines(reader, encoding), queue_batches, "pipeline-decode")
+    try:
+        yield (line for batch in decoder for line in batch)
+    finally:
+        for stage in (decoder, reader):
+            stage.stop()
+        for stage in (decoder, reader):
+            stage.join()
+        source.close()
+        raw.close()
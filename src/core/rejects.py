@@ -0,0 +1,224 @@
+import csv
+import io
+import logging
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+REJECT_SAMPLES = 3
+
+RejectedData = Union[Dict[str, str], List[str], str]
+
+
+class TooManyRejectedRows(Exception):
+    """Indica que a quantidade de linhas com erro ultrapassou o limite de --max-errors."""
+
+
+def error_category(error: Union[BaseException, str]) -> str:
+    """
+    Classifica o erro de uma linha rejeitada: 'missing_column', 'missing_fields',
+    'out_of_range', 'invalid_quantity', 'invalid_price' ou 'invalid_value'.
+
+    Linhas com menos campos que o cabeçalho chegam do DictReader com None nos campos
+    ausentes, e falham (AttributeError) ao remover os espaços.
+    """
+    if isinstance(error, KeyError):
+        return 'missing_column'
+    if isinstance(error, AttributeError):
+        return 'missing_fields'
+    if isinstance(error, OverflowError):
+        return 'out_of_range'
+    message = str(error)
+    if message.startswith('invalid literal for int()'):
+        return 'invalid_quantity'
+    if 'float' in message or 'price' in message:
+        return 'invalid_price'
+    return 'invalid_value'
+
+
+class RawDictRow(dict):
+    """Registro do csv.DictReader com o texto original das suas linhas (raw)."""
+    __slots__ = ('raw',)
+
+
+class RawListRow(list):
+    """Registro do csv.reader com o texto original das suas linhas (raw)."""
+    __slots__ = ('raw',)
+
+
+class _RecordedLines:
+    """Fonte de linhas do csv que guarda as linhas lidas para o registro atual."""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self.record: List[str] = []
+
+    def __iter__(self) -> '_RecordedLines':
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        self.record.append(line)
+        return line
+
+
+class RawLineReader:
+    """
+    Leitor CSV (csv.DictReader, ou csv.reader com dicts=False) que entrega cada registro
+    com o texto original das suas linhas no atributo raw, inclusive aspas e campos
+    ausentes, para que as linhas rejeitadas sejam gravadas na quarentena sem alteração.
+    """
+
+    def __init__(self, lines: Iterable[str], dicts: bool = True):
+        self._lines = _RecordedLines(lines)
+        self._reader: Any = csv.DictReader(self._lines) if dicts else csv.reader(self._lines)
+        self._row_type = RawDictRow if dicts else RawListRow
+        if dicts:
+            # Ler fieldnames consome o cabeçalho, que não faz parte de nenhum registro.
+            _ = self._reader.fieldnames
+            self._lines.record.clear()
+
+    @property
+    def fieldnames(self) -> Optional[List[str]]:
+        return self._reader.fieldnames
+
+    def __iter__(self) -> Iterator[RejectedData]:
+        return self
+
+    def __next__(self) -> RejectedData:
+        record = self._lines.record
+        record.clear()
+        row = self._row_type(next(self._reader))
+        row.raw = ''.join(record).strip('\r\n')
+        return row
+
+
+def raw_line(data: RejectedData) -> str:
+    """
+    Retorna a linha CSV de uma linha rejeitada: o texto original, quando disponível
+    (texto ou registro de um RawLineReader), ou a linha reconstruída do dicionário ou da
+    lista de campos.
+    """
+    if isinstance(data, str):
+        return data.rstrip('\r\n')
+    raw = getattr(data, 'raw', None)
+    if raw is not None:
+        return raw
+    if isinstance(data, dict):
+        fields = [value for key, value in data.items() if key is not None]
+        fields.extend(data.get(None) or [])
+    else:
+        fields = list(data)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow(
+        ['' if field is None else field for field in fields])
+    return buffer.getvalue()
+
+
+class RejectedRows:
+    """
+    Contabiliza as linhas rejeitadas por erro de formatação.
+
+    As linhas são contadas por categoria de erro e apenas as primeiras `samples` de cada
+    categoria são registradas no log, de modo que arquivos muito sujos não geram uma
+    linha de log por erro. Opcionalmente, as linhas rejeitadas são gravadas sem
+    alteração em um arquivo de quarentena, e o processamento é interrompido com
+    TooManyRejectedRows quando o total passa de max_errors. Pode ser compartilhado
+    entre threads.
+    """
+
+    def __init__(
+        self,
+        samples: int = REJECT_SAMPLES,
+        max_errors: Optional[int] = None,
+        quarantine_file: Optional[str] = None
+    ):
+        self.samples = samples
+        self.max_errors = max_errors
+        self.quarantine_file = quarantine_file
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self._quarantine: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def reject(
+        self,
+        error: Union[BaseException, str],
+        data: RejectedData,
+        category: Optional[str] = None
+    ) -> None:
+        """
+        Registra uma linha rejeitada.
+
+        Args:
+            error (Union[BaseException, str]): O erro de formatação.
+            data (RejectedData): A linha (dicionário do DictReader, lista de campos ou texto).
+            category (Optional[str]): A categoria do erro; se omitida, é deduzida do erro.
+
+        Raises:
+            TooManyRejectedRows: Se o total de linhas rejeitadas passar de max_errors.
+        """
+        category = category or error_category(error)
+        with self._lock:
+            self.total += 1
+            count = self.counts.get(category, 0) + 1
+            self.counts[category] = count
+            if count <= self.samples:
+                logging.warning("Row skipped due to formatting error: %s - Data: %s", error, data)
+            if self.quarantine_file:
+                if self._quarantine is None:
+                    self._quarantine = open(self.quarantine_file, 'w', encoding='utf-8', newline='')
+                self._quarantine.write(raw_line(data) + '\n')
+        self.check_limit()
+
+    def dict_reader(self, lines: Iterable[str]) -> Union[csv.DictReader, RawLineReader]:
+        """
+        Retorna o csv.DictReader das linhas; com arquivo de quarentena, um RawLineReader,
+        que guarda o texto original de cada registro.
+        """
+        if self.quarantine_file:
+            return RawLineReader(lines)
+        return csv.DictReader(lines)
+
+    def list_reader(self, lines: Iterable[str]) -> Iterable[List[str]]:
+        """Como dict_reader(), com os registros como listas de campos (csv.reader)."""
+        if self.quarantine_file:
+            return RawLineReader(lines, dicts=False)
+        return csv.reader(lines)
+
+    def merge(self, counts: Dict[str, int]) -> None:
+        """Soma contagens por categoria apuradas em outro processo ou lidas do cache."""
+        with self._lock:
+            for category, count in counts.items():
+                self.counts[category] = self.counts.get(category, 0) + count
+                self.total += count
+        self.check_limit()
+
+    def check_limit(self) -> None:
+        """Lança TooManyRejectedRows se o total de linhas rejeitadas passar de max_errors."""
+        if self.max_errors is not None and self.total > self.max_errors:
+            raise TooManyRejectedRows(
+                f"{self.total} rejected row(s) exceed --max-errors {self.max_errors}.")
+
+    def log_summary(self) -> None:
+        """Registra no log o total de linhas rejeitadas por categoria, se houver omissões."""
+        if any(count > self.samples for count in self.counts.values()):
+            logging.warning(
+                "%d row(s) skipped due to formatting errors (only %d sample(s) per category logged): %s",
+                self.total, self.samples, self.counts)
+
+    def reset(self) -> None:
+        """
+        Descarta as linhas rejeitadas registradas até aqui, para reprocessar as mesmas
+        linhas; o arquivo de quarentena é reescrito desde o início.
+        """
+        self.close()
+        with self._lock:
+            self.total = 0
+            self.counts = {}
+
+    def close(self) -> None:
+        """Fecha o arquivo de quarentena, se aberto."""
+        with self._lock:
+            if self._quarantine is not None:
+                self._quarantine.close()
+                self._quarantine = None
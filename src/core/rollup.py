@@ -0,0 +1,289 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from core.counters import ProductCounters
+from core.rejects import RejectedRows
+from utils.helpers import calculate_sales, convert_sale_values, parse_date_cached
+
+GRANULARITIES = ('daily', 'weekly', 'monthly')
+
+RangeResult = Tuple[Dict[str, float], Dict[str, int], float]
+
+
+def bucket_key(ordinal: int, granularity: str) -> str:
+    """
+    Retorna o período de um dia para a granularidade informada: o próprio dia
+    (AAAA-MM-DD), a segunda-feira da semana (AAAA-MM-DD) ou o mês (AAAA-MM).
+    """
+    day = date.fromordinal(ordinal)
+    if granularity == 'weekly':
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if granularity == 'monthly':
+        return day.strftime("%Y-%m")
+    return day.isoformat()
+
+
+def period_series(
+    days: Iterable[Tuple[int, Dict[int, List[Any]]]],
+    granularity: str,
+    products: List[str],
+    top: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Agrupa agregados diários por produto (receita e quantidade nas duas primeiras
+    posições) em uma série por dia, semana ou mês.
+
+    Args:
+        days: Pares (dia, agregados por id de produto), em ordem cronológica.
+        granularity (str): 'daily', 'weekly' ou 'monthly'.
+        products (List[str]): Os nomes dos produtos, indexados pelo id.
+        top (Optional[int]): Com top, cada período lista também os seus top produtos
+            por receita; sem top, apenas os totais do período.
+
+    Returns:
+        List[Dict[str, Any]]: Um item por período, em ordem cronológica.
+    """
+    periods: Dict[str, List[Any]] = {}
+    for day, day_products in days:
+        key = bucket_key(day, granularity)
+        period = periods.get(key)
+        if period is None:
+            period = periods[key] = [0.0, 0, {}]
+        for product_id, (revenue, quantity, *_) in day_products.items():
+            period[0] += revenue
+            period[1] += quantity
+            if top is not None:
+                totals = period[2].setdefault(product_id, [0.0, 0])
+                totals[0] += revenue
+                totals[1] += quantity
+
+    series = []
+    for key, (revenue, quantity, totals) in periods.items():
+        item: Dict[str, Any] = {"period": key, "revenue": round(revenue, 2), "quantity": quantity}
+        if top is not None:
+            item["products"] = [
+                {"product": products[product_id], "revenue": round(revenue, 2), "quantity": quantity}
+                for product_id, (revenue, quantity) in heapq.nlargest(
+                    top, totals.items(), key=lambda entry: entry[1][0])
+            ]
+        series.append(item)
+    return series
+
+
+def _prefix_sums(values: List[int]) -> Union[array, List[int]]:
+    # As somas de cada produto cabem em int64 na ordem de leitura; na ordem das datas,
+    # com quantidades negativas, um prefixo ainda pode sair do intervalo.
+    sums = list(accumulate(values, initial=0))
+    try:
+        return array('q', sums)
+    except OverflowError:
+        return sums
+
+
+class SalesRollup:
+    """
+    Agregados diários de vendas por produto com somas de prefixo.
+
+    Uma única leitura acumula receita, quantidade e número de vendas por produto e dia.
+    Em build(), são montados, para cada produto, os dias com vendas e arrays cumulativos
+    sobre esses dias (esparsos: o tamanho é o número de pares produto-dia com vendas), de
+    modo que os totais de qualquer período [início, fim) são obtidos por duas buscas
+    binárias e uma subtração por produto, sem reler as linhas. Vendas com datas
+    inválidas, que nunca são filtradas, ficam em um grupo à parte somado a todos os
+    períodos.
+
+    Cada agregado diário guarda também a posição (na ordem de leitura) da primeira venda
+    do produto no dia, para que os produtos de um período sigam a ordem de primeira
+    ocorrência dentro do período, como na leitura linha a linha.
+
+    As somas de cada produto na ordem de leitura são mantidas em ProductCounters: uma
+    venda cuja soma não caiba nos contadores é rejeitada como 'out_of_range', como nos
+    demais motores.
+    """
+
+    def __init__(self, date_format: str = "%Y-%m-%d", rejects: Optional[RejectedRows] = None):
+        self.date_format = date_format
+        self.rejects = rejects or RejectedRows()
+        self.totals = ProductCounters()
+        self.products: List[str] = self.totals.products
+        self.days: List[int] = []
+        self.sales = 0
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self._daily: Dict[int, Dict[int, List[Any]]] = {}
+        self._undated: Dict[int, List[Any]] = {}
+        self._cum_revenue: List[array] = []
+        self._cum_quantity: List[Union[array, List[int]]] = []
+        self._cum_total = array('d')
+        self._cum_count = array('q')
+        self._product_days: List[array] = []
+        self._first_sale: List[array] = []
+
+    def add(self, product: str, quantity: int, sale_value: float, ordinal: Optional[int]) -> None:
+        """
+        Acumula uma venda no dia informado (None para datas inválidas).
+
+        Raises:
+            OverflowError: Se a soma do produto não couber nos contadores (a venda não é
+                acumulada).
+        """
+        product_id = self.totals.add(product, quantity, sale_value)
+        bucket = self._undated if ordinal is None else self._daily.setdefault(ordinal, {})
+        totals = bucket.get(product_id)
+        if totals is None:
+            bucket[product_id] = [sale_value, quantity, 1, self.sales]
+        else:
+            totals[0] += sale_value
+            totals[1] += quantity
+            totals[2] += 1
+        self.sales += 1
+
+    def consume(self, lines: Iterable[str]) -> None:
+        """
+        Acumula todas as vendas válidas de um CSV (começando pelo cabeçalho), sem filtro
+        de datas e com a mesma validação de process_csv_rows.
+
+        Equivale a add() por linha, com o agregado diário de cada texto de data
+        convertido uma única vez.
+        """
+        add_totals = self.totals.add
+        buckets: Dict[str, Dict[int, List[Any]]] = {}
+        for row in self.rejects.dict_reader(lines):
+            self.rows_read += 1
+            try:
+                sale_date_str = row.get('data_venda', '').strip()
+                quantity_str = row.get('quantidade', '').strip()
+                price_str = row.get('preco_unitario', '').strip()
+                if not sale_date_str or not quantity_str or not price_str:
+                    continue
+                product = row.get('produto', 'Unknown').strip()
+                quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                sale_value = calculate_sales(quantity, unit_price)
+                bucket = buckets.get(sale_date_str)
+                if bucket is None:
+                    sale_date = parse_date_cached(sale_date_str, self.date_format)
+                    bucket = buckets[sale_date_str] = (
+                        self._daily.setdefault(sale_date.toordinal(), {}) if sale_date else self._undated)
+                product_id = add_totals(product, quantity, sale_value)
+                totals = bucket.get(product_id)
+                if totals is None:
+                    bucket[product_id] = [sale_value, quantity, 1, self.sales]
+                else:
+                    totals[0] += sale_value
+                    totals[1] += quantity
+                    totals[2] += 1
+                self.sales += 1
+            except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                self.rows_rejected += 1
+                self.rejects.reject(_err, row)
+
+    def build(self) -> None:
+        """Monta os arrays cumulativos esparsos por produto a partir dos agregados diários."""
+        self.days = sorted(self._daily)
+        product_count = len(self.products)
+        revenue: List[List[float]] = [[] for _ in range(product_count)]
+        quantity: List[List[int]] = [[] for _ in range(product_count)]
+        day_totals = array('d')
+        day_counts = array('q')
+        self._product_days = [array('i') for _ in range(product_count)]
+        self._first_sale = [array('q') for _ in range(product_count)]
+        for day in self.days:
+            day_total, day_count = 0.0, 0
+            for product_id, (day_revenue, day_quantity, day_sales, first_sale) in self._daily[day].items():
+                revenue[product_id].append(day_revenue)
+                quantity[product_id].append(day_quantity)
+                self._product_days[product_id].append(day)
+                self._first_sale[product_id].append(first_sale)
+                day_total += day_revenue
+                day_count += day_sales
+            day_totals.append(day_total)
+            day_counts.append(day_count)
+
+        self._cum_revenue = [array('d', accumulate(values, initial=0.0)) for values in revenue]
+        self._cum_quantity = [_prefix_sums(values) for values in quantity]
+        self._cum_total = array('d', accumulate(day_totals, initial=0.0))
+        self._cum_count = array('q', accumulate(day_counts, initial=0))
+
+    def _day_range(self, start_ordinal: Optional[int], end_ordinal: Optional[int]) -> Tuple[int, int]:
+        first = bisect_left(self.days, start_ordinal) if start_ordinal is not None else 0
+        last = bisect_left(self.days, end_ordinal) if end_ordinal is not None else len(self.days)
+        return first, max(first, last)
+
+    def _product_range(
+        self,
+        product_id: int,
+        start_ordinal: Optional[int],
+        end_ordinal: Optional[int]
+    ) -> Tuple[int, int]:
+        days = self._product_days[product_id]
+        first = bisect_left(days, start_ordinal) if start_ordinal is not None else 0
+        last = bisect_left(days, end_ordinal) if end_ordinal is not None else len(days)
+        return first, max(first, last)
+
+    def query(self, start_ordinal: Optional[int], end_ordinal: Optional[int]) -> RangeResult:
+        """
+        Calcula receita e quantidade por produto e a receita total no período
+        [start_ordinal, end_ordinal) a partir das somas de prefixo.
+
+        Os produtos seguem a ordem da primeira venda dentro do período, como na leitura
+        linha a linha (o que decide os empates do produto mais vendido).
+
+        Returns:
+            RangeResult: Receita por produto, quantidade por produto e receita total.
+        """
+        first_day, last_day = self._day_range(start_ordinal, end_ordinal)
+        products: List[Tuple[int, int, float, int]] = []
+        for product_id in range(len(self.products)):
+            first, last = self._product_range(product_id, start_ordinal, end_ordinal)
+            undated = self._undated.get(product_id)
+            if first == last and undated is None:
+                continue
+            revenue = self._cum_revenue[product_id][last] - self._cum_revenue[product_id][first]
+            quantity = self._cum_quantity[product_id][last] - self._cum_quantity[product_id][first]
+            first_sales = self._first_sale[product_id][first:last]
+            if undated is not None:
+                revenue += undated[0]
+                quantity += undated[1]
+                first_sales.append(undated[3])
+            products.append((min(first_sales), product_id, revenue, quantity))
+        products.sort()
+        revenue_dict: Dict[str, float] = {}
+        quantity_dict: Dict[str, int] = {}
+        for _, product_id, revenue, quantity in products:
+            revenue_dict[self.products[product_id]] = revenue
+            quantity_dict[self.products[product_id]] = quantity
+        total = self._cum_total[last_day] - self._cum_total[first_day]
+        total += sum(values[0] for values in self._undated.values())
+        return revenue_dict, quantity_dict, total
+
+    def sales_count(self, start_ordinal: Optional[int], end_ordinal: Optional[int]) -> int:
+        """Retorna a quantidade de vendas (linhas agregadas) no período [start_ordinal, end_ordinal)."""
+        first, last = self._day_range(start_ordinal, end_ordinal)
+        undated = sum(values[2] for values in self._undated.values())
+        return self._cum_count[last] - self._cum_count[first] + undated
+
+    def series(
+        self,
+        granularity: str,
+        start_ordinal: Optional[int] = None,
+        end_ordinal: Optional[int] = None,
+        top: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retorna a série temporal de vendas no período, agrupada por dia, semana ou mês.
+
+        Returns:
+            List[Dict[str, Any]]: Um item por período, com receita e quantidade (e, com
+            top, a receita e a quantidade dos top produtos do período), em ordem
+            cronológica.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(
+                f"Granularidade inválida: '{granularity}'. Escolha entre {list(GRANULARITIES)}")
+        first, last = self._day_range(start_ordinal, end_ordinal)
+        return period_series(
+            ((day, self._daily[day]) for day in self.days[first:last]), granularity, self.products, top)
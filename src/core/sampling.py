@@ -0,0 +1,201 @@
+import math
+import os
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.parallel import split_byte_ranges
+
+APPROX_BLOCK_SIZE = 1 << 20
+DEFAULT_APPROX_FRACTION = 0.01
+MIN_SAMPLED_BLOCKS = 8
+CONFIDENCE = 0.95
+CONFIDENCE_Z = 1.959964
+# Quantis 0.975 da t de Student com 1 a 30 graus de liberdade; acima disso, CONFIDENCE_Z.
+STUDENT_T_975 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+BEST_SELLER_COMPETITORS = 5
+
+Block = Tuple[str, bytes, int, int]
+
+
+def plan_blocks(file_paths: Iterable[str], block_size: int = APPROX_BLOCK_SIZE) -> Tuple[List[Block], int]:
+    """
+    Divide os arquivos em blocos de aproximadamente block_size bytes, alinhados a
+    quebras de linha, que formam a população da amostragem.
+
+    Returns:
+        Tuple[List[Block], int]: Os blocos (arquivo, cabeçalho, início, fim) e o total de
+        bytes dos blocos (os arquivos sem os cabeçalhos).
+    """
+    blocks: List[Block] = []
+    total_bytes = 0
+    for file_path in file_paths:
+        size = os.path.getsize(file_path)
+        header, ranges = split_byte_ranges(file_path, max(1, math.ceil(size / block_size)))
+        blocks.extend((file_path, header, start, end) for start, end in ranges)
+        total_bytes += sum(end - start for start, end in ranges)
+    return blocks, total_bytes
+
+
+def normal_cdf(value: float) -> float:
+    """Função de distribuição acumulada da normal padrão."""
+    return 0.5 * (1.0 + math.erf(value / math.sqrt(2.0)))
+
+
+class BlockSample:
+    """
+    Estimativas por amostragem aleatória simples (sem reposição) de blocos do arquivo.
+
+    Cada bloco amostrado contribui com seus totais (receita total e receita e quantidade
+    por produto). O total da população é estimado por N/n vezes a soma dos n blocos
+    amostrados entre os N blocos, com variância N² (1 - n/N) s²/n, em que s² é a
+    variância amostral dos totais dos blocos; os intervalos de confiança usam o quantil
+    da t de Student com n - 1 graus de liberdade. Com todos os blocos amostrados, as estimativas são exatas e os
+    intervalos têm largura zero. Produtos ausentes de todos os blocos amostrados não
+    aparecem nas estimativas.
+    """
+
+    def __init__(self, blocks_total: int):
+        self.blocks_total = blocks_total
+        self.blocks_sampled = 0
+        self.bytes_sampled = 0
+        self.total = [0.0, 0.0]
+        self.revenue: Dict[str, List[float]] = {}
+        self.quantity: Dict[str, List[float]] = {}
+        self.block_quantities: List[Dict[str, int]] = []
+
+    def add(self, revenue: Dict[str, float], quantity: Dict[str, int], total: float, size: int) -> None:
+        """Acrescenta os totais de um bloco amostrado de size bytes."""
+        self.blocks_sampled += 1
+        self.bytes_sampled += size
+        self.total[0] += total
+        self.total[1] += total * total
+        for stats, values in ((self.revenue, revenue), (self.quantity, quantity)):
+            for product, value in values.items():
+                sums = stats.get(product)
+                if sums is None:
+                    stats[product] = [value, value * value]
+                else:
+                    sums[0] += value
+                    sums[1] += value * value
+        self.block_quantities.append(dict(quantity))
+
+    @property
+    def scale(self) -> float:
+        """Fator de expansão N/n."""
+        return self.blocks_total / self.blocks_sampled if self.blocks_sampled else 0.0
+
+    def estimate(self, sums: List[float]) -> float:
+        """Estimativa do total da população a partir de [soma, soma dos quadrados]."""
+        return sums[0] * self.scale
+
+    def standard_error(self, sums: List[float]) -> float:
+        """Erro padrão da estimativa de sums (infinito com menos de 2 blocos amostrados)."""
+        sampled, total = self.blocks_sampled, self.blocks_total
+        if sampled >= total:
+            return 0.0
+        if sampled < 2:
+            return math.inf
+        mean = sums[0] / sampled
+        variance = max(0.0, (sums[1] - sampled * mean * mean) / (sampled - 1))
+        return total * math.sqrt((1 - sampled / total) * variance / sampled)
+
+    def margin(self, sums: List[float]) -> float:
+        """Meia largura do intervalo de confiança da estimativa de sums."""
+        degrees = self.blocks_sampled - 1
+        quantile = STUDENT_T_975[degrees - 1] if 1 <= degrees <= len(STUDENT_T_975) else CONFIDENCE_Z
+        return quantile * self.standard_error(sums)
+
+    def interval(self, sums: List[float]) -> Tuple[float, float]:
+        """Intervalo de confiança de CONFIDENCE da estimativa de sums."""
+        estimate, margin = self.estimate(sums), self.margin(sums)
+        return estimate - margin, estimate + margin
+
+    def best_seller_probability(self, best: str) -> float:
+        """
+        Probabilidade aproximada de que best seja de fato o produto mais vendido: para
+        cada um dos BEST_SELLER_COMPETITORS concorrentes mais próximos, a probabilidade
+        normal de que a diferença de quantidades seja positiva, dada a variância das
+        diferenças entre os blocos amostrados; o resultado é o produto dessas
+        probabilidades.
+        """
+        if best not in self.quantity:
+            return 0.0
+        competitors = sorted(
+            (product for product in self.quantity if product != best),
+            key=lambda product: self.quantity[product][0], reverse=True)[:BEST_SELLER_COMPETITORS]
+        probability = 1.0
+        for competitor in competitors:
+            sums = [0.0, 0.0]
+            for block in self.block_quantities:
+                difference = block.get(best, 0) - block.get(competitor, 0)
+                sums[0] += difference
+                sums[1] += difference * difference
+            difference, error = self.estimate(sums), self.standard_error(sums)
+            if error == 0.0:
+                probability *= 1.0 if difference > 0 else 0.0
+            elif error != math.inf:
+                probability *= normal_cdf(difference / error)
+            else:
+                probability *= 0.5
+        return probability
+
+    def summary(self, products: List[str], best: Optional[str], total_bytes: int) -> Dict[str, object]:
+        """
+        Retorna o resumo da amostragem para o relatório: blocos e fração lidos,
+        intervalos de confiança do total e da receita dos produtos listados e a
+        probabilidade de o produto mais vendido estar correto.
+        """
+        def bounds(sums: List[float]) -> List[float]:
+            low, high = self.interval(sums)
+            return [round(low, 2), round(high, 2)]
+
+        return {
+            "method": "block-sampling",
+            "confidence": CONFIDENCE,
+            "blocks_sampled": self.blocks_sampled,
+            "blocks_total": self.blocks_total,
+            "sampled_fraction": round(self.bytes_sampled / total_bytes, 4) if total_bytes else 1.0,
+            "total_global_revenue_interval": bounds(self.total),
+            "revenue_intervals": {
+                product: bounds(self.revenue[product]) for product in products if product in self.revenue},
+            "best_selling_probability": round(self.best_seller_probability(best), 4) if best else 0.0
+        }
+
+
+class BlockSampler:
+    """
+    Sorteia a ordem de leitura dos blocos (de block_size bytes) e decide quando parar:
+    ao atingir a fração de blocos pedida ou, com time_budget, ao esgotar o tempo (após
+    pelo menos MIN_SAMPLED_BLOCKS blocos, necessários para estimar a variância).
+    """
+
+    def __init__(
+        self,
+        fraction: Optional[float] = DEFAULT_APPROX_FRACTION,
+        time_budget: Optional[float] = None,
+        seed: Optional[int] = None,
+        block_size: int = APPROX_BLOCK_SIZE
+    ):
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError("A fração da amostra deve estar entre 0 (exclusivo) e 1.")
+        if time_budget is not None and not time_budget > 0:
+            raise ValueError("O tempo máximo da amostragem deve ser maior que 0.")
+        self.fraction = fraction
+        self.time_budget = time_budget
+        self.seed = seed
+        self.block_size = block_size
+
+    def order(self, blocks: List[Block]) -> List[Block]:
+        """Retorna os blocos a ler, em ordem aleatória, limitados pela fração."""
+        count = len(blocks)
+        if self.fraction is not None:
+            count = min(count, max(MIN_SAMPLED_BLOCKS, math.ceil(self.fraction * count)))
+        return random.Random(self.seed).sample(blocks, count)
+
+    def exhausted(self, elapsed: float, sampled: int) -> bool:
+        """Indica se o tempo da amostragem acabou."""
+        return self.time_budget is not None and sampled >= MIN_SAMPLED_BLOCKS and elapsed >= self.time_budget
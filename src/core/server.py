@@ -0,0 +1,392 @@
+import io
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from core.columns import SalesColumns
+from core.compression import file_compression, open_sales_file
+from core.csv_processor import CSVProcessor
+from core.incremental import AppendedLines, file_checksums
+from core.parallel import split_byte_ranges
+from reports.sales_report import REPORT_FORMATS, SalesReport
+from utils.helpers import ISO_DATE_FORMAT, datetime_treat
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+QUERY_CACHE_SIZE = 128
+CONTENT_TYPES = {
+    'text': 'text/plain; charset=utf-8',
+    'json': 'application/json; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class LoadedFile:
+    """
+    Colunas de um arquivo carregado em memória e o estado usado para detectar mudanças.
+
+    Attributes:
+        path (str): O caminho do arquivo CSV.
+        columns (SalesColumns): As vendas do arquivo em colunas.
+        size (int): O tamanho do arquivo no carregamento.
+        mtime_ns (int): O mtime do arquivo no carregamento.
+        header (Optional[str]): O cabeçalho do CSV (None em arquivos comprimidos).
+        offset (Optional[int]): O fim da última linha completa lida (None em arquivos
+            comprimidos, que são sempre recarregados por completo).
+        checksums (Dict[str, str]): Os checksums da parte já lida (file_checksums).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.columns = SalesColumns()
+        self.size = -1
+        self.mtime_ns = -1
+        self.header: Optional[str] = None
+        self.offset: Optional[int] = None
+        self.checksums: Dict[str, str] = {}
+
+
+class SalesStore:
+    """
+    Mantém as vendas de um ou mais arquivos CSV em memória, em colunas, e responde
+    consultas de relatório sem reler os arquivos.
+
+    A cada consulta, o tamanho e o mtime de cada arquivo são verificados: se o arquivo
+    apenas cresceu (o trecho já lido não mudou), somente as linhas acrescentadas são
+    lidas, como em --state-file; se foi truncado ou reescrito, é recarregado por
+    completo. Os resultados das consultas são guardados (até QUERY_CACHE_SIZE) até a
+    próxima mudança nos arquivos.
+
+    Recargas e agregações são feitas sob um único lock; a formatação dos relatórios e o
+    envio das respostas ficam fora dele, em paralelo entre os clientes.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[str],
+        date_format: str = "%Y-%m-%d",
+        cache_size: int = QUERY_CACHE_SIZE
+    ):
+        if not file_paths:
+            raise ValueError("O caminho do arquivo não pode ser vazio.")
+        self.date_format = date_format
+        self.cache_size = cache_size
+        self.files: List[LoadedFile] = [LoadedFile(path) for path in file_paths]
+        self.version = 0
+        self._results: 'OrderedDict[Tuple[Any, ...], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, loaded: LoadedFile) -> LoadedFile:
+        """
+        Lê o arquivo inteiro em colunas.
+
+        Returns:
+            LoadedFile: O novo estado do arquivo.
+        """
+        stat = os.stat(loaded.path)
+        reloaded = LoadedFile(loaded.path)
+        reloaded.size, reloaded.mtime_ns = stat.st_size, stat.st_mtime_ns
+        if file_compression(loaded.path):
+            with open_sales_file(loaded.path) as csv_file:
+                reloaded.columns.extend_from_lines(csv_file, self.date_format)
+            return reloaded
+
+        header, _ = split_byte_ranges(loaded.path, 1)
+        appended = AppendedLines(loaded.path, len(header))
+        reloaded.header = header.decode('utf-8')
+        reloaded.columns.extend_from_lines(chain([reloaded.header], appended), self.date_format)
+        reloaded.offset = appended.offset
+        reloaded.checksums = file_checksums(loaded.path, appended.offset)
+        return reloaded
+
+    def extend(self, loaded: LoadedFile) -> LoadedFile:
+        """
+        Lê apenas as linhas acrescentadas ao arquivo desde offset, sobre uma cópia das
+        colunas (as colunas em uso não são alteradas).
+
+        Returns:
+            LoadedFile: O novo estado do arquivo.
+        """
+        stat = os.stat(loaded.path)
+        extended = LoadedFile(loaded.path)
+        extended.size, extended.mtime_ns = stat.st_size, stat.st_mtime_ns
+        extended.header = loaded.header
+        extended.columns = loaded.columns.copy()
+        appended = AppendedLines(loaded.path, loaded.offset)
+        extended.columns.extend_from_lines(chain([loaded.header], appended), self.date_format)
+        extended.offset = appended.offset
+        extended.checksums = file_checksums(loaded.path, appended.offset)
+        logging.info("Read %d new byte(s) from '%s'.", appended.offset - loaded.offset, loaded.path)
+        return extended
+
+    def refresh(self) -> bool:
+        """
+        Recarrega os arquivos que mudaram desde o último carregamento.
+
+        Returns:
+            bool: True se algum arquivo foi recarregado.
+        """
+        changed = False
+        for position, loaded in enumerate(self.files):
+            try:
+                stat = os.stat(loaded.path)
+                if (stat.st_size, stat.st_mtime_ns) == (loaded.size, loaded.mtime_ns):
+                    continue
+                if loaded.offset is not None and stat.st_size >= loaded.offset \
+                        and file_checksums(loaded.path, loaded.offset) == loaded.checksums:
+                    self.files[position] = self.extend(loaded)
+                else:
+                    if loaded.size >= 0:
+                        logging.info("File '%s' was rewritten; reloading it.", loaded.path)
+                    self.files[position] = self.load(loaded)
+            except OSError as _err:
+                if loaded.size < 0:
+                    raise
+                logging.warning(
+                    "Could not reload '%s' (%s); serving the last loaded data.", loaded.path, _err)
+                continue
+            changed = True
+        if changed:
+            self.version += 1
+            self._results.clear()
+        return changed
+
+    def query(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        top: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Agrega as vendas carregadas no filtro de datas, recarregando antes os arquivos
+        que mudaram.
+
+        Args:
+            start_date (Optional[str]): Data de início do filtro (YYYY-MM-DD).
+            end_date (Optional[str]): Data de fim do filtro (YYYY-MM-DD), inclusiva.
+            top (Optional[int]): Quantidade de produtos de maior receita no relatório.
+
+        Returns:
+            Dict[str, Any]: Os resultados no formato de CSVProcessor.aggregate_results().
+        """
+        key = (start_date, end_date, top)
+        with self._lock:
+            self.refresh()
+            results = self._results.get(key)
+            if results is None:
+                results = self.aggregate(start_date, end_date, top)
+                self._results[key] = results
+                if len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+        return dict(results, report_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    def aggregate(
+        self,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        top: Optional[int]
+    ) -> Dict[str, Any]:
+        """Agrega as colunas de todos os arquivos, como process_cached_columns."""
+        processor = CSVProcessor("", start_date, end_date)
+        processor.set_date_format(self.date_format)
+        processor.set_top(top)
+        filter_start_date, filter_end_date = datetime_treat(start_date, end_date)
+        for loaded in self.files:
+            columns = loaded.columns
+            processor.total_global_revenue += columns.aggregate(
+                filter_start_date,
+                filter_end_date,
+                processor.revenue_per_product,
+                processor.quantity_per_product
+            )
+            processor.rows_read += columns.rows_read
+            processor.rows_rejected += columns.rows_rejected
+            processor.rows_accepted += columns.rows_accepted
+            processor.rejects.merge(columns.reject_counts)
+            processor.file_stats.append({
+                "file": loaded.path,
+                "rows": columns.rows_read,
+                "errors": columns.rows_rejected,
+            })
+        return processor.aggregate_results()
+
+    def status(self) -> Dict[str, Any]:
+        """Retorna a versão dos dados e, para cada arquivo, o tamanho e as linhas carregadas."""
+        with self._lock:
+            return {
+                "version": self.version,
+                "files": [
+                    {
+                        "file": loaded.path,
+                        "size": loaded.size,
+                        "rows": loaded.columns.rows_read,
+                        "sales": len(loaded.columns),
+                    }
+                    for loaded in self.files
+                ],
+            }
+
+
+def parse_report_query(query: str) -> Tuple[Optional[str], Optional[str], Optional[int], str]:
+    """
+    Lê os parâmetros de uma consulta de relatório, com os nomes das opções do CLI:
+    data_inicio, data_fim, top e format.
+
+    Returns:
+        Tuple[Optional[str], Optional[str], Optional[int], str]: Datas de início e fim,
+        top e formato do relatório.
+
+    Raises:
+        ValueError: Se algum parâmetro for inválido.
+    """
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    start_date, end_date = params.get('data_inicio'), params.get('data_fim')
+    for date_str in (start_date, end_date):
+        if date_str:
+            try:
+                datetime.strptime(date_str, ISO_DATE_FORMAT)
+            except ValueError:
+                raise ValueError(f"Data inválida: '{date_str}'. Use o formato YYYY-MM-DD.") from None
+    top = None
+    if params.get('top'):
+        try:
+            top = int(params['top'])
+        except ValueError:
+            top = 0
+        if top < 1:
+            raise ValueError("O top deve ser um inteiro maior ou igual a 1.")
+    report_format = params.get('format', 'json')
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(
+            f"Formato de relatório inválido: '{report_format}'. Escolha entre {REPORT_FORMATS}")
+    return start_date, end_date, top, report_format
+
+
+class SalesRequestHandler(BaseHTTPRequestHandler):
+    """
+    Responde GET /report (relatório de vendas, como o CLI) e GET /status (arquivos
+    carregados) com os dados de server.store.
+    """
+
+    server_version = "vendas-cli"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == '/status':
+            self.send_body(200, CONTENT_TYPES['json'], json.dumps(self.server.store.status()))
+            return
+        if url.path != '/report':
+            self.send_error_json(404, f"Caminho desconhecido: '{url.path}'.")
+            return
+        try:
+            start_date, end_date, top, report_format = parse_report_query(url.query)
+        except ValueError as _err:
+            self.send_error_json(400, str(_err))
+            return
+
+        results = self.server.store.query(start_date, end_date, top)
+        body = io.StringIO()
+        report = SalesReport()
+        report.set_output(body)
+        report.generate(data=results, report_format=report_format)
+        self.send_body(200, CONTENT_TYPES[report_format], body.getvalue())
+
+    def send_error_json(self, status: int, message: str) -> None:
+        """Responde com o erro em JSON ({"error": mensagem})."""
+        self.send_body(status, CONTENT_TYPES['json'], json.dumps({"error": message}, ensure_ascii=False))
+
+    def send_body(self, status: int, content_type: str, body: str) -> None:
+        """Envia a resposta completa, com Content-Type e Content-Length."""
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Em sockets Unix, client_address é uma string vazia.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.info("%s - %s", self.address_string(), format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """Servidor HTTP sobre um socket Unix, com uma thread por conexão."""
+
+    daemon_threads = True
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """
+    Remove o socket Unix que tenha sobrado em socket_path. Qualquer outro tipo de arquivo
+    no caminho é preservado e resulta em erro.
+
+    Raises:
+        FileExistsError: Se o caminho existir e não for um socket.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"'{socket_path}' already exists and is not a socket.")
+    os.unlink(socket_path)
+
+
+def make_server(
+    store: SalesStore,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None
+) -> socketserver.BaseServer:
+    """
+    Cria o servidor HTTP das consultas, em host:port ou no socket Unix socket_path.
+
+    Um socket Unix que tenha sobrado de uma execução anterior é removido antes; se o
+    caminho for outro tipo de arquivo, lança FileExistsError.
+    """
+    if socket_path:
+        remove_stale_socket(socket_path)
+        server = UnixHTTPServer(socket_path, SalesRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), SalesRequestHandler)
+    server.store = store
+    return server
+
+
+def serve(
+    store: SalesStore,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None
+) -> None:
+    """
+    Carrega os arquivos e atende consultas até ser interrompido (Ctrl+C).
+    """
+    store.refresh()
+    server = make_server(store, host, port, socket_path)
+    address = socket_path or "http://%s:%d" % server.server_address[:2]
+    rows = sum(loaded.columns.rows_read for loaded in store.files)
+    logging.info("Serving %d row(s) from %d file(s) on %s.", rows, len(store.files), address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down.")
+    finally:
+        server.server_close()
+        if socket_path:
+            remove_stale_socket(socket_path)
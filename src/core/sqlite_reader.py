@@ -0,0 +1,379 @@
+import json
+import logging
+import sqlite3
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.cache import file_fingerprint
+from core.columns import UNPARSED_DATE, in_range
+from core.compression import open_sales_file
+from core.csv_processor import STDIN_PATH, CSVProcessor
+from core.metrics import NULL_METRICS, Metrics
+from core.rejects import RejectedRows, TooManyRejectedRows, error_category
+from interfaces.reader_interface import Reader
+from utils.helpers import convert_sale_values, datetime_treat, expand_paths, parse_date_cached
+
+DEFAULT_DATABASE = "vendas.db"
+BATCH_SIZE = 10_000
+SQLITE_MAX_INTEGER = (1 << 63) - 1
+# Entra na impressão digital: bancos carregados com outro esquema são recarregados.
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    id INTEGER PRIMARY KEY,
+    caminho TEXT NOT NULL UNIQUE,
+    impressao_digital TEXT NOT NULL,
+    linhas INTEGER NOT NULL,
+    erros INTEGER NOT NULL,
+    erros_por_categoria TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS produtos (
+    id INTEGER PRIMARY KEY,
+    produto TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS vendas (
+    arquivo_id INTEGER NOT NULL,
+    produto_id INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL,
+    preco_unitario REAL NOT NULL,
+    data_venda INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rejeitadas (
+    arquivo_id INTEGER NOT NULL,
+    categoria TEXT NOT NULL,
+    data_venda INTEGER NOT NULL
+);
+"""
+
+# Criados após a carga (inserir com os índices já existentes é mais lento). Os dois
+# índices cobrem as colunas da agregação, para que as consultas não precisem ler a
+# tabela: o de data_venda atende os filtros de período e o de produto_id percorre as
+# vendas já agrupadas por produto quando não há filtro.
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS vendas_data_venda "
+    "ON vendas (data_venda, arquivo_id, produto_id, quantidade, preco_unitario)",
+    "CREATE INDEX IF NOT EXISTS vendas_produto "
+    "ON vendas (produto_id, arquivo_id, data_venda, quantidade, preco_unitario)",
+)
+
+
+class SQLiteReader(Reader):
+    """
+    Leitor que carrega os arquivos CSV de vendas em um banco SQLite local e responde o
+    relatório com consultas GROUP BY indexadas.
+
+    Cada arquivo é carregado uma única vez (em lotes de executemany, em uma transação) e
+    recarregado apenas quando muda (mesma impressão digital do cache colunar). As datas
+    são guardadas como ordinais (0 para datas que não puderam ser convertidas, que nunca
+    são filtradas), de modo que o filtro de datas é uma busca no índice de data_venda.
+    As linhas seguem as mesmas regras de process_csv_rows; como as somas são feitas pelo
+    SQLite em outra ordem, as receitas podem diferir das do CSV na última casa binária.
+
+    A carga valida todas as linhas, mas as rejeitadas são guardadas com a data (quando
+    convertida) e a categoria do erro, e cada consulta conta apenas as rejeitadas dentro
+    do filtro de datas, como o leitor de CSV, que verifica a data antes dos valores.
+    """
+
+    def __init__(
+        self,
+        database: str = DEFAULT_DATABASE,
+        file_path: str = "",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ):
+        self.database = database
+        self._data_paths: List[str] = [file_path] if file_path else []
+        self.start_date: Optional[str] = start_date
+        self.end_date: Optional[str] = end_date
+        self.date_format = "%Y-%m-%d"
+        self.top: Optional[int] = None
+        self.rows_read: int = 0
+        self.rejects = RejectedRows()
+        self.metrics: Metrics = NULL_METRICS
+
+    def set_database(self, database: str) -> None:
+        """Define o arquivo do banco SQLite."""
+        if not database:
+            raise ValueError("O caminho do banco de dados não pode ser vazio.")
+        self.database = database
+
+    def set_file_path(self, file_path: str) -> None:
+        """Define o arquivo CSV a ser carregado e consultado."""
+        if not isinstance(file_path, str) or not file_path:
+            raise ValueError("O caminho do arquivo não pode ser vazio.")
+        self._data_paths = [file_path]
+
+    def set_file_paths(self, file_paths: List[str]) -> None:
+        """Define vários arquivos CSV (aceita padrões glob) consultados em conjunto."""
+        if not file_paths:
+            raise ValueError("O caminho do arquivo não pode ser vazio.")
+        self._data_paths = expand_paths(file_paths)
+
+    def set_date_filters(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> None:
+        """Define as datas de início e fim para filtragem dos dados."""
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def set_date_format(self, date_format: str) -> None:
+        """Define o formato de data esperado nos arquivos CSV."""
+        self.date_format = date_format
+
+    def set_top(self, top: Optional[int]) -> None:
+        """Define quantos produtos de maior receita incluir no relatório (None para todos)."""
+        if top is not None and (not isinstance(top, int) or top < 1):
+            raise ValueError("O top deve ser um inteiro maior ou igual a 1.")
+        self.top = top
+
+    def set_max_errors(self, max_errors: Optional[int]) -> None:
+        """Define a quantidade máxima de linhas com erro de formatação na carga."""
+        if max_errors is not None and (not isinstance(max_errors, int) or max_errors < 0):
+            raise ValueError("O limite de erros deve ser um inteiro maior ou igual a 0.")
+        self.rejects.max_errors = max_errors
+
+    def set_quarantine_file(self, quarantine_file: Optional[str]) -> None:
+        """Define o arquivo em que as linhas rejeitadas na carga são gravadas (None desativa)."""
+        self.rejects.quarantine_file = quarantine_file or None
+
+    def set_metrics(self, metrics: Optional[Metrics]) -> None:
+        """Define onde registrar o tempo de cada etapa (None desativa)."""
+        self.metrics = metrics or NULL_METRICS
+
+    def process_data(self) -> Dict[str, Any]:
+        """
+        Carrega os arquivos novos ou alterados no banco e agrega as vendas no filtro de
+        datas com consultas ao banco.
+
+        Returns:
+            Dict[str, Any]: Os resultados no formato de CSVProcessor.aggregate_results().
+        """
+        if STDIN_PATH in self._data_paths:
+            logging.error("Error: Standard input ('-') cannot be loaded into the database.")
+            sys.exit(1)
+        connection = sqlite3.connect(self.database)
+        try:
+            with self.metrics.stage('scan'):
+                connection.executescript(SCHEMA)
+                with self.metrics.stage('read'):
+                    file_ids = [self.ingest(connection, path) for path in self._data_paths]
+                with self.metrics.stage('aggregate'):
+                    processor = self.query(connection, file_ids)
+            self.rows_read = processor.rows_read
+            with self.metrics.stage('results'):
+                return processor.aggregate_results()
+        except FileNotFoundError as _err:
+            logging.error("Error: The file '%s' was not found.", _err.filename)
+            sys.exit(1)
+        except ValueError as _err:
+            logging.error("Error: Date format is incorrect or missing column. %s", _err)
+            sys.exit(1)
+        except TooManyRejectedRows as _err:
+            logging.error("Error: Too many rows with formatting errors. %s", _err)
+            sys.exit(1)
+        except sqlite3.Error as _err:
+            logging.error("Error: Could not use database '%s': %s", self.database, _err)
+            sys.exit(1)
+        finally:
+            connection.close()
+            self.rejects.close()
+
+    def ingest(self, connection: sqlite3.Connection, file_path: str) -> int:
+        """
+        Carrega um arquivo CSV no banco, se ele ainda não estiver carregado com a mesma
+        impressão digital e o mesmo formato de data; um arquivo alterado tem as vendas
+        anteriores substituídas. Tudo é feito em uma única transação.
+
+        Returns:
+            int: O id do arquivo na tabela arquivos.
+        """
+        metadata = dict(file_fingerprint(file_path), date_format=self.date_format, schema=SCHEMA_VERSION)
+        caminho, fingerprint = metadata["path"], json.dumps(metadata, sort_keys=True)
+        row = connection.execute(
+            "SELECT id, impressao_digital FROM arquivos WHERE caminho = ?",
+            (caminho,)).fetchone()
+        if row is not None and row[1] == fingerprint:
+            self.rejects.merge(self.count_rejects(connection, [row[0]]))
+            return row[0]
+
+        logging.info("Loading '%s' into '%s'.", file_path, self.database)
+        with connection:
+            if row is None:
+                file_id = connection.execute(
+                    "INSERT INTO arquivos (caminho, impressao_digital, linhas, erros, erros_por_categoria) "
+                    "VALUES (?, '', 0, 0, '{}')", (caminho,)).lastrowid
+            else:
+                file_id = row[0]
+                connection.execute("DELETE FROM vendas WHERE arquivo_id = ?", (file_id,))
+                connection.execute("DELETE FROM rejeitadas WHERE arquivo_id = ?", (file_id,))
+            products = dict(connection.execute("SELECT produto, id FROM produtos"))
+            counts = [0, 0]
+            rejected: List[Tuple[int, str, int]] = []
+            with open_sales_file(file_path) as csv_file:
+                sales = self.parse_sales(csv_file, file_id, products, counts, rejected)
+                for batch in iter_batches(sales, BATCH_SIZE):
+                    connection.executemany("INSERT INTO vendas VALUES (?, ?, ?, ?, ?)", batch)
+            connection.executemany("INSERT INTO rejeitadas VALUES (?, ?, ?)", rejected)
+            connection.executemany(
+                "INSERT OR IGNORE INTO produtos (id, produto) VALUES (?, ?)",
+                [(product_id, product) for product, product_id in products.items()])
+            # Totais do arquivo inteiro; os relatórios contam as rejeitadas do filtro.
+            reject_counts: Dict[str, int] = {}
+            for _, category, _ in rejected:
+                reject_counts[category] = reject_counts.get(category, 0) + 1
+            connection.execute(
+                "UPDATE arquivos SET impressao_digital = ?, linhas = ?, erros = ?, erros_por_categoria = ? "
+                "WHERE id = ?",
+                (fingerprint, counts[0], counts[1], json.dumps(reject_counts), file_id))
+            for statement in INDEXES:
+                connection.execute(statement)
+            connection.execute("ANALYZE")
+        return file_id
+
+    def parse_sales(
+        self,
+        lines: Iterable[str],
+        file_id: int,
+        products: Dict[str, int],
+        counts: List[int],
+        rejected: List[Tuple[int, str, int]]
+    ) -> Iterator[Tuple[int, int, int, float, int]]:
+        """
+        Converte as linhas de um CSV (começando pelo cabeçalho) nas linhas da tabela
+        vendas, com as mesmas regras de process_csv_rows e sem filtro de datas.
+
+        Novos produtos recebem ids em products; counts acumula [linhas lidas, linhas
+        rejeitadas] e rejected, as linhas da tabela rejeitadas. Apenas as linhas
+        rejeitadas dentro do filtro de datas vão para rejects.
+        """
+        start, end = self._date_range()
+        for row in self.rejects.dict_reader(lines):
+            counts[0] += 1
+            ordinal = UNPARSED_DATE
+            try:
+                sale_date_str = row.get('data_venda', '').strip()
+                quantity_str = row.get('quantidade', '').strip()
+                price_str = row.get('preco_unitario', '').strip()
+                if not sale_date_str or not quantity_str or not price_str:
+                    continue
+                sale_date = parse_date_cached(sale_date_str, self.date_format)
+                ordinal = sale_date.toordinal() if sale_date else UNPARSED_DATE
+                quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                if abs(quantity) > SQLITE_MAX_INTEGER:
+                    raise OverflowError("quantity out of range")
+                product = row.get('produto', 'Unknown').strip()
+            except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                counts[1] += 1
+                category = error_category(_err)
+                rejected.append((file_id, category, ordinal))
+                if in_range(ordinal, start, end):
+                    self.rejects.reject(_err, row, category)
+                continue
+            product_id = products.get(product)
+            if product_id is None:
+                product_id = products[product] = len(products) + 1
+            yield (file_id, product_id, quantity, unit_price, ordinal)
+
+    def _date_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """Retorna o filtro de datas como ordinais [início, fim), None sem limite."""
+        filter_start_date, filter_end_date = datetime_treat(self.start_date, self.end_date)
+        return (
+            filter_start_date.toordinal() if filter_start_date else None,
+            filter_end_date.toordinal() if filter_end_date else None
+        )
+
+    def _date_where(self, alias: str) -> Tuple[List[str], List[int]]:
+        """Retorna as condições (e os parâmetros) do filtro de datas sobre alias.data_venda."""
+        start, end = self._date_range()
+        where: List[str] = []
+        params: List[int] = []
+        if start is not None:
+            # Datas não convertidas (ordinal 0) nunca são filtradas.
+            where.append(f"({alias}.data_venda >= ? OR {alias}.data_venda = ?)")
+            params.extend([start, UNPARSED_DATE])
+        if end is not None:
+            where.append(f"{alias}.data_venda < ?")
+            params.append(end)
+        return where, params
+
+    def count_rejects(
+        self,
+        connection: sqlite3.Connection,
+        file_ids: List[int],
+        by_file: bool = False
+    ) -> Dict[Any, int]:
+        """
+        Conta as linhas rejeitadas dos arquivos dentro do filtro de datas, por categoria
+        de erro (ou, com by_file, por id de arquivo).
+        """
+        where, params = self._date_where("r")
+        where.insert(0, f"r.arquivo_id IN ({', '.join('?' * len(file_ids))})")
+        key = "r.arquivo_id" if by_file else "r.categoria"
+        return dict(connection.execute(
+            f"SELECT {key}, COUNT(*) FROM rejeitadas r WHERE {' AND '.join(where)} GROUP BY {key}",
+            list(file_ids) + params))
+
+    def query(self, connection: sqlite3.Connection, file_ids: List[int]) -> CSVProcessor:
+        """
+        Agrega receita, quantidade e vendas por produto no filtro de datas com uma
+        consulta GROUP BY e preenche um CSVProcessor com os totais, para que o relatório
+        tenha o mesmo formato do leitor de CSV.
+        """
+        processor = CSVProcessor("", self.start_date, self.end_date)
+        processor.set_top(self.top)
+        processor.rejects = self.rejects
+
+        placeholders = ", ".join("?" * len(file_ids))
+        where, params = self._date_where("v")
+        where.insert(0, f"v.arquivo_id IN ({placeholders})")
+        params = list(file_ids) + params
+        # Os totais são agrupados também por arquivo: o rowid segue a ordem das linhas de
+        # cada arquivo, mas um arquivo recarregado volta ao fim da tabela, então a primeira
+        # venda de cada produto no filtro é a menor (posição do arquivo, rowid).
+        positions = {file_id: position for position, file_id in reversed(list(enumerate(file_ids)))}
+        rows = connection.execute(
+            "SELECT p.produto, v.arquivo_id, MIN(v.rowid), SUM(v.quantidade * v.preco_unitario), "
+            "SUM(v.quantidade), COUNT(*) "
+            "FROM vendas v JOIN produtos p ON p.id = v.produto_id "
+            f"WHERE {' AND '.join(where)} GROUP BY v.produto_id, v.arquivo_id",
+            params)
+        totals: Dict[str, List[Any]] = {}
+        for product, file_id, first_row, revenue, quantity, sales in rows:
+            first_sale = (positions[file_id], first_row)
+            product_totals = totals.get(product)
+            if product_totals is None:
+                totals[product] = [first_sale, revenue, quantity]
+            else:
+                product_totals[0] = min(product_totals[0], first_sale)
+                product_totals[1] += revenue
+                product_totals[2] += quantity
+            processor.total_global_revenue += revenue
+            processor.rows_accepted += sales
+        for product, (_, revenue, quantity) in sorted(totals.items(), key=lambda item: item[1][0]):
+            processor.revenue_per_product[product] = revenue
+            processor.quantity_per_product[product] = quantity
+
+        files = dict(connection.execute(
+            f"SELECT id, linhas FROM arquivos WHERE id IN ({placeholders})", file_ids))
+        rejected = self.count_rejects(connection, file_ids, by_file=True)
+        for file_path, file_id in zip(self._data_paths, file_ids):
+            linhas, erros = files[file_id], rejected.get(file_id, 0)
+            processor.rows_read += linhas
+            processor.rows_rejected += erros
+            processor.file_stats.append({"file": file_path, "rows": linhas, "errors": erros})
+        return processor
+
+
+def iter_batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Agrupa os itens em listas de até size elementos."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
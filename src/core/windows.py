@@ -0,0 +1,141 @@
+import argparse
+import csv
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.counters import ProductCounters
+from core.rejects import RejectedRows
+from utils.helpers import calculate_sales, convert_sale_values, datetime_treat, make_date_filter
+
+DateWindow = Tuple[str, Optional[str], Optional[str]]
+
+
+def parse_window_spec(spec: str) -> DateWindow:
+    """
+    Converte uma janela no formato 'nome=AAAA-MM-DD:AAAA-MM-DD' em (nome, início, fim).
+
+    Qualquer uma das datas pode ser omitida (ex.: 'ate_marco=:2025-03-31').
+
+    Raises:
+        argparse.ArgumentTypeError: Se o formato for inválido (mensagem mostrada pelo
+            argparse em --window).
+    """
+    name, sep, period = spec.partition('=')
+    start, colon, end = period.partition(':')
+    if not sep or not colon or not name.strip():
+        raise argparse.ArgumentTypeError(
+            f"Janela inválida: '{spec}'. Use o formato nome=AAAA-MM-DD:AAAA-MM-DD.")
+    return name.strip(), start.strip() or None, end.strip() or None
+
+
+def load_windows_file(file_path: str) -> List[DateWindow]:
+    """
+    Lê janelas de datas nomeadas de um arquivo JSON ou CSV.
+
+    O JSON pode ser uma lista de objetos {"name", "start", "end"} ou um objeto
+    {nome: {"start", "end"}}. O CSV deve ter as colunas name, start e end.
+
+    Args:
+        file_path (str): O caminho do arquivo de janelas.
+
+    Returns:
+        List[DateWindow]: As janelas, na ordem do arquivo.
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8') as windows_file:
+        if file_path.lower().endswith('.json'):
+            import json
+            data = json.load(windows_file)
+            items = data.values() if isinstance(data, dict) else data
+            names = list(data.keys()) if isinstance(data, dict) else [item.get('name') for item in data]
+            return [
+                (str(name), item.get('start') or None, item.get('end') or None)
+                for name, item in zip(names, items)
+            ]
+        return [
+            (row['name'], row.get('start') or None, row.get('end') or None)
+            for row in csv.DictReader(windows_file)
+        ]
+
+
+class WindowAggregator:
+    """
+    Agrega várias janelas de datas em uma única leitura das linhas.
+
+    Cada janela acumula em seu próprio processador (receita, quantidade e total), com a
+    mesma semântica de uma execução separada com --data_inicio/--data_fim. As janelas que
+    contêm cada data distinta são calculadas uma única vez, de modo que o custo de uma
+    linha não depende da quantidade de janelas que não a contêm.
+
+    Receita e quantidade de cada janela são acumuladas em ProductCounters; uma linha cuja
+    soma não caiba nos contadores de alguma das suas janelas é rejeitada em todas.
+    """
+
+    def __init__(
+        self,
+        processors: Sequence,
+        date_format: str = "%Y-%m-%d",
+        rejects: Optional[RejectedRows] = None
+    ):
+        self.processors = list(processors)
+        self.filters: List[Optional[Callable[[str], bool]]] = [
+            make_date_filter(*datetime_treat(processor.start_date, processor.end_date), date_format)
+            for processor in self.processors
+        ]
+        self.counters = [ProductCounters.from_dicts(
+            processor.revenue_per_product, processor.quantity_per_product) for processor in self.processors]
+        self._memberships: Dict[str, Tuple[int, ...]] = {}
+        self.rejects = rejects or RejectedRows()
+        self.rows_read = 0
+        self.rows_accepted = 0
+        self.rows_rejected = 0
+
+    def _windows_for(self, sale_date_str: str) -> Tuple[int, ...]:
+        targets = self._memberships.get(sale_date_str)
+        if targets is None:
+            targets = tuple(
+                idx for idx, in_window in enumerate(self.filters)
+                if in_window is None or in_window(sale_date_str))
+            self._memberships[sale_date_str] = targets
+        return targets
+
+    def consume(self, lines: Iterable[str]) -> None:
+        """
+        Agrega as linhas de um CSV (começando pelo cabeçalho) em todas as janelas.
+        """
+        try:
+            self._consume_rows(self.rejects.dict_reader(lines))
+        finally:
+            for processor, counters in zip(self.processors, self.counters):
+                processor.revenue_per_product, processor.quantity_per_product = counters.to_dicts()
+
+    def _consume_rows(self, reader: Iterable[Dict[str, str]]) -> None:
+        counters = self.counters
+        for row in reader:
+            self.rows_read += 1
+            try:
+                sale_date_str = row.get('data_venda', '').strip()
+                if not sale_date_str:
+                    continue
+                targets = self._windows_for(sale_date_str)
+                if not targets:
+                    continue
+
+                quantity_str = row.get('quantidade', '').strip()
+                price_str = row.get('preco_unitario', '').strip()
+                if not quantity_str or not price_str:
+                    continue
+                product = row.get('produto', 'Unknown').strip()
+
+                quantity, unit_price = convert_sale_values(quantity_str, price_str)
+                row_sale_value = calculate_sales(quantity, unit_price)
+                for idx in targets:
+                    counters[idx].check(product, quantity, row_sale_value)
+            except (ValueError, KeyError, AttributeError, OverflowError) as _err:
+                self.rows_rejected += 1
+                self.rejects.reject(_err, row)
+                continue
+            self.rows_accepted += 1
+            for idx in targets:
+                counters[idx].add(product, quantity, row_sale_value)
+                processor = self.processors[idx]
+                processor.rows_accepted += 1
+                processor.total_global_revenue += row_sale_value
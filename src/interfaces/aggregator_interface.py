@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from core.batches import SalesBatch
+
+class Aggregator(ABC):
+    """
+    Interface (Classe Base Abstrata) para agregadores de lotes de vendas.
+
+    Um agregador consome os lotes (SalesBatch) entregues por um BatchReader e mantém o
+    próprio estado; results() pode ser chamado a qualquer momento, inclusive durante a
+    leitura, para obter os resultados parciais.
+    """
+    @abstractmethod
+    def consume(self, batch: 'SalesBatch') -> None:
+        """
+        Acumula as vendas de um lote.
+        """
+
+    @abstractmethod
+    def results(self) -> Dict[str, Any]:
+        """
+        Retorna os campos do relatório (no formato de process_data) com o estado atual.
+        """
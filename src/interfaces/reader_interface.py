@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    from core.batches import SalesBatch
+    from interfaces.aggregator_interface import Aggregator
+
+class UnsupportedOptions(ValueError):
+    """Indica uma combinação de opções (ou de entradas) que o leitor não consegue processar."""
+
 
 class Reader(ABC):
     """
@@ -22,3 +30,24 @@ class Reader(ABC):
         end_date: Optional[str] = None
     ) -> None:
         """Define os filtros de data para o processamento."""
+
+
+class BatchReader(Reader):
+    """
+    Interface para leitores que, além do resultado final de process_data(), entregam as
+    vendas válidas em lotes de colunas tipadas, consumidos por agregadores
+    (interfaces.aggregator_interface.Aggregator).
+    """
+    @abstractmethod
+    def iter_batches(self) -> Iterator['SalesBatch']:
+        """
+        Lê os dados e retorna os lotes de vendas dentro do filtro de datas, na ordem dos
+        dados.
+        """
+
+    @abstractmethod
+    def make_aggregator(self) -> 'Aggregator':
+        """
+        Retorna o agregador que produz, a partir dos lotes, o mesmo resultado de
+        process_data() para as opções do leitor.
+        """
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Optional
+
+if TYPE_CHECKING:
+    from core.batches import SalesBatch
+    from interfaces.aggregator_interface import Aggregator
 
 class Report(ABC):
     """
@@ -20,5 +24,32 @@ class Report(ABC):
     @abstractmethod
     def set_report_format(self, report_format: str) -> None:
         """
-        Define o formato de saída desejado ('text' ou 'json').
+        Define o formato de saída desejado ('text', 'json', 'ndjson' ou 'csv').
+        """
+
+    def set_output(self, output: Optional[str]) -> None:
+        """
+        Define o arquivo em que o relatório será escrito (None para a saída padrão).
+        Implementações que escrevem em arquivo podem sobrescrever este método.
+        """
+        self.output = output or None
+
+    def render(self, aggregator: 'Aggregator', report_format: str) -> Dict[str, Any]:
+        """
+        Gera o relatório a partir do estado de um agregador.
+        """
+        return self.generate(aggregator.results(), report_format)
+
+    def stream(
+        self,
+        batches: Iterable['SalesBatch'],
+        aggregator: 'Aggregator',
+        report_format: str
+    ) -> Dict[str, Any]:
+        """
+        Consome os lotes no agregador e gera o relatório do estado final. Implementações
+        podem escrever resultados parciais durante a leitura.
         """
+        for batch in batches:
+            aggregator.consume(batch)
+        return self.render(aggregator, report_format)
@@ -1,7 +1,31 @@
-import json
+from contextlib import contextmanager
+import io
 import logging
-from typing import Any, Dict, Optional
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 from interfaces.report_interface import Report
+from utils.helpers import cents_to_reais
+
+if TYPE_CHECKING:
+    from core.batches import SalesBatch
+    from interfaces.aggregator_interface import Aggregator
+
+REPORT_FORMATS = ['text', 'json', 'ndjson', 'csv']
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def revenue_to_reais(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Retorna cópias dos itens com a receita em centavos convertida para reais (inclusive
+    nos produtos de cada período das séries do rollup).
+    """
+    converted = []
+    for item in items:
+        item = {**item, "revenue": cents_to_reais(item.get('revenue', 0))}
+        if 'products' in item:
+            item['products'] = revenue_to_reais(item['products'])
+        converted.append(item)
+    return converted
 
 
 class SalesReport(Report):
@@ -9,8 +33,9 @@ class SalesReport(Report):
     Representa um relatório de vendas que pode ser gerado em diferentes formatos.
 
     Esta classe processa dados brutos de vendas e os formata em uma saída
-    legível (texto) ou em formato de intercâmbio de dados (JSON).
-    A geração do relatório é iniciada imediatamente após a inicialização.
+    legível (texto) ou em formato de intercâmbio de dados (JSON, NDJSON ou CSV).
+    O relatório é escrito de forma incremental em um buffer de tamanho fixo, na saída
+    padrão (binária) ou no arquivo definido em set_output().
 
     Attributes:
         data (Dict[str, Any]): O dicionário de dados de vendas brutos.
@@ -19,33 +44,115 @@ class SalesReport(Report):
                                    'filter_dates': {'start': str, 'end': str},
                                    'best_selling_product': {'product': str, 'quantity': int},
                                    'total_global_revenue': float,
-                                   'revenue_per_product': List[Dict[str, Any]]
+                                   'revenue_per_product': List[Dict[str, Any]],
+                                   'files': List[Dict[str, Any]],
+                                   'rows': {'read': int, 'filtered': int, 'rejected': int,
+                                            'rejected_by_category': Dict[str, int]},
+                                   'rollup': Dict[str, List[Dict[str, Any]]] (opcional),
+                                   'approximation': Dict[str, Any] (opcional),
+                                   'group_by': List[str] e 'groups': List[Dict[str, Any]]
+                                       (opcional; substituem o produto mais vendido e a
+                                       receita por produto),
+                                   'currency_unit': 'cents' (opcional; valores em centavos)
                                }
-        report_format (str): O formato de saída desejado ('text' ou 'json').
+        report_format (str): O formato de saída desejado ('text', 'json', 'ndjson' ou 'csv').
+        output (Optional[Union[str, TextIO]]): O arquivo (ou fluxo) de saída; None escreve na saída padrão.
     """
 
     def __init__(self):
         self.data: Optional[Dict[str, Any]] = None
         self.report_format: str = 'text'
+        self.output: Optional[Union[str, TextIO]] = None
+        self._stream: Optional[TextIO] = None
 
     def set_data(self, data: Dict[str, Any]) -> None:
-        """Define os dados brutos de vendas que serão usados para gerar o relatório."""
+        """
+        Define os dados brutos de vendas que serão usados para gerar o relatório.
+
+        Valores em centavos inteiros (currency_unit == 'cents') são convertidos para reais
+        aqui, somente no momento da saída.
+        """
+        if data and data.get('currency_unit') == 'cents':
+            # Copia os itens convertidos: os resultados recebidos não são alterados e podem
+            # gerar outros relatórios.
+            data = {key: value for key, value in data.items() if key != 'currency_unit'}
+            data['total_global_revenue'] = cents_to_reais(data.get('total_global_revenue', 0))
+            data['revenue_per_product'] = revenue_to_reais(data.get('revenue_per_product', []))
+            if 'groups' in data:
+                data['groups'] = revenue_to_reais(data['groups'])
+            if 'rollup' in data:
+                data['rollup'] = {
+                    granularity: revenue_to_reais(series) for granularity, series in data['rollup'].items()}
+            approximation = data.get('approximation')
+            if approximation and approximation.get('method') == 'block-sampling':
+                data['approximation'] = {
+                    **approximation,
+                    'total_global_revenue_interval': [
+                        cents_to_reais(value) for value in approximation['total_global_revenue_interval']],
+                    'revenue_intervals': {
+                        product: [cents_to_reais(value) for value in bounds]
+                        for product, bounds in approximation['revenue_intervals'].items()
+                    },
+                }
         self.data = data
 
     def set_report_format(self, report_format: str) -> None:
-        """Define o formato de saída desejado ('text' ou 'json')."""
-        valid_formats = ['text', 'json']
-        if report_format not in valid_formats:
+        """Define o formato de saída desejado ('text', 'json', 'ndjson' ou 'csv')."""
+        if report_format not in REPORT_FORMATS:
             raise ValueError(
-                f"Formato de relatório inválido: '{report_format}'. Escolha entre {valid_formats}")
+                f"Formato de relatório inválido: '{report_format}'. Escolha entre {REPORT_FORMATS}")
 
         self.report_format = report_format
 
+    def set_output(self, output: Optional[Union[str, TextIO]]) -> None:
+        """
+        Define o arquivo em que o relatório será escrito (None para a saída padrão). Também
+        aceita um fluxo de texto já aberto, que não é fechado ao final.
+        """
+        self.output = output or None
+
+    @contextmanager
+    def open_output(self) -> Iterator[TextIO]:
+        """
+        Abre o destino do relatório como texto sobre um buffer binário de
+        OUTPUT_BUFFER_SIZE bytes: o arquivo de saída ou a saída padrão, que é apenas
+        esvaziada (e não fechada) ao final. Um fluxo definido em set_output() é usado
+        diretamente.
+        """
+        if hasattr(self.output, 'write'):
+            yield self.output
+            return
+
+        if self.output:
+            with open(self.output, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as stream:
+                yield stream
+            return
+
+        sys.stdout.flush()
+        raw = getattr(sys.stdout, 'buffer', None)
+        if raw is None:
+            yield sys.stdout
+            return
+        buffered = io.BufferedWriter(raw, buffer_size=OUTPUT_BUFFER_SIZE)
+        stream = io.TextIOWrapper(buffered, encoding='utf-8')
+        try:
+            yield stream
+        finally:
+            stream.detach()
+            buffered.detach()
+            raw.flush()
+
+    def write_line(self, line: str = "") -> None:
+        """Escreve uma linha do relatório no destino aberto por generate()."""
+        self._stream.write(line)
+        self._stream.write("\n")
+
     def generate(self, data: Dict[str, Any], report_format: str) -> Dict[str, Any]:
         """
         Gera o relatório de vendas com base nos dados fornecidos e no formato escolhido.
 
         Se o formato for 'json', o método format_json_output() é chamado e retorna o relatório em formato JSON.
+        Os formatos 'ndjson' e 'csv' chamam format_ndjson_output() e format_csv_output().
         Caso contrário, o método format_text_output() é chamado e retorna o relatório em formato de texto.
 
         Se ocorrer um erro durante a geração do relatório, o erro é registrado no log.
@@ -53,14 +160,65 @@ class SalesReport(Report):
         try:
             self.set_data(data)
             self.set_report_format(report_format)
-            if self.report_format == 'json':
-                self.format_json_output()
-            else:
-                self.format_text_output()
+            with self.open_output() as stream:
+                self._stream = stream
+                self.formatter()()
             return self.data if self.data is not None else {}
         except Exception as _err:
             logging.error("Error to generate report: %s", _err)
             return {}
+        finally:
+            self._stream = None
+
+    def formatter(self) -> Callable[[], None]:
+        """Retorna o método que formata o relatório no formato escolhido."""
+        formatters = {
+            'json': self.format_json_output,
+            'ndjson': self.format_ndjson_output,
+            'csv': self.format_csv_output,
+        }
+        return formatters.get(self.report_format, self.format_text_output)
+
+    def stream(
+        self,
+        batches: Iterable['SalesBatch'],
+        aggregator: 'Aggregator',
+        report_format: str,
+        partial_every: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Consome os lotes de um BatchReader no agregador e gera o relatório do estado
+        final, com o destino aberto desde o início da leitura.
+
+        No formato 'ndjson', com partial_every, uma linha de resultado parcial (type
+        'partial', com o número de lotes, a receita total, o produto mais vendido e as
+        linhas até o momento) é escrita e enviada a cada partial_every lotes, antes das
+        linhas do relatório final. Erros de leitura são propagados para quem chamou.
+        """
+        self.set_report_format(report_format)
+        partial_every = partial_every if self.report_format == 'ndjson' else None
+        try:
+            with self.open_output() as stream:
+                self._stream = stream
+                for count, batch in enumerate(batches, 1):
+                    aggregator.consume(batch)
+                    if partial_every and count % partial_every == 0:
+                        self.write_partial(count, aggregator.results())
+                        stream.flush()
+                self.set_data(aggregator.results())
+                self.formatter()()
+            return self.data if self.data is not None else {}
+        finally:
+            self._stream = None
+
+    def write_partial(self, batches: int, results: Dict[str, Any]) -> None:
+        """Escreve uma linha NDJSON com os resultados parciais após batches lotes."""
+        import json
+        self.set_data(results)
+        partial = {key: self.data[key] for key in ('total_global_revenue', 'best_selling_product', 'rows')
+                   if key in self.data}
+        self.write_line(json.JSONEncoder(ensure_ascii=False).encode(
+            {"type": "partial", "batches": batches, **partial}))
 
     def format_text_output(self):
         """
@@ -76,48 +234,211 @@ class SalesReport(Report):
         em formato de texto.
         """
         if not self.data:
-            print("Nenhum dado disponível para gerar o relatório.")
+            self.write_line("Nenhum dado disponível para gerar o relatório.")
             return
 
-        print("-" * 50)
-        print("           RELATÓRIO DE VENDAS           ")
-        print(
+        if 'windows' in self.data:
+            self.format_windows_text_output()
+            self.format_rollup_text_output()
+            return
+
+        self.write_line("-" * 50)
+        self.write_line("           RELATÓRIO DE VENDAS           ")
+        self.write_line(
             f"Filtro de Datas: {self.data.get('filter_dates', {}).get('start', 'N/A')} a {self.data.get('filter_dates', {}).get('end', 'N/A')}")
-        print("-" * 50)
+        self.write_line("-" * 50)
 
         # Produto Mais Vendido
-        print("\n## Produto Mais Vendido (por Unidades)")
-        best_seller = self.data.get('best_selling_product', {})
-        print(
-            f"Produto: {best_seller.get('product', 'N/A')} ({best_seller.get('quantity', 'N/A')} unidades)")
-        print("-" * 50)
+        if 'groups' not in self.data:
+            self.write_line("\n## Produto Mais Vendido (por Unidades)")
+            best_seller = self.data.get('best_selling_product', {})
+            self.write_line(
+                f"Produto: {best_seller.get('product', 'N/A')} ({best_seller.get('quantity', 'N/A')} unidades)")
+            self.write_line("-" * 50)
 
         # Valor Total de Todas as Vendas
-        print("\n## Valor Total de Todas as Vendas")
+        self.write_line("\n## Valor Total de Todas as Vendas")
         total_revenue = self.data.get('total_global_revenue')
         if total_revenue is not None:
-            print(f"Total Geral: R$ {total_revenue:.2f}")
+            self.write_line(f"Total Geral: R$ {total_revenue:.2f}")
+        else:
+            self.write_line("Total Geral: N/A")
+        self.write_line("-" * 50)
+
+        # Total de Vendas por Produto (ou por Grupo)
+        if 'groups' in self.data:
+            self.format_groups_text_output()
         else:
-            print("Total Geral: N/A")
-        print("-" * 50)
+            self.write_line("\n## Total de Vendas (Receita) por Produto")
+            intervals = (self.data.get('approximation') or {}).get('revenue_intervals', {})
+            for item in self.data.get('revenue_per_product', []):
+                product = item.get('product', 'N/A')
+                revenue = item.get('revenue', 0.0)
+                if product in intervals:
+                    low, high = intervals[product]
+                    self.write_line(f"- {product.ljust(10)}: R$ {revenue:.2f} (R$ {low:.2f} a R$ {high:.2f})")
+                else:
+                    self.write_line(f"- {product.ljust(10)}: R$ {revenue:.2f}")
+            self.write_line("-" * 50)
+
+        # Arquivos Processados
+        files = self.data.get('files', [])
+        if len(files) > 1:
+            self.write_line("\n## Arquivos Processados")
+            for item in files:
+                self.write_line(f"- {item.get('file')}: {item.get('rows', 0)} linhas, {item.get('errors', 0)} com erro")
+            self.write_line("-" * 50)
+
+        # Linhas Lidas, Filtradas e Rejeitadas
+        rows = self.data.get('rows')
+        if rows:
+            self.write_line("\n## Linhas Processadas")
+            self.write_line(
+                f"Lidas: {rows.get('read', 0)}, filtradas: {rows.get('filtered', 0)}, "
+                f"rejeitadas: {rows.get('rejected', 0)}")
+            for category, count in rows.get('rejected_by_category', {}).items():
+                self.write_line(f"- {category}: {count}")
+            self.write_line("-" * 50)
+
+        # Limites de Erro do Modo Aproximado
+        approximation = self.data.get('approximation')
+        if approximation and approximation.get('method') == 'block-sampling':
+            low, high = approximation.get('total_global_revenue_interval', [0.0, 0.0])
+            self.write_line("\n## Modo Aproximado (Amostragem de Blocos)")
+            self.write_line(
+                f"Blocos lidos: {approximation.get('blocks_sampled')} de {approximation.get('blocks_total')} "
+                f"({approximation.get('sampled_fraction', 0.0) * 100:.2f}% dos dados)")
+            self.write_line(
+                f"Total Geral: R$ {low:.2f} a R$ {high:.2f} "
+                f"({approximation.get('confidence', 0.0) * 100:.0f}% de confiança)")
+            self.write_line(
+                f"Produto mais vendido correto com probabilidade de "
+                f"{approximation.get('best_selling_probability', 0.0) * 100:.1f}%")
+            self.write_line("-" * 50)
+        elif approximation:
+            self.write_line("\n## Modo Aproximado (Space-Saving)")
+            self.write_line(f"Contadores: {approximation.get('counters')}")
+            self.write_line(f"Erro máximo por produto: R$ {approximation.get('max_revenue_error', 0.0):.2f} / "
+                  f"{approximation.get('max_quantity_error', 0)} unidades")
+            self.write_line(f"Produto mais vendido garantido: {'sim' if approximation.get('best_selling_guaranteed') else 'não'}")
+            self.write_line("-" * 50)
+
+        self.format_rollup_text_output()
+
+    def format_groups_text_output(self):
+        """
+        Imprime a receita, as unidades e o número de vendas de cada grupo, quando o
+        relatório foi gerado com --group-by.
+        """
+        columns = self.data.get('group_by', [])
+        self.write_line(f"\n## Total de Vendas (Receita) por {', '.join(columns)}")
+        for item in self.data.get('groups', []):
+            key = item.get('key', {})
+            label = " | ".join(str(key.get(column, 'N/A')) for column in columns)
+            self.write_line(
+                f"- {label}: R$ {item.get('revenue', 0.0):.2f} "
+                f"({item.get('quantity', 0)} unidades, {item.get('sales', 0)} vendas)")
+        self.write_line("-" * 50)
 
-        # Total de Vendas por Produto
-        print("\n## Total de Vendas (Receita) por Produto")
-        for item in self.data.get('revenue_per_product', []):
-            product = item.get('product', 'N/A')
-            revenue = item.get('revenue', 0.0)
-            print(f"- {product.ljust(10)}: R$ {revenue:.2f}")
-        print("-" * 50)
+    def format_rollup_text_output(self):
+        """
+        Imprime a série mensal de vendas (receita e unidades por mês), quando o relatório
+        foi gerado com --rollup.
+        """
+        monthly = self.data.get('rollup', {}).get('monthly', [])
+        if not monthly:
+            return
+        self.write_line("\n## Vendas por Mês")
+        for item in monthly:
+            self.write_line(f"- {item.get('period')}: R$ {item.get('revenue', 0.0):.2f} ({item.get('quantity', 0)} unidades)")
+        self.write_line("-" * 50)
+
+    def format_windows_text_output(self):
+        """
+        Formata em texto um relatório com várias janelas de datas, imprimindo o relatório
+        de cada janela precedido do seu nome.
+        """
+        windows_data = self.data
+        try:
+            for window in windows_data.get('windows', []):
+                self.write_line(f"\n# Janela: {window.get('window', 'N/A')}")
+                self.data = window
+                self.format_text_output()
+        finally:
+            self.data = windows_data
 
     def format_json_output(self):
         """
         Formata o relatório de vendas em formato JSON.
 
-        O relatório em formato JSON é impresso na saída padrão com indentação de 4 espaços e sem caracteres ASCII.
+        O relatório em formato JSON é escrito com indentação de 4 espaços e sem caracteres ASCII,
+        em partes geradas pelo codificador, sem montar o documento inteiro em memória.
 
         Se o formato for 'json', o método format_json_output() é chamado e retorna o relatório em formato JSON.
         """
         if not self.data:
-            print("Nenhum dado disponível para gerar o relatório.")
+            self.write_line("Nenhum dado disponível para gerar o relatório.")
+            return
+        import json
+        encoder = json.JSONEncoder(indent=4, ensure_ascii=False)
+        for chunk in encoder.iterencode(self.data):
+            self._stream.write(chunk)
+        self.write_line()
+
+    def _iter_reports(self) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+        """Retorna (nome da janela, relatório) para cada janela, ou (None, dados) sem janelas."""
+        if 'windows' in self.data:
+            for window in self.data.get('windows', []):
+                yield window.get('window'), window
+        else:
+            yield None, self.data
+
+    def format_ndjson_output(self):
+        """
+        Formata o relatório em NDJSON: uma linha de resumo (type 'summary') com os demais
+        campos do relatório, seguida de uma linha por produto (type 'product') ou, com
+        --group-by, por grupo (type 'group'). Com janelas, cada linha inclui o nome da
+        janela.
+        """
+        if not self.data:
+            return
+        import json
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        if 'windows' in self.data:
+            header = {key: value for key, value in self.data.items() if key != 'windows'}
+            self.write_line(encode({"type": "summary", **header}))
+        for name, report in self._iter_reports():
+            scope = {} if name is None else {"window": name}
+            summary = {key: value for key, value in report.items()
+                       if key not in ('revenue_per_product', 'groups', 'window')}
+            self.write_line(encode({"type": "summary", **scope, **summary}))
+            for item in report.get('revenue_per_product', []):
+                self.write_line(encode({"type": "product", **scope, **item}))
+            for item in report.get('groups', []):
+                self.write_line(encode({"type": "group", **scope, **item}))
+
+    def format_csv_output(self):
+        """
+        Formata a receita por produto em CSV (colunas produto e receita, precedidas de
+        janela quando houver janelas de datas). Com --group-by, há uma linha por grupo,
+        com as colunas de agrupamento, receita, quantidade e vendas.
+        """
+        if not self.data:
+            return
+        import csv
+        writer = csv.writer(self._stream, lineterminator='\n')
+        if 'groups' in self.data:
+            columns = self.data.get('group_by', [])
+            writer.writerow(columns + ['receita', 'quantidade', 'vendas'])
+            for item in self.data.get('groups', []):
+                key = item.get('key', {})
+                writer.writerow([key.get(column) for column in columns] + [
+                    f"{item.get('revenue', 0.0):.2f}", item.get('quantity', 0), item.get('sales', 0)])
             return
-        print(json.dumps(self.data, indent=4, ensure_ascii=False))
+        with_windows = 'windows' in self.data
+        header: List[str] = ['produto', 'receita']
+        writer.writerow(['janela'] + header if with_windows else header)
+        for name, report in self._iter_reports():
+            prefix = [name] if with_windows else []
+            for item in report.get('revenue_per_product', []):
+                writer.writerow(prefix + [item.get('product'), f"{item.get('revenue', 0.0):.2f}"])
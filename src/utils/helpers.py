@@ -1,5 +1,9 @@
+import argparse
 from datetime import datetime, timedelta
-from typing import Dict, Tuple, List, Any, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Tuple, List, Any, Optional
+
+ISO_DATE_FORMAT = "%Y-%m-%d"
 
 
 def datetime_treat(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
@@ -29,6 +33,29 @@ def datetime_treat(start_date: Optional[str], end_date: Optional[str]) -> Tuple[
     return (filter_start_date, filter_end_date)
 
 
+def expand_paths(patterns: List[str]) -> List[str]:
+    """
+    Expande padrões glob em uma lista de caminhos de arquivos.
+
+    Padrões sem correspondência e o caminho '-' (entrada padrão) são mantidos como
+    foram informados, para que o erro de arquivo inexistente seja reportado depois.
+
+    Args:
+        patterns (List[str]): Os caminhos ou padrões glob.
+
+    Returns:
+        List[str]: Os caminhos expandidos, na ordem dos padrões (cada padrão ordenado).
+    """
+    paths: List[str] = []
+    for pattern in patterns:
+        matches: List[str] = []
+        if any(char in pattern for char in '*?['):
+            import glob
+            matches = sorted(glob.glob(pattern))
+        paths.extend(matches or [pattern])
+    return paths
+
+
 def update_aggregates(
     product: str,
     quantity: int,
@@ -52,11 +79,35 @@ def update_aggregates(
         float: O novo valor total de todas as vendas
     """
     new_global_revenue = current_global_revenue + row_sale_value
-    revenue_dict[product] = revenue_dict.get(product, 0.0) + row_sale_value
+    revenue_dict[product] = revenue_dict.get(product, 0) + row_sale_value
     quantity_dict[product] = quantity_dict.get(product, 0) + quantity
     return new_global_revenue
 
 
+def merge_aggregates(
+    partial_revenue: Dict[str, float],
+    partial_quantity: Dict[str, int],
+    revenue_dict: Dict[str, float],
+    quantity_dict: Dict[str, int]
+) -> None:
+    """
+    Mescla agregados parciais de receita e quantidade nos agregados principais.
+
+    Os produtos novos são inseridos na ordem em que aparecem nos agregados parciais,
+    preservando a ordem de primeira ocorrência quando as partes são mescladas em ordem.
+
+    Args:
+        partial_revenue (Dict[str, float]): A receita por produto da parte
+        partial_quantity (Dict[str, int]): A quantidade por produto da parte
+        revenue_dict (Dict[str, float]): O dicionário principal de receita por produto
+        quantity_dict (Dict[str, int]): O dicionário principal de quantidade por produto
+    """
+    for product, revenue in partial_revenue.items():
+        revenue_dict[product] = revenue_dict.get(product, 0) + revenue
+    for product, quantity in partial_quantity.items():
+        quantity_dict[product] = quantity_dict.get(product, 0) + quantity
+
+
 def parser_to_dict_list(sorted_revenue: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
     """
     Converte uma lista de tuplas contendo produtos e receitas para uma lista de dicionários.
@@ -87,6 +138,63 @@ def convert_sale_values(quantity_str: str, price_str: str) -> Tuple[int, float]:
     return quantity, unit_price
 
 
+def parse_cents(price_str: str) -> int:
+    """
+    Converte um preço com separador decimal '.' ou ',' em centavos inteiros, sem passar
+    por float (ex.: '49.9' -> 4990, '0,05' -> 5, '-3' -> -300).
+
+    Args:
+        price_str (str): A string contendo o preço unitário.
+
+    Returns:
+        int: O preço em centavos.
+
+    Raises:
+        ValueError: Se o preço for inválido ou tiver frações de centavo.
+    """
+    integer, dot, fraction = price_str.replace(',', '.').partition('.')
+    try:
+        if not dot:
+            return int(integer) * 100
+        if len(fraction) == 2 and fraction.isdigit():
+            return int(integer + fraction)
+        if fraction and not fraction.isdigit() or not (integer.lstrip('+-') or fraction):
+            raise ValueError
+        if len(fraction) > 2:
+            if fraction[2:].strip('0'):
+                raise ValueError(f"price has fractions of a cent: '{price_str}'")
+            fraction = fraction[:2]
+        return int(integer + fraction.ljust(2, '0'))
+    except ValueError as _err:
+        if str(_err).startswith('price'):
+            raise
+        raise ValueError(f"invalid price: '{price_str}'") from None
+
+
+def convert_sale_cents(quantity_str: str, price_str: str) -> Tuple[int, int]:
+    """
+    Converte strings de quantidade e preço na quantidade e no valor da venda em centavos,
+    usando apenas aritmética inteira.
+
+    Args:
+        quantity_str (str): A string contendo a quantidade de produtos vendidos.
+        price_str (str): A string contendo o preço unitário dos produtos.
+
+    Returns:
+        Tuple[int, int]: A quantidade e o valor total da venda em centavos.
+    """
+    quantity = int(quantity_str)
+    return quantity, quantity * parse_cents(price_str)
+
+
+def cents_to_reais(cents: int) -> float:
+    """
+    Converte centavos em reais. Para valores inteiros de centavos, o float resultante é
+    exibido com exatamente as casas decimais do valor em centavos.
+    """
+    return cents / 100
+
+
 def calculate_sales(quantity: int, unit_price: float) -> float:
     """
     Calcula o valor total de uma venda com base na quantidade e no preço unitário.
@@ -116,3 +224,157 @@ def parse_date(date_str: str, date_format: str = "%Y-%m-%d") -> Optional[datetim
         return datetime.strptime(date_str, date_format)
     except ValueError:
         return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date_cached(date_str: str, date_format: str = "%Y-%m-%d") -> Optional[datetime]:
+    """
+    Versão de parse_date com cache, para arquivos com poucas datas distintas.
+
+    Args:
+        date_str (str): The date string to be parsed.
+        date_format (str, optional): The format of the date string. Defaults to "%Y-%m-%d".
+
+    Returns:
+        Optional[datetime]: The parsed datetime object, or None if the parsing fails.
+    """
+    return parse_date(date_str, date_format)
+
+
+def make_date_filter(
+    filter_start_date: Optional[datetime],
+    filter_end_date: Optional[datetime],
+    date_format: str = "%Y-%m-%d"
+) -> Optional[Callable[[str], bool]]:
+    """
+    Cria um predicado que indica se uma data de venda (string) está dentro do filtro.
+
+    A decisão de cada data distinta é calculada uma única vez e guardada em cache.
+    Quando o formato é ISO (%Y-%m-%d), datas no formato AAAA-MM-DD dentro do período
+    são aceitas por comparação lexical, sem nenhuma conversão. Datas que não podem ser
+    convertidas não são filtradas, como em process_csv_rows.
+
+    Args:
+        filter_start_date (Optional[datetime]): Data inicial do filtro (inclusiva).
+        filter_end_date (Optional[datetime]): Data final do filtro (exclusiva).
+        date_format (str, optional): O formato das datas de venda. Defaults to "%Y-%m-%d".
+
+    Returns:
+        Optional[Callable[[str], bool]]: O predicado, ou None se não houver filtro.
+    """
+    if filter_start_date is None and filter_end_date is None:
+        return None
+
+    decisions: Dict[str, bool] = {}
+
+    def decide(date_str: str) -> bool:
+        decision = decisions.get(date_str)
+        if decision is None:
+            sale_date = parse_date_cached(date_str, date_format)
+            decision = not (
+                sale_date
+                and ((filter_start_date and sale_date < filter_start_date)
+                     or (filter_end_date and sale_date >= filter_end_date))
+            )
+            decisions[date_str] = decision
+        return decision
+
+    start_key = filter_start_date.strftime(ISO_DATE_FORMAT) if filter_start_date else "0000-00-00"
+    end_key = filter_end_date.strftime(ISO_DATE_FORMAT) if filter_end_date else "9999-99-99"
+    if date_format != ISO_DATE_FORMAT or len(start_key) != 10 or len(end_key) != 10:
+        return decide
+
+    def in_window(date_str: str) -> bool:
+        if len(date_str) == 10 and start_key <= date_str < end_key \
+                and date_str[4] == '-' and date_str[7] == '-':
+            return True
+        return decide(date_str)
+
+    return in_window
+
+
+MEMORY_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+# Os conversores abaixo são tipos de argumentos do argparse: lançam ArgumentTypeError,
+# cuja mensagem o argparse mostra como está (um ValueError viraria "invalid ... value").
+
+
+def parse_positive_int(value: str) -> int:
+    """
+    Converte um inteiro maior ou igual a 1 (ex.: --workers, --top).
+
+    Raises:
+        argparse.ArgumentTypeError: Se o valor não for um inteiro ou for menor que 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Valor inválido: '{value}'. Use um inteiro maior ou igual a 1.")
+    return number
+
+
+def parse_sample_fraction(value: str) -> float:
+    """
+    Converte a fração da amostra do --approx, entre 0 (exclusivo) e 1.
+
+    Raises:
+        argparse.ArgumentTypeError: Se o valor não for um número nesse intervalo.
+    """
+    try:
+        fraction = float(value)
+    except ValueError:
+        fraction = 0.0
+    if not 0 < fraction <= 1:
+        raise argparse.ArgumentTypeError(f"Fração inválida: '{value}'. Use um número entre 0 (exclusivo) e 1.")
+    return fraction
+
+
+def parse_positive_float(value: str) -> float:
+    """
+    Converte um número maior que 0 (ex.: --time-budget).
+
+    Raises:
+        argparse.ArgumentTypeError: Se o valor não for um número ou não for positivo.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"Valor inválido: '{value}'. Use um número maior que 0.")
+    return number
+
+
+def parse_memory_size(size_str: str) -> int:
+    """
+    Converte um tamanho de memória em bytes, com sufixo opcional K, M ou G (potências de
+    1024; ex.: '512M' -> 536870912, '2g' -> 2147483648, '100000' -> 100000).
+
+    Raises:
+        argparse.ArgumentTypeError: Se o tamanho for inválido ou não positivo.
+    """
+    text = size_str.strip().upper().rstrip('B')
+    unit = text[-1:] if text[-1:] in MEMORY_UNITS else ''
+    try:
+        size = int(float(text[:len(text) - len(unit)]) * MEMORY_UNITS[unit])
+    except ValueError:
+        size = 0
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"Tamanho de memória inválido: '{size_str}'. Use, por exemplo, 512M ou 2G.")
+    return size
+
+
+def parse_group_by(spec: str) -> List[str]:
+    """
+    Converte a lista de dimensões de agrupamento separadas por vírgula (ex.:
+    'produto,loja,data_venda:mes') em uma lista de nomes, sem espaços e sem repetições.
+
+    Raises:
+        argparse.ArgumentTypeError: Se a lista estiver vazia ou tiver nomes vazios.
+    """
+    columns = [column.strip() for column in spec.split(',')]
+    if not spec.strip() or not all(columns):
+        raise argparse.ArgumentTypeError(f"Agrupamento inválido: '{spec}'. Use colunas separadas por vírgula.")
+    return list(dict.fromkeys(columns))
@@ -0,0 +1,154 @@
+import io
+import json
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.aggregators import (
+    CompositeAggregator,
+    PeriodAggregator,
+    ProductAggregator,
+    RowsAggregator,
+    TotalsAggregator
+)
+from core.batches import iter_line_batches
+from core.csv_processor import CSVProcessor
+from interfaces.report_interface import Report
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Boné,1,,2025-01-09\n"
+    "Meia,2,9.9,ontem\n"
+    "Bermuda,2\n"
+    "Camiseta,1,49.9,2025-02-07\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+def _processor(csv_file, engine='python', top=None, rollup=False, **filters):
+    processor = CSVProcessor()
+    processor.set_file_paths([str(csv_file)])
+    processor.set_date_filters(filters.get('start_date'), filters.get('end_date'))
+    processor.set_engine(engine)
+    processor.set_top(top)
+    processor.set_rollup(rollup)
+    return processor
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"engine": "cents"},
+    {"start_date": "2025-01-05", "top": 1},
+    {"end_date": "2025-01-07"},
+    {"rollup": True},
+    {"rollup": True, "start_date": "2025-01-05"},
+])
+def test_aggregators_match_process_data(csv_file, options):
+    processor = _processor(csv_file, **options)
+    aggregator = processor.make_aggregator()
+    for batch in processor.iter_batches(batch_size=2):
+        aggregator.consume(batch)
+    results = aggregator.results()
+    expected = _processor(csv_file, **options).process_data()
+
+    results.pop('report_date'), expected.pop('report_date')
+    assert results == expected
+    assert list(results) == list(expected)
+
+
+def test_product_aggregator_merges_readers():
+    aggregator = ProductAggregator()
+    for content in (CSV_CONTENT, "produto,quantidade,preco_unitario,data_venda\nMeia,5,1,2025-01-01\n"):
+        for batch in iter_line_batches(io.StringIO(content), [], {}):
+            aggregator.consume(batch)
+
+    assert aggregator.results()['best_selling_product'] == {"product": "Meia", "quantity": 7}
+    assert [item['product'] for item in aggregator.results()['revenue_per_product']] == \
+        ["Calça", "Camiseta", "Meia"]
+
+
+def test_period_aggregator_and_partial_results():
+    batches = iter_line_batches(io.StringIO(CSV_CONTENT), [], {}, batch_size=1)
+    composite = CompositeAggregator([TotalsAggregator(), RowsAggregator(), PeriodAggregator(['monthly'], top=2)])
+
+    composite.consume(next(batches))
+    assert composite.results()['total_global_revenue'] == 149.7
+    for batch in batches:
+        composite.consume(batch)
+    results = composite.results()
+    assert results['rollup'] == {"monthly": [
+        {"period": "2025-01", "revenue": 349.5, "quantity": 5, "products": [
+            {"product": "Calça", "revenue": 199.8, "quantity": 2},
+            {"product": "Camiseta", "revenue": 149.7, "quantity": 3},
+        ]},
+        {"period": "2025-02", "revenue": 49.9, "quantity": 1, "products": [
+            {"product": "Camiseta", "revenue": 49.9, "quantity": 1},
+        ]},
+    ]}
+    assert results['rows']['read'] == 7
+    assert composite.batches == 5
+
+
+def test_report_stream_writes_partials(csv_file):
+    processor = _processor(csv_file, engine='cents')
+    stream = io.StringIO()
+    report = SalesReport()
+    report.set_output(stream)
+    data = report.stream(processor.iter_batches(batch_size=1), processor.make_aggregator(), 'ndjson', 2)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    partials = [line for line in lines if line['type'] == 'partial']
+    assert [line['batches'] for line in partials] == [2, 4]
+    assert partials[0]['total_global_revenue'] == 349.5
+    assert lines[len(partials)]['type'] == 'summary'
+    assert data['total_global_revenue'] == 419.2
+
+
+def test_report_interface_defaults(csv_file):
+    class JsonReport(Report):
+        def generate(self, data, report_format):
+            return data
+
+        def set_data(self, data):
+            pass
+
+        def set_report_format(self, report_format):
+            pass
+
+    report = JsonReport()
+    report.set_output("saida.json")
+    assert report.output == "saida.json"
+
+    processor = _processor(csv_file)
+    results = report.stream(processor.iter_batches(), processor.make_aggregator(), 'json')
+    assert results['total_global_revenue'] == 419.2
+
+
+def test_cli_stream(csv_file, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", [
+        "cli.py", str(csv_file), "--stream", "1", "--rollup", "--format", "ndjson"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0]['type'] == 'partial'
+    summary = next(line for line in lines if line['type'] == 'summary')
+    assert summary['total_global_revenue'] == 419.2
+    assert summary['rollup']['monthly'][0]['period'] == "2025-01"
+
+    for options in (["--workers", "2"], ["--backend", "sqlite"]):
+        monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--stream", *options])
+        with pytest.raises(SystemExit):
+            CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file) + ".nao", "--stream"])
+    with pytest.raises(SystemExit):
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
@@ -0,0 +1,96 @@
+import io
+import pytest
+from core.batches import UNPARSED_DATE, SalesBatch, iter_line_batches
+from core.counters import ProductCounters
+from core.csv_processor import CSVProcessor
+from core.rejects import RejectedRows
+from interfaces.reader_interface import BatchReader
+from utils.helpers import datetime_treat, make_date_filter
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Boné,1,,2025-01-09\n"
+    "Meia,2,9.9,ontem\n"
+    "Bermuda,2\n"
+    "Camiseta,1,49.9,2025-02-07\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+def test_line_batches_columns_and_counts():
+    products, product_ids = [], {}
+    batches = list(iter_line_batches(io.StringIO(CSV_CONTENT), products, product_ids, batch_size=2, file="a.csv"))
+
+    assert [len(batch) for batch in batches] == [2, 2, 0]
+    assert products == ["Camiseta", "Calça", "Meia"]
+    assert all(batch.products is products for batch in batches)
+    assert list(batches[0].product_ids) + list(batches[1].product_ids) == [0, 1, 2, 0]
+    assert list(batches[1].ordinals)[0] == UNPARSED_DATE
+    assert sum(batch.rows_read for batch in batches) == 7
+    assert batches[1].reject_counts == {"invalid_quantity": 1, "missing_fields": 1}
+    assert batches[2].rows_read == 0
+    assert {batch.file for batch in batches} == {"a.csv"}
+
+
+def test_line_batches_filter_and_cents():
+    start, end = datetime_treat("2025-01-05", None)
+    batches = list(iter_line_batches(
+        io.StringIO(CSV_CONTENT), [], {}, make_date_filter(start, end), cents=True, rejects=RejectedRows()))
+
+    # Como em process_csv_rows, linhas fora do filtro não são convertidas nem rejeitadas.
+    assert [list(batch.revenues) for batch in batches] == [[19980, 1980, 4990]]
+    assert batches[0].revenues.typecode == 'q'
+    assert batches[0].rows_rejected == 2
+
+
+def test_overflowing_row_keeps_columns_aligned():
+    content = "produto,quantidade,preco_unitario,data_venda\nA,99999999999999999999,1,2025-01-01\nB,1,1,2025-01-01\n"
+    batch, = iter_line_batches(io.StringIO(content), [], {})
+
+    assert batch.reject_counts == {"out_of_range": 1}
+    assert list(batch.quantities) == [1] and list(batch.revenues) == [1.0]
+
+
+def test_sum_out_of_range_is_rejected_before_batching():
+    content = "produto,quantidade,preco_unitario,data_venda\n" + f"A,{9 * 10 ** 18},1,2025-01-01\n" * 2
+    totals = ProductCounters()
+    batch, = iter_line_batches(io.StringIO(content), [], {}, totals=totals)
+
+    assert batch.reject_counts == {"out_of_range": 1}
+    assert list(batch.quantities) == [9 * 10 ** 18]
+    assert totals.to_dicts()[1] == {"A": 9 * 10 ** 18}
+
+
+def test_processor_iter_batches(csv_file, tmp_path):
+    other = tmp_path / "outro.csv"
+    other.write_text(CSV_CONTENT, encoding='utf-8')
+    processor = CSVProcessor()
+    processor.set_file_paths([str(csv_file), str(other)])
+    assert isinstance(processor, BatchReader)
+
+    batches = list(processor.iter_batches(batch_size=3))
+    assert sum(len(batch) for batch in batches) == 8
+    assert len({id(batch.products) for batch in batches}) == 1
+    assert processor.file_stats == [
+        {"file": str(csv_file), "rows": 7, "errors": 2},
+        {"file": str(other), "rows": 7, "errors": 2},
+    ]
+    assert (processor.rows_read, processor.rows_accepted, processor.rows_rejected) == (14, 8, 4)
+    assert len(SalesBatch([])) == 0
+
+    processor = CSVProcessor()
+    processor.set_file_paths([str(tmp_path / "inexistente.csv")])
+    with pytest.raises(FileNotFoundError):
+        list(processor.iter_batches())
+    processor.set_file_paths(["-", "-"])
+    with pytest.raises(ValueError):
+        list(processor.iter_batches())
@@ -0,0 +1,80 @@
+import csv
+import gzip
+import json
+import pytest
+from benchmarks.generate_sales import generate_sales
+from benchmarks.run_benchmarks import SCENARIOS, main, run_benchmarks
+from benchmarks.startup import run_startup
+from core.csv_processor import CSVProcessor
+
+
+def test_generate_sales_is_deterministic(tmp_path):
+    first, second, other = tmp_path / "a.csv", tmp_path / "b.csv", tmp_path / "c.csv"
+    dirty = generate_sales(str(first), rows=500, products=20, dirty_ratio=0.1, seed=1)
+    generate_sales(str(second), rows=500, products=20, dirty_ratio=0.1, seed=1)
+    generate_sales(str(other), rows=500, products=20, dirty_ratio=0.1, seed=2)
+
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes() != other.read_bytes()
+    rows = list(csv.reader(first.open(encoding='utf-8')))
+    assert rows[0] == ['produto', 'quantidade', 'preco_unitario', 'data_venda']
+    assert len(rows) == 501
+    assert 0 < dirty < 500
+    assert len({row[0] for row in rows[1:]}) <= 20
+
+
+def test_generate_sales_compressed_matches_plain(tmp_path):
+    plain, compressed, again = tmp_path / "v.csv", tmp_path / "v.csv.gz", tmp_path / "copia" / "v.csv.gz"
+    again.parent.mkdir()
+    generate_sales(str(plain), rows=300, products=5, compression=None)
+    generate_sales(str(compressed), rows=300, products=5, compression='gzip')
+    generate_sales(str(again), rows=300, products=5, compression='gzip')
+
+    assert gzip.decompress(compressed.read_bytes()) == plain.read_bytes()
+    assert compressed.read_bytes() == again.read_bytes()
+    assert CSVProcessor(str(compressed)).process_data()['total_global_revenue'] == \
+        CSVProcessor(str(plain)).process_data()['total_global_revenue']
+    with pytest.raises(ValueError):
+        generate_sales(str(plain), rows=1, compression='zip')
+    with pytest.raises(ValueError):
+        generate_sales(str(plain), rows=1, dirty_ratio=2)
+
+
+def test_run_benchmarks_results(tmp_path):
+    params = {"rows": 400, "products": 10, "start_date": "2024-01-01",
+              "days": 90, "dirty_ratio": 0.05, "seed": 3}
+    scenarios = ['python', 'date_index', 'cache_warm', 'incremental', 'report_json']
+    results = run_benchmarks(scenarios, params, repeat=1, data_dir=str(tmp_path), isolate=False)
+
+    assert results['dataset']['rows'] == 400
+    assert [result['scenario'] for result in results['results']] == scenarios
+    python, date_index, _, _, report = results['results']
+    assert python['rows_read'] == 400 and python['input_rows'] == 400
+    assert python['rows_per_second'] > 0
+    assert python['peak_traced_bytes'] > 0
+    assert date_index['rows_read'] <= 400
+    assert report['operation'] == 'generate' and report['products'] == 10
+    with pytest.raises(ValueError):
+        run_benchmarks(['inexistente'], params)
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "resultados.json"
+    main(["--rows", "200", "--products", "5", "--repeat", "1", "--no-tracemalloc",
+          "--scenario", "mmap", "--scenario", "gzip",
+          "--data-dir", str(tmp_path), "--output", str(output)])
+
+    results = json.loads(output.read_text(encoding='utf-8'))
+    assert [result['scenario'] for result in results['results']] == ['mmap', 'gzip']
+    assert all('error' not in result for result in results['results'])
+    assert results['results'][0]['peak_traced_bytes'] is None
+    assert set(SCENARIOS) >= {'python', 'numpy', 'mmap', 'cents', 'workers'}
+
+
+def test_startup_benchmark():
+    results = run_startup(runs=1)
+
+    timings = results['time_to_first_output']
+    assert timings['cli']['best_seconds'] > 0 and timings['interpreter']['best_seconds'] > 0
+    assert results['imports']['cli_main_us'] > 0
+    assert 0 < len(results['imports']['top']) <= results['imports']['modules']
@@ -0,0 +1,111 @@
+import os
+from core import cache
+from core.csv_processor import CSVProcessor
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Camiseta,1,49.9,2025-01-07\n"
+    "Meia,4,5.5,data-invalida\n"
+    "Tênis,1,199.9,2025-01-10\n"
+)
+
+
+def _run(csv_file, cache_dir=None, start=None, end=None):
+    processor = CSVProcessor(str(csv_file), start, end)
+    processor.set_cache_dir(cache_dir)
+    result = processor.process_data()
+    result.pop('report_date')
+    result.pop('files')
+    result.pop('rows')
+    return result
+
+
+def test_cached_results_match_csv(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    cache_dir = str(tmp_path / "cache")
+
+    for start, end in [(None, None), ('2025-01-05', '2025-01-08'), ('2025-01-09', None)]:
+        expected = _run(csv_file, None, start, end)
+        assert _run(csv_file, cache_dir, start, end) == expected  # frio
+        assert _run(csv_file, cache_dir, start, end) == expected  # quente
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_cache_is_used_when_fingerprint_matches(tmp_path, monkeypatch):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    cache_dir = str(tmp_path / "cache")
+    _run(csv_file, cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV não deveria ser relido")
+
+    monkeypatch.setattr(cache.SalesColumns, "extend_from_lines", fail)
+    assert _run(csv_file, cache_dir)['total_global_revenue'] == 621.3
+
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    cache_dir = str(tmp_path / "cache")
+    _run(csv_file, cache_dir)
+
+    csv_file.write_text(CSV_CONTENT + "Boné,10,10.0,2025-01-11\n", encoding='utf-8')
+    result = _run(csv_file, cache_dir)
+    assert result == _run(csv_file)
+    assert result['best_selling_product'] == {'product': 'Boné', 'quantity': 10}
+
+
+def test_read_sidecar_rejects_garbage(tmp_path):
+    path = tmp_path / "lixo.vcache"
+    path.write_bytes(b"not a cache\n")
+    assert cache.read_sidecar(str(path), {}, "%Y-%m-%d") is None
+    assert cache.read_sidecar(str(tmp_path / "ausente.vcache"), {}, "%Y-%m-%d") is None
+
+
+def test_python_and_numpy_aggregation_match(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    columns = cache.SalesColumns()
+    with open(csv_file, newline='', encoding='utf-8') as handle:
+        columns.extend_from_lines(handle)
+
+    python_revenue, python_quantity = {}, {}
+    total = columns._aggregate_python(None, None, python_revenue, python_quantity)
+    numpy_revenue, numpy_quantity = {}, {}
+    assert columns.aggregate(None, None, numpy_revenue, numpy_quantity) == total
+    assert list(numpy_revenue.items()) == list(python_revenue.items())
+    assert numpy_quantity == python_quantity
+
+
+def test_cached_reject_counts_follow_date_filter(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    cache_dir = str(tmp_path / "cache")
+
+    def rows(cache_dir, start, end):
+        processor = CSVProcessor(str(csv_file), start, end)
+        processor.set_cache_dir(cache_dir)
+        return processor.process_data()['rows']
+
+    for start, end in [('2025-01-09', None), (None, None), ('2025-01-08', '2025-01-09')]:
+        expected = rows(None, start, end)
+        assert rows(cache_dir, start, end) == expected  # frio ou quente
+        assert rows(cache_dir, start, end) == expected  # quente
+    assert rows(cache_dir, '2025-01-09', None)['rejected'] == 0
+
+
+def test_cache_invalidated_when_content_changes_in_place(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    cache_dir = str(tmp_path / "cache")
+    _run(csv_file, cache_dir)
+
+    stat = os.stat(csv_file)
+    csv_file.write_text(CSV_CONTENT.replace("Calça,2,", "Calça,8,"), encoding='utf-8')
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _run(csv_file, cache_dir)['best_selling_product'] == {'product': 'Calça', 'quantity': 8}
@@ -0,0 +1,84 @@
+import json
+import sys
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,\"99,90\",2025-01-07\n"
+    "Camiseta,1,49.90,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Tênis,1,199.9,2025-01-10\n"
+    "Meia,7,0.1,data-invalida\n"
+    "Calça,1,99.9,2025-02-20\n"
+)
+
+
+def _run(csv_file, engine, start=None, end=None, workers=1):
+    processor = CSVProcessor(str(csv_file), start, end)
+    processor.set_engine(engine)
+    processor.set_workers(workers)
+    result = SalesReport().generate(data=processor.process_data(), report_format='json')
+    result.pop('report_date')
+    return result
+
+
+def test_cents_engine_matches_python_engine(tmp_path, capsys):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    for start, end in [(None, None), ("2025-01-01", "2025-01-31")]:
+        assert _run(csv_file, 'cents', start, end) == _run(csv_file, 'python', start, end)
+    assert _run(csv_file, 'cents', workers=2) == _run(csv_file, 'cents')
+    capsys.readouterr()
+
+
+def test_cents_engine_accumulates_integers(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(
+        "produto,quantidade,preco_unitario,data_venda\n" + "Bala,1,0.1,2025-01-01\n" * 30
+        + "Goma,1,0.125,2025-01-01\n",
+        encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_engine('cents')
+    result = processor.process_data()
+
+    assert result['currency_unit'] == 'cents'
+    assert result['total_global_revenue'] == 300
+    assert processor.revenue_per_product == {"Bala": 300}
+    assert result['files'][0]['errors'] == 1
+    assert sum([0.1] * 30) != 3.0
+
+
+def test_cli_cents_engine_json_output(tmp_path, monkeypatch, capsys):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--engine", "cents", "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    output = json.loads(capsys.readouterr().out)
+    assert output['total_global_revenue'] == 699.9
+    assert 'currency_unit' not in output
+    assert output['revenue_per_product'][0] == {"product": "Calça", "revenue": 299.7}
+
+
+def test_cents_report_generated_twice(tmp_path, capsys):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    for group_by in (None, ["produto"]):
+        processor = CSVProcessor(str(csv_file))
+        processor.set_engine('cents')
+        processor.set_group_by(group_by)
+        results = processor.process_data()
+        snapshot = json.dumps(results, sort_keys=True)
+
+        first = SalesReport().generate(data=results, report_format='json')
+        second = SalesReport().generate(data=results, report_format='json')
+        assert first == second
+        assert json.dumps(results, sort_keys=True) == snapshot
+    assert second['groups'][0]['revenue'] == 299.7
+    capsys.readouterr()
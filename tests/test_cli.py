@@ -47,3 +47,47 @@ def test_run_cli_invalid_file(monkeypatch):
         )
 
         cli_parser.main()
+
+
+@pytest.mark.parametrize("options,message", [
+    (["--window", "jan=2025-01-01:2025-02-01", "--engine", "cents"],
+     "--engine cents cannot be combined with --window."),
+    (["--window", "jan=2025-01-01:2025-02-01", "--state-file", "estado.json"],
+     "--state-file cannot be combined with --window."),
+    (["--rollup", "--state-file", "estado.json"], "--state-file cannot be combined with --rollup."),
+    (["--approx", "0.5", "--state-file", "estado.json"], "--state-file cannot be combined with --approx."),
+    (["--group-by", "produto", "--cache-dir", "cache"], "--cache-dir cannot be combined with --group-by."),
+    (["--approx", "0.5", "--cache-dir", "cache"], "--cache-dir cannot be combined with --approx."),
+    (["--window", "jan=2025-01-01:2025-02-01", "--workers", "2"],
+     "--workers cannot be combined with --window."),
+    (["--rollup", "--engine", "numpy"], "--engine numpy cannot be combined with --rollup."),
+    (["--heavy-hitters", "10", "--engine", "mmap"], "--engine mmap cannot be combined with --heavy-hitters."),
+    (["--group-by", "produto", "--pipeline"], "--pipeline cannot be combined with --group-by."),
+])
+def test_run_cli_rejects_options_ignored_by_mode(monkeypatch, tmp_path, caplog, options, message):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "vendas.csv").write_text(
+        "produto,quantidade,preco_unitario,data_venda\nCamiseta,1,10.0,2025-01-01\n", encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", ["cli.py", "vendas.csv", *options])
+
+    with pytest.raises(SystemExit) as exc:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exc.value.code == 1
+    assert f"Error: {message}" in caplog.text
+    assert not (tmp_path / "estado.json").exists() and not (tmp_path / "cache").exists()
+
+
+@pytest.mark.parametrize("options,message", [
+    (["--workers", "0"], "Valor inválido: '0'. Use um inteiro maior ou igual a 1."),
+    (["--top", "dez"], "Valor inválido: 'dez'. Use um inteiro maior ou igual a 1."),
+    (["--approx", "2"], "Fração inválida: '2'."),
+    (["--memory-limit", "muito"], "Tamanho de memória inválido: 'muito'."),
+    (["--window", "janeiro"], "Janela inválida: 'janeiro'."),
+])
+def test_run_cli_shows_argument_messages(monkeypatch, capsys, options, message):
+    monkeypatch.setattr(sys, "argv", ["cli.py", "vendas_exemplo.csv", *options])
+
+    with pytest.raises(SystemExit) as exc:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
@@ -0,0 +1,64 @@
+import bz2
+import gzip
+import io
+import lzma
+import pytest
+from core.compression import BackgroundReader, detect_compression, open_sales_stream
+from core.csv_processor import CSVProcessor
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    + "".join(f"Produto{idx % 17},{idx % 5 + 1},{idx % 9}.99,2025-01-{idx % 28 + 1:02d}\n" for idx in range(3000))
+)
+
+
+def _run(path, workers=1):
+    processor = CSVProcessor(str(path), start_date='2025-01-03', end_date='2025-01-20')
+    processor.set_workers(workers)
+    result = processor.process_data()
+    result.pop('report_date')
+    result.pop('files')
+    result.pop('rows')
+    return result
+
+
+@pytest.mark.parametrize("suffix,compress", [
+    (".gz", gzip.compress),
+    (".bz2", bz2.compress),
+    (".xz", lzma.compress),
+])
+def test_compressed_input_matches_plain(tmp_path, suffix, compress):
+    plain = tmp_path / "vendas.csv"
+    plain.write_text(CSV_CONTENT, encoding='utf-8')
+    packed = tmp_path / f"vendas.csv{suffix}"
+    packed.write_bytes(compress(CSV_CONTENT.encode('utf-8')))
+
+    assert _run(packed) == _run(plain)
+    assert _run(packed, workers=2) == _run(plain)
+
+
+def test_detect_compression():
+    assert detect_compression(gzip.compress(b"x")[:6]) == "gzip"
+    assert detect_compression(b"produt") is None
+
+
+def test_state_file_rejects_compressed_input(tmp_path):
+    packed = tmp_path / "vendas.csv.gz"
+    packed.write_bytes(gzip.compress(CSV_CONTENT.encode('utf-8')))
+    processor = CSVProcessor(str(packed))
+    processor.set_state_file(str(tmp_path / "estado.json"))
+    with pytest.raises(SystemExit):
+        processor.process_data()
+
+
+def test_background_reader_propagates_errors():
+    stream = open_sales_stream(io.BytesIO(gzip.compress(b"a,b\n")[:-6] + b"\x00" * 6))
+    with pytest.raises((EOFError, OSError, gzip.BadGzipFile)):
+        stream.read()
+    stream.close()
+
+
+def test_background_reader_small_blocks():
+    reader = BackgroundReader(io.BytesIO(b"0123456789"), block_size=3, max_blocks=1)
+    assert io.BufferedReader(reader).read() == b"0123456789"
+    reader.close()
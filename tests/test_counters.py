@@ -0,0 +1,141 @@
+import importlib.util
+import json
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.counters import ProductCounters
+from core.csv_processor import CSVProcessor
+from reports.sales_report import SalesReport
+
+
+def test_counters_intern_products_in_first_appearance_order():
+    counters = ProductCounters()
+    counters.add("Camiseta", 3, 149.7)
+    counters.add("Calça", 2, 199.8)
+    counters.add("Camiseta", 1, 49.9)
+
+    assert counters.ids == {"Camiseta": 0, "Calça": 1}
+    assert len(counters) == 2
+    assert counters.to_dicts() == ({"Camiseta": 149.7 + 49.9, "Calça": 199.8}, {"Camiseta": 4, "Calça": 2})
+
+
+def test_counters_arrays_are_numpy_buffers():
+    np = pytest.importorskip("numpy")
+    counters = ProductCounters()
+    counters.add("Camiseta", 3, 149.7)
+    counters.add("Calça", 2, 199.8)
+    assert np.frombuffer(counters.quantity, dtype=np.int64).tolist() == [3, 2]
+    assert np.frombuffer(counters.revenue, dtype=np.float64).sum() == pytest.approx(349.5)
+
+
+def test_counters_from_dicts_continue_sequence():
+    counters = ProductCounters.from_dicts({"Tênis": 199.9}, {"Tênis": 1})
+    counters.add("Meia", 7, 0.7)
+    counters.add("Tênis", 1, 199.9)
+
+    revenue, quantity = counters.to_dicts()
+    assert list(revenue) == ["Tênis", "Meia"]
+    assert revenue["Tênis"] == 199.9 + 199.9 and quantity == {"Tênis": 2, "Meia": 7}
+
+
+def test_counters_in_cents_stay_integers():
+    counters = ProductCounters(cents=True)
+    counters.add("Bala", 1, 10)
+    counters.add("Bala", 2, 20)
+    assert counters.revenue.typecode == 'q'
+    assert counters.to_dicts() == ({"Bala": 30}, {"Bala": 3})
+
+
+def test_row_engine_rejects_quantity_out_of_range(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(
+        "produto,quantidade,preco_unitario,data_venda\n"
+        "Camiseta,3,49.9,2025-01-01\n"
+        f"Calça,{10 ** 20},99.9,2025-01-07\n",
+        encoding='utf-8')
+
+    for engine in ('python', 'cents', 'mmap'):
+        processor = CSVProcessor(str(csv_file))
+        processor.set_engine(engine)
+        result = processor.process_data()
+        assert result['best_selling_product'] == {"product": "Camiseta", "quantity": 3}
+        assert [item['product'] for item in result['revenue_per_product']] == ["Camiseta"]
+        assert result['files'][0]['errors'] == 1
+
+
+def test_overflowing_sum_leaves_counters_unchanged():
+    counters = ProductCounters(cents=True)
+    counters.add("Bala", 1, (1 << 63) - 10)
+    with pytest.raises(OverflowError):
+        counters.add("Bala", 1, 100)
+    with pytest.raises(OverflowError):
+        counters.add("Goma", 1 << 63, 1)
+    assert counters.to_dicts() == ({"Bala": (1 << 63) - 10}, {"Bala": 1})
+
+
+def test_cents_engine_rejects_revenue_out_of_range(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(
+        "produto,quantidade,preco_unitario,data_venda\n"
+        "Camiseta,3,49.9,2025-01-01\n"
+        f"Camiseta,{10 ** 17},1000.00,2025-01-07\n",
+        encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_engine('cents')
+    result = processor.process_data()
+    assert result['best_selling_product'] == {"product": "Camiseta", "quantity": 3}
+    assert result['revenue_per_product'] == [{"product": "Camiseta", "revenue": 14970}]
+    assert result['rows']['rejected_by_category'] == {"out_of_range": 1}
+
+
+OVERFLOW_CSV = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    f"Camiseta,{9 * 10 ** 18},1.0,2025-01-01\n"
+    f"Camiseta,{9 * 10 ** 18},1.0,2025-01-02\n"
+    "Calça,1,1.0,2025-01-03\n"
+)
+
+
+def _cli_results(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, "argv", ["cli.py", *args, "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    results = json.loads(capsys.readouterr().out)
+    return results['windows'][0] if 'windows' in results else results
+
+
+@pytest.mark.parametrize("options", [
+    [],
+    ["--pipeline"],
+    ["--engine", "mmap"],
+    ["--workers", "2"],
+    ["--window", "janeiro=2025-01-01:2025-02-01"],
+    ["--heavy-hitters", "10"],
+    ["--stream"],
+    ["--rollup"],
+    ["--cache-dir", "{tmp}/cache"],
+    pytest.param(["--engine", "numpy"], marks=pytest.mark.skipif(
+        importlib.util.find_spec("numpy") is None, reason="requires numpy")),
+])
+def test_sums_out_of_range_are_rejected_in_every_mode(tmp_path, monkeypatch, capsys, options):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(OVERFLOW_CSV, encoding='utf-8')
+
+    options = [option.format(tmp=tmp_path) for option in options]
+    results = _cli_results(monkeypatch, capsys, str(csv_file), *options)
+    assert results['best_selling_product'] == {"product": "Camiseta", "quantity": 9 * 10 ** 18}
+    assert results['rows']['rejected_by_category'] == {"out_of_range": 1}
+
+
+def test_sums_out_of_range_across_files_match_serial(tmp_path, monkeypatch, capsys):
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    header, *rows = OVERFLOW_CSV.splitlines(keepends=True)
+    first.write_text(header + "Tênis,x,1.0,2025-01-01\n" + rows[0], encoding='utf-8')
+    second.write_text(header + ''.join(rows[1:]), encoding='utf-8')
+    quarantine = tmp_path / "rejeitadas.csv"
+
+    results = _cli_results(monkeypatch, capsys, str(first), str(second), "--quarantine-file", str(quarantine))
+    assert results['best_selling_product'] == {"product": "Camiseta", "quantity": 9 * 10 ** 18}
+    assert results['rows']['rejected_by_category'] == {"invalid_quantity": 1, "out_of_range": 1}
+    assert [item['errors'] for item in results['files']] == [1, 1]
+    assert quarantine.read_text(encoding='utf-8') == "Tênis,x,1.0,2025-01-01\n" + rows[1]
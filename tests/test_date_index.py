@@ -0,0 +1,99 @@
+import os
+import sys
+from datetime import date
+import pytest
+from cli.parsers import CliParser
+from core import date_index
+from core.csv_processor import CSVProcessor
+from reports.sales_report import SalesReport
+
+
+def _write_sales(path, days, rows_per_day=20):
+    products = ['Camiseta', 'Calça', 'Tênis', 'Boné']
+    lines = ["produto,quantidade,preco_unitario,data_venda"]
+    for day in days:
+        for idx in range(rows_per_day):
+            lines.append(f"{products[(day + idx) % 4]},{idx % 3 + 1},{10 + idx % 5}.5,2025-01-{day:02d}")
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return path
+
+
+def _run(csv_file, start, end):
+    result = CSVProcessor(str(csv_file), start, end).process_data()
+    result.pop('report_date')
+    result.pop('files')
+    result.pop('rows')
+    return result
+
+
+@pytest.mark.parametrize("days", [range(1, 29), [5, 1, 20, 3, 28, 14, 9]])
+def test_indexed_query_matches_scan(tmp_path, days):
+    csv_file = _write_sales(tmp_path / "vendas.csv", days)
+    expected = _run(csv_file, '2025-01-05', '2025-01-09')
+
+    index = date_index.build_index(str(csv_file), block_bytes=256)
+    assert index["ordered"] == (list(days) == sorted(days))
+    assert date_index.load_index(str(csv_file)) == index
+    assert _run(csv_file, '2025-01-05', '2025-01-09') == expected
+
+
+def test_select_ranges_reads_only_window(tmp_path):
+    csv_file = _write_sales(tmp_path / "vendas.csv", range(1, 29))
+    index = date_index.build_index(str(csv_file), block_bytes=256)
+
+    day = date(2025, 1, 10).toordinal()
+    ranges = date_index.select_ranges(index, day, day + 1)
+    read = sum(end - start for start, end in ranges)
+    assert 0 < read < os.path.getsize(csv_file) / 10
+
+
+def test_stale_index_is_ignored(tmp_path):
+    csv_file = _write_sales(tmp_path / "vendas.csv", range(1, 10))
+    date_index.build_index(str(csv_file))
+    _write_sales(csv_file, range(1, 12))
+    assert date_index.load_index(str(csv_file)) is None
+
+
+def test_sort_csv_by_date(tmp_path):
+    csv_file = _write_sales(tmp_path / "vendas.csv", [5, 1, 20, 3])
+    output = tmp_path / "ordenado.csv"
+    date_index.sort_csv_by_date(str(csv_file), str(output), run_rows=7)
+
+    dates = [line.rsplit(',', 1)[1] for line in output.read_text(encoding='utf-8').splitlines()[1:]]
+    assert dates == sorted(dates)
+    assert date_index.build_index(str(output))["ordered"]
+    assert _run(output, None, None)['total_global_revenue'] == _run(csv_file, None, None)['total_global_revenue']
+
+
+def test_cli_index_subcommand(tmp_path, monkeypatch):
+    csv_file = _write_sales(tmp_path / "vendas.csv", [3, 1, 2])
+    monkeypatch.setattr(sys, "argv", ["cli.py", "index", str(csv_file), "--sort"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    assert os.path.exists(tmp_path / "vendas.sorted.csv.vidx")
+
+
+def test_cli_index_missing_file(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["cli.py", "index", "arquivo_inexistente.csv"])
+    with pytest.raises(SystemExit):
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+
+@pytest.mark.parametrize("args", [["./index"], ["--", "index"]])
+def test_cli_file_named_index_is_not_subcommand(tmp_path, monkeypatch, capsys, args):
+    _write_sales(tmp_path / "index", [1, 2])
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["cli.py", "--format", "json", *args])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    assert '"total_global_revenue"' in capsys.readouterr().out
+    assert not os.path.exists(tmp_path / "index.vidx")
+
+
+def test_cli_index_subcommand_ignores_file_named_index(tmp_path, monkeypatch):
+    _write_sales(tmp_path / "index", [1, 2])
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["cli.py", "index", "index"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    assert os.path.exists(tmp_path / "index.vidx")
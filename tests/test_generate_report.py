@@ -36,3 +36,51 @@ def test_generate_report_json_output():
     assert '{' in json_output
     assert '"Camiseta"' in json_output
     assert '"total_global_revenue": 149.8' in json_output
+
+
+REPORT_DATA = {
+    "report_date": "2025-10-04 12:00:00",
+    "filter_dates": {"start": None, "end": None},
+    "total_global_revenue": 349.5,
+    "best_selling_product": {"product": "Camiseta", "quantity": 3},
+    "revenue_per_product": [
+        {"product": "Tênis", "revenue": 199.9},
+        {"product": "Camiseta, P", "revenue": 149.6}
+    ]
+}
+
+
+def test_generate_report_json_matches_dumps(capsys):
+    SalesReport().generate(data=REPORT_DATA, report_format='json')
+    assert capsys.readouterr().out == json.dumps(REPORT_DATA, indent=4, ensure_ascii=False) + "\n"
+
+
+def test_generate_report_ndjson_output(capsys):
+    SalesReport().generate(data=REPORT_DATA, report_format='ndjson')
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0]["type"] == "summary" and lines[0]["total_global_revenue"] == 349.5
+    assert "revenue_per_product" not in lines[0]
+    assert lines[1:] == [
+        {"type": "product", "product": "Tênis", "revenue": 199.9},
+        {"type": "product", "product": "Camiseta, P", "revenue": 149.6},
+    ]
+
+
+def test_generate_report_csv_output_file(tmp_path):
+    output = tmp_path / "relatorio.csv"
+    report = SalesReport()
+    report.set_output(str(output))
+    report.generate(data=REPORT_DATA, report_format='csv')
+    assert output.read_text(encoding='utf-8') == (
+        "produto,receita\nTênis,199.90\n\"Camiseta, P\",149.60\n")
+
+
+def test_generate_report_csv_with_windows(capsys):
+    data = {"report_date": "2025-10-04 12:00:00", "windows": [{"window": "jan", **REPORT_DATA}]}
+    SalesReport().generate(data=data, report_format='csv')
+    assert capsys.readouterr().out.splitlines()[:2] == ["janela,produto,receita", "jan,Tênis,199.90"]
+
+
+def test_generate_report_invalid_format_logs_error(caplog):
+    assert SalesReport().generate(data=REPORT_DATA, report_format='xml') == {}
+    assert "Formato de relatório inválido" in caplog.text
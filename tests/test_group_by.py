@@ -0,0 +1,191 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.group_by import MAX_SPILL_LEVEL, GroupByAggregator, GroupTable
+from reports.sales_report import SalesReport
+from utils.helpers import parse_group_by, parse_memory_size
+
+CSV_CONTENT = (
+    "produto,loja,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,Centro,3,49.9,2025-01-01\n"
+    "Calça,Centro,2,99.9,2025-01-07\n"
+    "Camiseta,Norte,1,49.9,2025-01-08\n"
+    "Tênis,Norte,x,199.9,2025-01-08\n"
+    "Boné,Norte,1,,2025-01-09\n"
+    "Meia,Sul,2,9.9,ontem\n"
+    "Bermuda,Sul\n"
+    "Camiseta,Centro,1,49.9,2025-02-07\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+def _results(path, columns, memory_limit=None, start_date=None, end_date=None, top=None, engine='python'):
+    processor = CSVProcessor()
+    processor.set_file_paths([str(path)])
+    processor.set_date_filters(start_date, end_date)
+    processor.set_engine(engine)
+    processor.set_group_by(columns)
+    processor.set_memory_limit(memory_limit)
+    processor.set_top(top)
+    results = processor.process_data()
+    results.pop('report_date')
+    return results
+
+
+def test_groups_by_columns_and_date_parts(csv_file):
+    results = _results(csv_file, ["loja", "data_venda:mes"])
+
+    assert results['group_by'] == ["loja", "data_venda:mes"]
+    assert results['groups'] == [
+        {"key": {"loja": "Centro", "data_venda:mes": "2025-01"}, "revenue": 349.5, "quantity": 5, "sales": 2},
+        {"key": {"loja": "Centro", "data_venda:mes": "2025-02"}, "revenue": 49.9, "quantity": 1, "sales": 1},
+        {"key": {"loja": "Norte", "data_venda:mes": "2025-01"}, "revenue": 49.9, "quantity": 1, "sales": 1},
+        {"key": {"loja": "Sul", "data_venda:mes": "ontem"}, "revenue": 19.8, "quantity": 2, "sales": 1},
+    ]
+    assert results['total_global_revenue'] == 469.1
+    assert results['rows'] == {
+        "read": 8, "filtered": 1, "rejected": 2,
+        "rejected_by_category": {"invalid_quantity": 1, "missing_fields": 1}}
+    assert 'revenue_per_product' not in results
+
+
+@pytest.mark.parametrize("filters", [{"top": 700}, {"start_date": "2025-01-05", "top": 2}, {"engine": "cents", "top": 700}])
+def test_spilled_groups_match_in_memory(tmp_path, filters):
+    path = tmp_path / "muitos.csv"
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write("produto,loja,quantidade,preco_unitario,data_venda\n")
+        for number in range(3000):
+            handle.write(f"P{number % 700},L{number % 7},{number % 5 + 1},{number % 97}.25,2025-01-{number % 28 + 1:02d}\n")
+
+    in_memory = _results(path, ["produto", "loja", "data_venda:semana"], **filters)
+    spilled = _results(path, ["produto", "loja", "data_venda:semana"], memory_limit=20000, **filters)
+    assert spilled == in_memory
+    assert len(in_memory['groups']) == filters['top']
+
+
+def test_group_table_recursive_spill(tmp_path):
+    table = GroupTable(memory_limit=1, spill_dir=str(tmp_path))
+    for number in range(200):
+        table.add((f"k{number % 50}",), 1.0, 1)
+
+    records = sorted(table.items())
+    assert records == [((f"k{number}",), 4.0, 4, 4) for number in sorted(range(50), key=str)]
+    assert table.spills > 1
+    table.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_group_table_stops_spilling_at_last_level(tmp_path):
+    table = GroupTable(memory_limit=1, spill_dir=str(tmp_path), level=MAX_SPILL_LEVEL)
+    for number in range(10):
+        table.add((f"k{number}",), 1.0, 1)
+
+    assert table.spills == 0 and len(list(table.items())) == 10
+
+
+def test_out_of_range_values_are_rejected(tmp_path):
+    path = tmp_path / "grandes.csv"
+    path.write_text(
+        "produto,quantidade,preco_unitario,data_venda\n"
+        f"Camiseta,{'9' * 400},10.0,2025-01-01\n"
+        f"Camiseta,{(1 << 63) - 1},0.0,2025-01-02\n"
+        "Camiseta,1,10.0,2025-01-03\n", encoding='utf-8')
+
+    for engine in ('python', 'cents'):
+        results = _results(path, ["produto"], engine=engine)
+        assert results['groups'] == [
+            {"key": {"produto": "Camiseta"}, "revenue": 0.0, "quantity": (1 << 63) - 1, "sales": 1}]
+        assert results['rows']['rejected_by_category'] == {"out_of_range": 2}
+
+
+def test_temporary_files_are_removed(csv_file):
+    aggregator = GroupByAggregator(["produto"], memory_limit=1)
+    with open(csv_file, encoding='utf-8', newline='') as handle:
+        aggregator.consume(handle)
+    assert os.path.isdir(aggregator.spill_dir)
+    assert [key for key, *_ in aggregator.groups()][0] == ("Camiseta",)
+    assert not os.path.exists(aggregator.spill_dir)
+
+
+def test_unknown_column_exits(csv_file):
+    with pytest.raises(SystemExit):
+        _results(csv_file, ["categoria"])
+    with pytest.raises(SystemExit):
+        _results(csv_file, ["data_venda:hora"])
+
+    processor = CSVProcessor()
+    processor.set_file_paths([str(csv_file)])
+    processor.set_group_by(["produto"])
+    processor.set_rollup(True)
+    with pytest.raises(SystemExit):
+        processor.process_data()
+    with pytest.raises(ValueError):
+        processor.set_memory_limit(0)
+
+
+def test_memory_limit_requires_top(csv_file, caplog):
+    with pytest.raises(SystemExit):
+        _results(csv_file, ["produto"], memory_limit=1 << 20)
+    assert "--memory-limit requires --top" in caplog.text
+
+
+def test_parse_helpers():
+    assert parse_group_by(" produto, loja ,produto") == ["produto", "loja"]
+    assert parse_memory_size("512M") == 512 << 20
+    assert parse_memory_size("2gb") == 2 << 30
+    assert parse_memory_size("1.5K") == 1536
+    assert parse_memory_size("100000") == 100000
+    for invalid in ("", "0", "dez", "-1M"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_memory_size(invalid)
+    for invalid in ("", "produto,,loja"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_group_by(invalid)
+
+
+def test_report_formats(csv_file):
+    results = _results(csv_file, ["produto", "loja"], engine='cents', top=2)
+    outputs = {}
+    for report_format in ('text', 'ndjson', 'csv'):
+        stream = io.StringIO()
+        report = SalesReport()
+        report.set_output(stream)
+        report.generate(data=json.loads(json.dumps(results)), report_format=report_format)
+        outputs[report_format] = stream.getvalue()
+
+    assert "- Calça | Centro: R$ 199.80 (2 unidades, 1 vendas)" in outputs['text']
+    assert "Produto Mais Vendido" not in outputs['text']
+    lines = [json.loads(line) for line in outputs['ndjson'].splitlines()]
+    assert lines[0]['type'] == 'summary' and 'groups' not in lines[0]
+    assert lines[1] == {"type": "group", "key": {"produto": "Calça", "loja": "Centro"},
+                        "revenue": 199.8, "quantity": 2, "sales": 1}
+    assert list(csv.reader(io.StringIO(outputs['csv']))) == [
+        ["produto", "loja", "receita", "quantidade", "vendas"],
+        ["Calça", "Centro", "199.80", "2", "1"],
+        ["Camiseta", "Centro", "199.60", "4", "2"],
+    ]
+
+
+def test_cli_group_by(csv_file, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", [
+        "cli.py", str(csv_file), "--group-by", "loja", "--memory-limit", "1K", "--top", "3", "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    results = json.loads(capsys.readouterr().out)
+    assert [group['key']['loja'] for group in results['groups']] == ["Centro", "Norte", "Sul"]
+
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--backend", "sqlite", "--group-by", "loja"])
+    with pytest.raises(SystemExit):
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
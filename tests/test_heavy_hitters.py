@@ -0,0 +1,134 @@
+import random
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.heavy_hitters import SpaceSaving
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Camiseta,1,49.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Tênis,1,199.9,2025-01-10\n"
+    "Meia,7,0.1,data-invalida\n"
+    "Calça,1,99.9,2025-02-20\n"
+)
+
+
+def _write_skewed_csv(path, rows=5000, seed=7):
+    rng = random.Random(seed)
+    lines = ["produto,quantidade,preco_unitario,data_venda"]
+    for _ in range(rows):
+        if rng.random() < 0.5:
+            product = f"P{rng.randint(0, 4)}"
+        else:
+            product = f"SKU{rng.randint(0, 2000)}"
+        lines.append(f"{product},{rng.randint(1, 5)},{rng.choice(['9.9', '19.9', '5.0'])},2025-01-0{rng.randint(1, 9)}")
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def _strip(result):
+    result = dict(result)
+    for key in ('report_date', 'files', 'approximation', 'rows'):
+        result.pop(key, None)
+    return result
+
+
+def test_top_uses_first_products_of_full_sort(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    full = CSVProcessor(str(csv_file)).process_data()
+    processor = CSVProcessor(str(csv_file))
+    processor.set_top(2)
+    result = processor.process_data()
+
+    assert result['revenue_per_product'] == full['revenue_per_product'][:2]
+    assert result['best_selling_product'] == full['best_selling_product']
+
+
+def test_heavy_hitters_exact_when_capacity_suffices(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file), "2025-01-01", "2025-01-31")
+    processor.set_heavy_hitters(100)
+    result = processor.process_data()
+
+    expected = CSVProcessor(str(csv_file), "2025-01-01", "2025-01-31").process_data()
+    assert _strip(result) == _strip(expected)
+    assert result['approximation']['best_selling_guaranteed'] is True
+    assert result['files'][0]['errors'] == 1
+
+
+def test_heavy_hitters_bounded_memory_finds_top_products(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    _write_skewed_csv(csv_file)
+
+    exact = CSVProcessor(str(csv_file))
+    exact.set_top(3)
+    expected = exact.process_data()
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_top(3)
+    processor.set_heavy_hitters(50)
+    result = processor.process_data()
+
+    assert len(processor.quantity_per_product) <= 50
+    assert result['total_global_revenue'] == expected['total_global_revenue']
+    assert result['best_selling_product']['product'] == expected['best_selling_product']['product']
+    assert [item['product'] for item in result['revenue_per_product']] == \
+        [item['product'] for item in expected['revenue_per_product']]
+    approximation = result['approximation']
+    for estimated, real in zip(result['revenue_per_product'], expected['revenue_per_product']):
+        assert real['revenue'] <= estimated['revenue'] <= real['revenue'] + approximation['max_revenue_error']
+
+
+def test_space_saving_bounds():
+    summary = SpaceSaving(2)
+    for item, weight in [("a", 5), ("b", 1), ("c", 1), ("a", 2), ("d", 1), ("b", -1)]:
+        summary.add(item, weight)
+
+    assert summary.top(1) == [("a", 7, 0)]
+    assert summary.error_bound() == 4.5
+    assert summary.guaranteed(1) is True
+    assert summary.evictions == 2
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
+
+
+def test_cli_heavy_hitters_text_report(tmp_path, monkeypatch, capsys):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--top", "1", "--heavy-hitters", "2"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    output = capsys.readouterr().out
+    assert "## Modo Aproximado (Space-Saving)" in output
+    assert "Contadores: 2" in output
+
+
+@pytest.mark.parametrize("options", [["--top", "0"], ["--heavy-hitters", "-1"]])
+def test_cli_rejects_invalid_counts(tmp_path, monkeypatch, capsys, options):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), *options])
+    with pytest.raises(SystemExit) as exc:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exc.value.code == 2
+    assert options[0] in capsys.readouterr().err
+
+
+def test_heavy_hitters_conflict_message(tmp_path, caplog):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    processor = CSVProcessor(str(csv_file))
+    processor.set_heavy_hitters(2)
+    processor.set_rollup(True)
+
+    with pytest.raises(SystemExit):
+        processor.process_data()
+    assert "Error: --heavy-hitters cannot be combined with --window or --rollup." in caplog.text
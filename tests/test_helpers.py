@@ -1,3 +1,4 @@
+import pytest
 from utils import helpers
 
 def test_datetime_treat_valid():
@@ -34,3 +35,40 @@ def test_convert_sale_values():
 
 def test_calculate_sales():
     assert helpers.calculate_sales(2, 49.9) == 99.8
+
+def test_make_date_filter_none_without_bounds():
+    assert helpers.make_date_filter(None, None) is None
+
+def test_make_date_filter_iso():
+    start, end = helpers.datetime_treat('2025-01-05', '2025-01-10')
+    in_window = helpers.make_date_filter(start, end)
+    assert in_window('2025-01-05') and in_window('2025-01-10')
+    assert not in_window('2025-01-04') and not in_window('2025-01-11')
+    assert in_window('2025-1-7')
+    assert not in_window('2025-1-4')
+    assert in_window('data-invalida')  # datas inválidas não são filtradas
+
+def test_make_date_filter_custom_format():
+    start, end = helpers.datetime_treat('2025-01-05', None)
+    in_window = helpers.make_date_filter(start, end, '%d/%m/%Y')
+    assert in_window('05/01/2025')
+    assert not in_window('04/01/2025')
+    assert not in_window('04/01/2025')  # decisão em cache
+
+def test_parse_date_cached():
+    assert helpers.parse_date_cached('2025-01-05') is helpers.parse_date_cached('2025-01-05')
+    assert helpers.parse_date_cached('invalid') is None
+
+def test_parse_cents():
+    assert helpers.parse_cents('49.9') == 4990
+    assert helpers.parse_cents('99,90') == 9990
+    assert helpers.parse_cents('0,05') == 5
+    assert helpers.parse_cents('-3') == -300
+    assert helpers.parse_cents('10.000') == 1000
+    for invalid in ('1.234,56', 'abc', '.', '-.', '49.999', '1e3'):
+        with pytest.raises(ValueError):
+            helpers.parse_cents(invalid)
+
+def test_convert_sale_cents():
+    assert helpers.convert_sale_cents('3', '49.9') == (3, 14970)
+    assert helpers.cents_to_reais(14970) == 149.7
@@ -0,0 +1,101 @@
+import json
+import pytest
+from core.csv_processor import CSVProcessor
+
+HEADER = "produto,quantidade,preco_unitario,data_venda\n"
+FIRST = "Camiseta,3,49.9,2025-01-01\nCalça,2,99.9,2025-01-07\n"
+SECOND = "Camiseta,1,49.9,2025-01-08\nTênis,1,199.9,2025-01-10\n"
+
+
+def _run(csv_file, state_file=None, start=None):
+    processor = CSVProcessor(str(csv_file), start_date=start)
+    processor.set_state_file(str(state_file) if state_file else None)
+    result = processor.process_data()
+    result.pop('report_date')
+    result.pop('files')
+    result.pop('rows')
+    return result
+
+
+def test_incremental_reads_only_appended_lines(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    state_file = tmp_path / "estado.json"
+    csv_file.write_text(HEADER + FIRST, encoding='utf-8')
+    assert _run(csv_file, state_file) == _run(csv_file)
+
+    with open(csv_file, 'a', encoding='utf-8') as handle:
+        handle.write(SECOND + "Boné,5,10.0,2025-01-1")  # última linha ainda incompleta
+    result = _run(csv_file, state_file)
+    state = json.loads(state_file.read_text(encoding='utf-8'))
+
+    assert state["offset"] == len((HEADER + FIRST + SECOND).encode('utf-8'))
+    assert result['total_global_revenue'] == round(149.7 + 199.8 + 49.9 + 199.9, 2)
+
+    with open(csv_file, 'a', encoding='utf-8') as handle:
+        handle.write("1\n")
+    assert _run(csv_file, state_file) == _run(csv_file)
+
+
+def test_incremental_rescans_rewritten_file(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    state_file = tmp_path / "estado.json"
+    csv_file.write_text(HEADER + FIRST + SECOND, encoding='utf-8')
+    _run(csv_file, state_file)
+
+    csv_file.write_text(HEADER + SECOND, encoding='utf-8')
+    assert _run(csv_file, state_file) == _run(csv_file)
+
+    csv_file.write_text(HEADER + "Calça,9,99.9,2025-01-07\n" + SECOND, encoding='utf-8')
+    assert _run(csv_file, state_file) == _run(csv_file)
+
+
+def test_incremental_rescans_when_filters_change(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    state_file = tmp_path / "estado.json"
+    csv_file.write_text(HEADER + FIRST + SECOND, encoding='utf-8')
+    _run(csv_file, state_file)
+
+    assert _run(csv_file, state_file, start='2025-01-08') == _run(csv_file, start='2025-01-08')
+
+
+def test_incremental_ignores_invalid_state(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    state_file = tmp_path / "estado.json"
+    csv_file.write_text(HEADER + FIRST, encoding='utf-8')
+    state_file.write_text("{corrompido", encoding='utf-8')
+
+    assert _run(csv_file, state_file) == _run(csv_file)
+
+
+def test_incremental_rejects_many_files(tmp_path, caplog):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(HEADER + FIRST, encoding='utf-8')
+    processor = CSVProcessor()
+    processor.set_file_paths([str(csv_file), str(csv_file)])
+    processor.set_state_file(str(tmp_path / "estado.json"))
+
+    with pytest.raises(SystemExit):
+        processor.process_data()
+    assert "Error: --state-file supports a single input file." in caplog.text
+    assert "Date format" not in caplog.text
+
+
+def test_incremental_rows_cover_whole_file(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    state_file = tmp_path / "estado.json"
+    csv_file.write_text(HEADER + FIRST + "Tênis,x,199.9,2025-01-02\n", encoding='utf-8')
+
+    def rows_and_files(state_file=None):
+        processor = CSVProcessor(str(csv_file), start_date='2025-01-02')
+        processor.set_state_file(str(state_file) if state_file else None)
+        result = processor.process_data()
+        return result['rows'], result['files']
+
+    assert rows_and_files(state_file) == rows_and_files()
+    with open(csv_file, 'a', encoding='utf-8') as handle:
+        handle.write(SECOND + "Boné,y,10.0,2025-01-11\n")
+    rows, files = rows_and_files(state_file)
+
+    assert (rows, files) == rows_and_files()
+    assert rows == {"read": 6, "filtered": 1, "rejected": 2, "rejected_by_category": {"invalid_quantity": 2}}
+    assert files[0]["rows"] == 6 and files[0]["errors"] == 2
@@ -1,4 +1,6 @@
 import pytest
+import os
+import subprocess
 import sys
 from unittest.mock import Mock, patch, MagicMock
 from cli.main import main
@@ -145,3 +147,17 @@ class TestMain:
         # Act & Assert
         with pytest.raises(Exception, match="Erro no SalesReport"):
             main()
+
+    def test_importar_main_nao_carrega_modulos_opcionais(self):
+        """Testa se importar cli.main não carrega os módulos dos modos opcionais nem os de formatos de relatório"""
+        # Arrange
+        optional = ['json', 'hashlib', 'multiprocessing', 'concurrent.futures', 'gzip', 'bz2', 'lzma',
+                    'tempfile', 'core.cache', 'core.date_index', 'core.rollup', 'core.heavy_hitters']
+        code = f"import sys, cli.main; print([name for name in {optional!r} if name in sys.modules])"
+        env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+        # Act
+        result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+
+        # Assert
+        assert result.stdout.strip() == "[]"
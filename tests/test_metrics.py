@@ -0,0 +1,128 @@
+import json
+import os
+import pstats
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.metrics import NULL_METRICS, Metrics
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Camiseta,1,49.9,2025-02-07\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+def _process(csv_file, engine='python', **options):
+    processor = CSVProcessor(str(csv_file), options.pop('start_date', None))
+    processor.set_engine(engine)
+    for name, value in options.items():
+        getattr(processor, f"set_{name}")(value)
+    metrics = Metrics()
+    processor.set_metrics(metrics)
+    result = processor.process_data()
+    return result, metrics.report(processor.rows_read)
+
+
+def test_python_engine_stages(csv_file):
+    result, report = _process(csv_file, start_date="2025-01-05")
+    expected = CSVProcessor(str(csv_file), "2025-01-05").process_data()
+
+    result.pop('report_date'), expected.pop('report_date')
+    assert result == expected
+    assert report['bytes_read'] == os.path.getsize(csv_file)
+    assert report['rows_read'] == 4
+    assert report['rows_per_second'] > 0
+    stages = report['stages']
+    assert list(stages) == ['read', 'tokenize', 'date_parse', 'convert', 'aggregate', 'scan', 'results']
+    assert stages['tokenize']['calls'] == 5
+    assert stages['date_parse']['calls'] == 4
+    assert stages['convert']['calls'] == 3
+    aggregate = stages['aggregate']
+    nested = sum(stages[stage]['total_seconds'] for stage in ('tokenize', 'date_parse', 'convert'))
+    assert aggregate['seconds'] == pytest.approx(aggregate['total_seconds'] - nested, abs=1e-5)
+
+
+@pytest.mark.parametrize("engine, options", [
+    ('mmap', {}),
+    ('python', {'workers': 2}),
+    ('python', {'rollup': True}),
+])
+def test_single_pass_engines_count_bytes(csv_file, engine, options):
+    _, report = _process(csv_file, engine, **options)
+
+    assert report['bytes_read'] == os.path.getsize(csv_file)
+    assert report['stages']['aggregate']['calls'] == 1
+
+
+def test_cache_and_many_files(csv_file, tmp_path):
+    _, report = _process(csv_file, cache_dir=str(tmp_path / "cache"))
+    assert {'read', 'aggregate'} <= set(report['stages'])
+
+    other = tmp_path / "outro.csv"
+    other.write_text(CSV_CONTENT, encoding='utf-8')
+    processor = CSVProcessor()
+    processor.set_file_paths([str(csv_file), str(other)])
+    metrics = Metrics()
+    processor.set_metrics(metrics)
+    processor.process_data()
+    report = metrics.report(processor.rows_read)
+    assert report['bytes_read'] == 2 * os.path.getsize(csv_file)
+    assert report['stages']['tokenize']['calls'] == 10
+
+
+def test_null_metrics_adds_no_wrappers():
+    lines = iter(["a"])
+    assert NULL_METRICS.timed_iter('read', lines) is lines
+    assert NULL_METRICS.timed('convert', int) is int
+    assert NULL_METRICS.reader(sys.stdin) is sys.stdin
+    with NULL_METRICS.stage('scan'):
+        NULL_METRICS.count('bytes_read', 10)
+    assert NULL_METRICS.stages() == {}
+    assert CSVProcessor().metrics is NULL_METRICS
+
+
+def test_cli_metrics_and_profile(csv_file, tmp_path, monkeypatch, capsys):
+    metrics_file, profile_file = tmp_path / "metricas.json", tmp_path / "perfil.prof"
+    monkeypatch.setattr(sys, "argv", [
+        "cli.py", str(csv_file), "--metrics-file", str(metrics_file), "--profile", str(profile_file)])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    assert "RELATÓRIO DE VENDAS" in capsys.readouterr().out
+    metrics = json.loads(metrics_file.read_text(encoding='utf-8'))['metrics']
+    assert metrics['rows_read'] == 4
+    assert metrics['stages']['render']['calls'] == 1
+    assert pstats.Stats(str(profile_file)).total_calls > 0
+
+
+def test_cli_metrics_to_stderr(csv_file, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--format", "json", "--metrics"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)['total_global_revenue'] == 399.4
+    assert json.loads(captured.err)['metrics']['bytes_read'] == os.path.getsize(csv_file)
+
+
+def test_cli_metrics_flag_does_not_take_input_file(csv_file, tmp_path, monkeypatch, capsys):
+    other = tmp_path / "outro.csv"
+    other.write_bytes(csv_file.read_bytes())
+    original = csv_file.read_bytes()
+    monkeypatch.setattr(sys, "argv", ["cli.py", "--metrics", str(csv_file), str(other), "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)['total_global_revenue'] == 798.8
+    assert json.loads(captured.err)['metrics']['rows_read'] == 8
+    assert csv_file.read_bytes() == original
@@ -0,0 +1,67 @@
+import pytest
+from core.csv_processor import CSVProcessor
+from core.date_index import build_index
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\r\n"
+    "Camiseta,3,49.9,2025-01-01\r\n"
+    "\"Calça, jeans\",2,\"99,9\",2025-01-07\r\n"
+    " Camiseta ,1,49.9,2025-01-07\r\n"
+    "Tênis,x,199.9,2025-01-08\r\n"
+    "Boné,1,,2025-01-08\r\n"
+    "\r\n"
+    "Tênis,1,199.9,2025-01-10\r\n"
+    "Meia,7,0.1,data-invalida\r\n"
+    "Calça,1,99.9,2025-01-20"
+)
+
+
+def _run(csv_file, engine, start=None, end=None, workers=1):
+    processor = CSVProcessor(str(csv_file), start_date=start, end_date=end)
+    processor.set_engine(engine)
+    processor.set_workers(workers)
+    result = processor.process_data()
+    result.pop('report_date')
+    return result
+
+
+@pytest.mark.parametrize("start,end", [
+    (None, None),
+    ('2025-01-05', '2025-01-10'),
+    (None, '2025-01-07'),
+])
+def test_mmap_engine_matches_python_engine(tmp_path, start, end):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_bytes(CSV_CONTENT.encode('utf-8'))
+    assert _run(csv_file, 'mmap', start, end) == _run(csv_file, 'python', start, end)
+
+
+def test_mmap_engine_with_workers_and_index(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_bytes(CSV_CONTENT.encode('utf-8'))
+    expected = _run(csv_file, 'python', '2025-01-05', '2025-01-10')
+    expected.pop('files')
+    expected.pop('rows')
+
+    parallel = _run(csv_file, 'mmap', '2025-01-05', '2025-01-10', workers=2)
+    parallel.pop('files')
+    parallel.pop('rows')
+    assert parallel == expected
+
+    build_index(str(csv_file), block_bytes=32)
+    indexed = _run(csv_file, 'mmap', '2025-01-05', '2025-01-10')
+    indexed.pop('files')
+    indexed.pop('rows')
+    assert indexed == expected
+
+
+def test_mmap_engine_short_rows_and_missing_columns(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text("produto,quantidade,preco_unitario,data_venda\nCamiseta,3\n", encoding='utf-8')
+    assert _run(csv_file, 'mmap')['files'][0] == {"file": str(csv_file), "rows": 1, "errors": 1}
+
+    csv_file.write_text("produto,quantidade\nCamiseta,3\n", encoding='utf-8')
+    assert _run(csv_file, 'mmap')['total_global_revenue'] == 0
+
+    csv_file.write_text("", encoding='utf-8')
+    assert _run(csv_file, 'mmap')['revenue_per_product'] == []
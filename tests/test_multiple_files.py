@@ -0,0 +1,73 @@
+import io
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from reports.sales_report import SalesReport
+
+HEADER = "produto,quantidade,preco_unitario,data_venda\n"
+
+
+def _write_stores(tmp_path):
+    (tmp_path / "loja1.csv").write_text(
+        HEADER + "Camiseta,3,49.9,2025-01-01\nCalça,x,99.9,2025-01-07\n", encoding='utf-8')
+    (tmp_path / "loja2.csv").write_text(
+        HEADER + "Calça,2,99.9,2025-01-07\nTênis,1,199.9,2025-01-10\n", encoding='utf-8')
+    (tmp_path / "loja3.csv").write_text(
+        HEADER + "Camiseta,1,49.9,2025-01-08\n", encoding='utf-8')
+
+
+def test_glob_aggregates_all_files(tmp_path):
+    _write_stores(tmp_path)
+    processor = CSVProcessor()
+    processor.set_file_paths([str(tmp_path / "loja*.csv")])
+    result = processor.process_data()
+
+    assert result['total_global_revenue'] == pytest.approx(149.7 + 199.8 + 199.9 + 49.9)
+    assert result['best_selling_product'] == {'product': 'Camiseta', 'quantity': 4}
+    assert [(item['rows'], item['errors']) for item in result['files']] == [(2, 1), (2, 0), (1, 0)]
+
+
+def test_multiple_files_match_concatenation(tmp_path):
+    _write_stores(tmp_path)
+    names = ["loja1.csv", "loja2.csv", "loja3.csv"]
+    combined = tmp_path / "todas.csv"
+    combined.write_text(HEADER + "".join(
+        (tmp_path / name).read_text(encoding='utf-8')[len(HEADER):] for name in names), encoding='utf-8')
+
+    processor = CSVProcessor()
+    processor.set_file_paths([str(tmp_path / name) for name in names])
+    result = processor.process_data()
+    expected = CSVProcessor(str(combined)).process_data()
+
+    assert result['revenue_per_product'] == expected['revenue_per_product']
+    assert result['best_selling_product'] == expected['best_selling_product']
+
+
+def test_stdin_input(monkeypatch):
+    stdin = io.TextIOWrapper(io.BytesIO((HEADER + "Boné,2,10.5,2025-01-01\n").encode('utf-8')))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    processor = CSVProcessor()
+    processor.set_file_paths(["-"])
+    result = processor.process_data()
+
+    assert result['total_global_revenue'] == 21.0
+    assert result['files'] == [{"file": "-", "rows": 1, "errors": 0}]
+
+
+def test_missing_file_among_many_exits(tmp_path):
+    _write_stores(tmp_path)
+    processor = CSVProcessor()
+    processor.set_file_paths([str(tmp_path / "loja1.csv"), str(tmp_path / "nao_existe*.csv")])
+    with pytest.raises(SystemExit):
+        processor.process_data()
+
+
+def test_cli_many_files_text_report(tmp_path, monkeypatch, capsys):
+    _write_stores(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(tmp_path / "loja1.csv"), str(tmp_path / "loja2.csv")])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    output = capsys.readouterr().out
+    assert "Arquivos Processados" in output
+    assert "2 linhas, 1 com erro" in output
@@ -0,0 +1,102 @@
+import pytest
+from core.csv_processor import CSVProcessor
+
+pytest.importorskip("numpy")
+
+from core.numpy_engine import NumpyEngine  # noqa: E402
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,\"99,9\",2025-01-07\n"
+    " Camiseta ,1,49.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Boné,1,,2025-01-08\n"
+    "\n"
+    "Tênis,1,199.9,2025-01-10\n"
+    "Meia,7,0.1,data-invalida\n"
+    "Calça,1,99.9,2025-01-20\n"
+)
+
+
+def _run(csv_file, engine, start=None, end=None):
+    processor = CSVProcessor(str(csv_file), start_date=start, end_date=end)
+    processor.set_engine(engine)
+    result = processor.process_data()
+    result.pop('report_date')
+    return result
+
+
+@pytest.mark.parametrize("start,end", [
+    (None, None),
+    ('2025-01-05', '2025-01-10'),
+    (None, '2025-01-07'),
+])
+def test_numpy_engine_matches_python_engine(tmp_path, start, end):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    assert _run(csv_file, 'numpy', start, end) == _run(csv_file, 'python', start, end)
+
+
+def test_numpy_engine_small_blocks(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    expected = CSVProcessor(str(csv_file))
+    expected.process_csv_rows()
+
+    engine = NumpyEngine(block_size=2)
+    with open(csv_file, newline='', encoding='utf-8') as handle:
+        engine.consume(handle, None, None)
+    revenue, quantity = {}, {}
+    total = engine.store_state(revenue, quantity)
+
+    assert revenue == expected.revenue_per_product
+    assert quantity == expected.quantity_per_product
+    assert total == expected.total_global_revenue
+
+
+def test_numpy_engine_mixes_split_and_csv_blocks(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_bytes((
+        "produto,quantidade,preco_unitario,data_venda\r\n"
+        "Camiseta,3,49.9,2025-01-01\r\n"
+        "\"Calça\nJeans\",2,\"99,9\",2025-01-07\r\n"
+        "Meia,1,2.5,2025-01-08\r\n"
+        "Meia,x,2.5,2025-01-08\r\n"
+        "Boné,1,10,2025-01-09"
+    ).encode('utf-8'))
+    expected = CSVProcessor(str(csv_file))
+    expected.process_csv_rows()
+
+    engine = NumpyEngine(block_size=2)
+    with open(csv_file, newline='', encoding='utf-8') as handle:
+        engine.consume(handle, None, None)
+    revenue, quantity = {}, {}
+    total = engine.store_state(revenue, quantity)
+
+    assert revenue == expected.revenue_per_product
+    assert quantity == expected.quantity_per_product
+    assert total == expected.total_global_revenue
+    assert engine.rows_read == expected.rows_read == 5
+    assert engine.rejects.counts == expected.rejects.counts == {"invalid_quantity": 1}
+
+
+def test_numpy_engine_rejects_sums_out_of_range():
+    engine = NumpyEngine(block_size=2)
+    engine.consume(iter([
+        "produto,quantidade,preco_unitario,data_venda\n",
+        "A,9000000000000000000,1,2025-01-01\n",
+        "A,9000000000000000000,1,2025-01-02\n",
+        "B,1,1,2025-01-02\n",
+    ]), None, None)
+    revenue, quantity = {}, {}
+    engine.store_state(revenue, quantity)
+
+    assert quantity == {"A": 9 * 10 ** 18, "B": 1}
+    assert (engine.rows_accepted, engine.rows_rejected) == (2, 1)
+    assert engine.rejects.counts == {"out_of_range": 1}
+
+
+def test_set_engine_invalid():
+    with pytest.raises(ValueError):
+        CSVProcessor().set_engine('spark')
@@ -0,0 +1,80 @@
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.parallel import iter_range_lines, split_byte_ranges
+from reports.sales_report import SalesReport
+
+
+def _write_sales(tmp_path, rows=500):
+    products = ['Camiseta', 'Calça', 'Tênis', 'Boné', 'Meia']
+    lines = ["produto,quantidade,preco_unitario,data_venda"]
+    for idx in range(rows):
+        lines.append(
+            f"{products[idx % 5]},{idx % 7 + 1},{(idx % 13) * 1.5 + 9.9},2025-01-{idx % 28 + 1:02d}")
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return csv_file
+
+
+def test_split_byte_ranges_aligned_to_lines(tmp_path):
+    csv_file = _write_sales(tmp_path, rows=100)
+    header, ranges = split_byte_ranges(str(csv_file), 7)
+
+    assert header.startswith(b"produto,")
+    assert ranges[0][0] == len(header)
+    assert ranges[-1][1] == csv_file.stat().st_size
+    lines = []
+    for start, end in ranges:
+        lines.extend(iter_range_lines(str(csv_file), start, end))
+    assert len(lines) == 100
+    assert all(line.endswith("\n") for line in lines)
+
+
+def test_split_byte_ranges_header_only(tmp_path):
+    csv_file = tmp_path / "vazio.csv"
+    csv_file.write_text("produto,quantidade,preco_unitario,data_venda\n", encoding='utf-8')
+    _, ranges = split_byte_ranges(str(csv_file), 4)
+    assert ranges == []
+
+
+@pytest.mark.parametrize("start,end", [(None, None), ('2025-01-05', '2025-01-12')])
+def test_parallel_matches_serial(tmp_path, start, end):
+    csv_file = _write_sales(tmp_path)
+
+    serial = CSVProcessor(str(csv_file), start, end).process_data()
+    parallel_processor = CSVProcessor(str(csv_file), start, end)
+    parallel_processor.set_workers(3)
+    parallel = parallel_processor.process_data()
+
+    serial.pop('report_date')
+    parallel.pop('report_date')
+    assert parallel == serial
+
+
+def test_parallel_cents_matches_serial_exactly(tmp_path):
+    csv_file = _write_sales(tmp_path, rows=2000)
+
+    serial_processor = CSVProcessor(str(csv_file))
+    serial_processor.set_engine('cents')
+    serial_processor.process_data()
+    parallel_processor = CSVProcessor(str(csv_file))
+    parallel_processor.set_engine('cents')
+    parallel_processor.set_workers(3)
+    parallel_processor.process_data()
+
+    assert parallel_processor.total_global_revenue == serial_processor.total_global_revenue
+    assert dict(parallel_processor.revenue_per_product) == dict(serial_processor.revenue_per_product)
+
+
+def test_cli_rejects_invalid_workers(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(_write_sales(tmp_path)), "--workers", "0"])
+    with pytest.raises(SystemExit) as exc:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exc.value.code == 2
+    assert "--workers" in capsys.readouterr().err
+
+
+def test_set_workers_invalid():
+    with pytest.raises(ValueError):
+        CSVProcessor().set_workers(0)
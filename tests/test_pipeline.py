@@ -0,0 +1,102 @@
+import gzip
+import io
+import json
+import sys
+import threading
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.pipeline import PipelineStage, decode_lines, pipelined_lines
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\r\n"
+    "Camiseta,3,49.9,2025-01-01\r\n"
+    "\"Calça\nJeans\",2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Camiseta,1,49.9,2025-02-07"
+)
+
+
+class FailingRaw(io.RawIOBase):
+    """Fluxo que entrega alguns bytes e depois falha, como um disco com erro."""
+
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        read = self._data.readinto(buffer)
+        if not read:
+            raise OSError("erro de leitura")
+        return read
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_bytes(CSV_CONTENT.encode('utf-8'))
+    return path
+
+
+def test_decode_lines_keeps_lines_and_characters_whole():
+    data = CSV_CONTENT.encode('utf-8')
+    blocks = [data[start:start + 5] for start in range(0, len(data), 5)]
+
+    lines = [line for batch in decode_lines(blocks) for line in batch]
+    assert lines == list(io.StringIO(CSV_CONTENT, newline=''))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_pipelined_lines_match_file(csv_file, tmp_path, compress):
+    path = csv_file
+    if compress:
+        path = tmp_path / "vendas.csv.gz"
+        path.write_bytes(gzip.compress(CSV_CONTENT.encode('utf-8')))
+
+    with pipelined_lines(open(path, 'rb'), block_size=7, queue_blocks=1, queue_batches=1) as lines:
+        assert list(lines) == list(io.StringIO(CSV_CONTENT, newline=''))
+
+
+def test_errors_reach_the_consumer():
+    with pytest.raises(OSError, match="erro de leitura"):
+        with pipelined_lines(FailingRaw(CSV_CONTENT.encode('utf-8')), block_size=16) as lines:
+            list(lines)
+
+
+def test_early_exit_stops_the_threads(csv_file):
+    before = threading.active_count()
+    with pipelined_lines(open(csv_file, 'rb'), block_size=4, queue_blocks=1, queue_batches=1) as lines:
+        next(lines)
+    assert threading.active_count() == before
+
+    stage = PipelineStage(iter(range(10)), 1, "teste")
+    stage.stop()
+    stage.join()
+    assert list(stage) in ([], [0])
+
+
+def test_processor_pipeline_matches_serial(csv_file, tmp_path):
+    other = tmp_path / "outro.csv"
+    other.write_bytes(CSV_CONTENT.encode('utf-8'))
+    results = []
+    for pipeline in (False, True):
+        processor = CSVProcessor()
+        processor.set_file_paths([str(csv_file), str(other)])
+        processor.set_date_filters("2025-01-01", "2025-01-31")
+        processor.set_pipeline(pipeline)
+        result = processor.process_data()
+        result.pop('report_date')
+        results.append(result)
+
+    assert results[0] == results[1]
+    assert results[1]['rows']['rejected'] == 2
+
+
+def test_cli_pipeline(csv_file, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--pipeline", "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    assert json.loads(capsys.readouterr().out)['total_global_revenue'] == 399.4
@@ -0,0 +1,124 @@
+import logging
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.rejects import RejectedRows, TooManyRejectedRows, error_category, raw_line
+from reports.sales_report import SalesReport
+
+HEADER = "produto,quantidade,preco_unitario,data_venda\n"
+DIRTY_ROWS = (
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,x,99.9,2025-01-07\n"
+    "Tênis,1,abc,2025-01-08\n"
+    "Boné,2,10.0,2024-12-31\n"
+    "Meia,,0.1,2025-01-02\n"
+    "Bermuda,2\n"
+)
+
+
+def _write(tmp_path, rows=DIRTY_ROWS, name="vendas.csv"):
+    csv_file = tmp_path / name
+    csv_file.write_text(HEADER + rows, encoding='utf-8')
+    return csv_file
+
+
+@pytest.mark.parametrize("engine", ['python', 'cents', 'mmap', 'numpy'])
+def test_rows_summary(tmp_path, engine):
+    if engine == 'numpy':
+        pytest.importorskip("numpy")
+    processor = CSVProcessor(str(_write(tmp_path)), start_date="2025-01-01")
+    processor.set_engine(engine)
+    result = processor.process_data()
+
+    assert result['rows'] == {
+        "read": 6,
+        "filtered": 2,
+        "rejected": 3,
+        "rejected_by_category": {"invalid_quantity": 1, "invalid_price": 1, "missing_fields": 1},
+    }
+
+
+def test_rejected_rows_are_sampled_and_quarantined(tmp_path, caplog):
+    csv_file = _write(tmp_path, "Camiseta,x,49.9,2025-01-01\n" * 50 + "\"Calça, P\",1,y,2025-01-01\n")
+    quarantine = tmp_path / "quarentena.csv"
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_quarantine_file(str(quarantine))
+    with caplog.at_level(logging.WARNING):
+        result = processor.process_data()
+
+    assert result['rows']['rejected_by_category'] == {"invalid_quantity": 50, "invalid_price": 1}
+    assert caplog.text.count("Row skipped due to formatting error") == 4
+    assert "51 row(s) skipped due to formatting errors" in caplog.text
+    lines = quarantine.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 51
+    assert lines[0] == "Camiseta,x,49.9,2025-01-01"
+    assert lines[-1] == "\"Calça, P\",1,y,2025-01-01"
+
+
+@pytest.mark.parametrize("engine", ['python', 'cents', 'numpy', 'mmap'])
+def test_quarantine_keeps_lines_unchanged(tmp_path, engine):
+    if engine == 'numpy':
+        pytest.importorskip("numpy")
+    rows = "\"Camiseta\",x,49.9,2025-01-01\nBermuda,2\n\"Calça\nP\",1,y,2025-01-01\nMeia,1,1.0,2025-01-01\n"
+    csv_file = _write(tmp_path, rows)
+    quarantine = tmp_path / "quarentena.csv"
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_engine(engine)
+    processor.set_quarantine_file(str(quarantine))
+    processor.process_data()
+
+    lines = quarantine.read_text(encoding='utf-8').splitlines()
+    assert "\"Camiseta\",x,49.9,2025-01-01" in lines and "Bermuda,2" in lines
+    if engine != 'mmap':
+        # O tokenizador de bytes do mmap não aceita quebras de linha dentro de campos.
+        assert sorted(lines) == sorted(rows.splitlines()[:-1])
+
+
+def test_max_errors_aborts(tmp_path, caplog):
+    processor = CSVProcessor(str(_write(tmp_path)))
+    processor.set_max_errors(1)
+    with pytest.raises(SystemExit) as exc:
+        processor.process_data()
+    assert exc.value.code == 1
+    assert "exceed --max-errors 1" in caplog.text
+
+
+def test_max_errors_with_workers(tmp_path):
+    csv_file = _write(tmp_path, "Camiseta,x,49.9,2025-01-01\n" * 200)
+    processor = CSVProcessor(str(csv_file))
+    processor.set_workers(2)
+    processor.set_max_errors(10)
+    with pytest.raises(SystemExit):
+        processor.process_data()
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_workers(2)
+    processor.set_max_errors(200)
+    assert processor.process_data()['rows']['rejected_by_category'] == {"invalid_quantity": 200}
+
+
+def test_error_category_and_raw_line():
+    assert error_category(KeyError('produto')) == 'missing_column'
+    assert error_category(OverflowError('too large')) == 'out_of_range'
+    assert error_category(ValueError("could not convert string to float: 'y'")) == 'invalid_price'
+    assert error_category(ValueError("unexpected")) == 'invalid_value'
+    assert raw_line({"a": "1", "b": "x,y", None: ["extra"]}) == '1,"x,y",extra'
+    assert raw_line("a,b\r\n") == "a,b"
+
+    rejects = RejectedRows(max_errors=2)
+    rejects.merge({"invalid_price": 2})
+    with pytest.raises(TooManyRejectedRows):
+        rejects.reject("missing fields", ["a"], 'missing_fields')
+
+
+def test_cli_rows_summary_text(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(_write(tmp_path)), "--max-errors", "5"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    output = capsys.readouterr().out
+    assert "## Linhas Processadas" in output
+    assert "Lidas: 6, filtradas: 1, rejeitadas: 3" in output
+    assert "- invalid_quantity: 1" in output
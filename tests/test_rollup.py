@@ -0,0 +1,132 @@
+import sys
+from datetime import date
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.rollup import SalesRollup, bucket_key
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Camiseta,1,49.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Tênis,1,199.9,2025-01-10\n"
+    "Meia,7,0.1,data-invalida\n"
+    "Calça,1,99.9,2025-02-20\n"
+)
+
+RANGES = [
+    (None, None),
+    ("2025-01-01", "2025-01-07"),
+    ("2025-01-08", "2025-01-31"),
+    ("2025-01-11", "2025-02-19"),
+    ("2025-02-20", None),
+    (None, "2024-12-31"),
+]
+
+
+def _strip(result):
+    result = dict(result)
+    for key in ('report_date', 'files', 'window', 'rollup', 'rows'):
+        result.pop(key, None)
+    return result
+
+
+@pytest.mark.parametrize("start,end", RANGES)
+def test_rollup_matches_scan(tmp_path, start, end):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file), start, end)
+    processor.set_rollup(True)
+    result = processor.process_data()
+
+    assert _strip(result) == _strip(CSVProcessor(str(csv_file), start, end).process_data())
+    assert result['files'] == [{"file": str(csv_file), "rows": 7, "errors": 1}]
+
+
+def test_rollup_ties_follow_first_sale_in_range(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(
+        "produto,quantidade,preco_unitario,data_venda\n"
+        "B,1,10.0,2025-01-01\n"
+        "C,1,5.0,ontem\n"
+        "A,2,10.0,2025-01-05\n"
+        "B,2,10.0,2025-01-06\n", encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file), '2025-01-05', None)
+    processor.set_rollup(True)
+    result = processor.process_data()
+
+    assert result['best_selling_product'] == {"product": "A", "quantity": 2}
+    assert [item['product'] for item in result['revenue_per_product']] == ["A", "B", "C"]
+    assert _strip(result) == _strip(CSVProcessor(str(csv_file), '2025-01-05', None).process_data())
+
+
+def test_rollup_series(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file), "2025-01-01", "2025-01-31")
+    processor.set_rollup(True)
+    rollup = processor.process_data()['rollup']
+
+    assert [item['period'] for item in rollup['daily']] == [
+        "2025-01-01", "2025-01-07", "2025-01-10"]
+    assert [item['period'] for item in rollup['weekly']] == ["2024-12-30", "2025-01-06"]
+    assert rollup['monthly'] == [{"period": "2025-01", "revenue": 599.3, "quantity": 7}]
+
+    processor.set_top(2)
+    assert processor.process_data()['rollup']['monthly'] == [{
+        "period": "2025-01",
+        "revenue": 599.3,
+        "quantity": 7,
+        "products": [
+            {"product": "Tênis", "revenue": 199.9, "quantity": 1},
+            {"product": "Calça", "revenue": 199.8, "quantity": 2},
+        ],
+    }]
+
+
+def test_rollup_answers_windows(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    windows = [("jan", "2025-01-01", "2025-01-31"), ("fev", "2025-02-01", "2025-02-28")]
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_windows(windows)
+    processor.set_rollup(True)
+    result = processor.process_data()
+
+    for (_, start, end), window in zip(windows, result['windows']):
+        assert _strip(window) == _strip(CSVProcessor(str(csv_file), start, end).process_data())
+    assert [item['period'] for item in result['rollup']['monthly']] == ["2025-01", "2025-02"]
+
+
+def test_rollup_query_and_buckets():
+    rollup = SalesRollup()
+    rollup.add("A", 2, 10.0, 100)
+    rollup.add("B", 1, 5.0, 102)
+    rollup.add("A", 1, 5.0, 105)
+    rollup.add("C", 3, 3.0, None)
+    rollup.build()
+
+    assert rollup.query(101, 106) == ({"A": 5.0, "B": 5.0, "C": 3.0}, {"A": 1, "B": 1, "C": 3}, 13.0)
+    assert rollup.query(106, 101) == ({"C": 3.0}, {"C": 3}, 3.0)
+    assert bucket_key(date(2025, 1, 8).toordinal(), 'weekly') == "2025-01-06"
+    assert bucket_key(date(2025, 1, 8).toordinal(), 'monthly') == "2025-01"
+    with pytest.raises(ValueError):
+        rollup.series('hourly')
+
+
+def test_cli_rollup_text_report(tmp_path, monkeypatch, capsys):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--rollup"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    output = capsys.readouterr().out
+
+    assert "## Vendas por Mês" in output
+    assert "- 2025-02: R$ 99.90 (1 unidades)" in output
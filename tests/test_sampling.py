@@ -0,0 +1,171 @@
+import argparse
+import gzip
+import io
+import json
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.sampling import MIN_SAMPLED_BLOCKS, BlockSample, BlockSampler, normal_cdf, plan_blocks
+from reports.sales_report import SalesReport
+from utils.helpers import parse_positive_float, parse_sample_fraction
+
+HEADER = "produto,quantidade,preco_unitario,data_venda\n"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(HEADER)
+        for number in range(4000):
+            product = "Camiseta" if number % 3 else f"P{number % 40}"
+            quantity = "x" if number == 7 else number % 4 + 1
+            handle.write(f"{product},{quantity},{number % 50 + 0.5},2025-{number % 12 + 1:02d}-10\n")
+    return path
+
+
+def _results(path, fraction=None, time_budget=None, seed=1, block_size=2000, engine='python', **filters):
+    processor = CSVProcessor()
+    processor.set_file_paths([str(path)])
+    processor.set_date_filters(filters.get('start_date'), filters.get('end_date'))
+    processor.set_engine(engine)
+    processor.set_approx(fraction, time_budget, seed)
+    if processor.approx is not None:
+        processor.approx.block_size = block_size
+    results = processor.process_data()
+    results.pop('report_date')
+    return results
+
+
+def test_plan_blocks_cover_the_files(csv_file):
+    blocks, total_bytes = plan_blocks([str(csv_file), str(csv_file)], 1000)
+
+    assert total_bytes == 2 * (csv_file.stat().st_size - len(HEADER))
+    assert sum(end - start for _, _, start, end in blocks) == total_bytes
+    assert {header for _, header, _, _ in blocks} == {HEADER.encode('utf-8')}
+
+
+@pytest.mark.parametrize("engine", ["python", "cents", "mmap"])
+def test_full_sample_is_exact(csv_file, engine):
+    results = _results(csv_file, fraction=1.0, engine=engine, start_date="2025-03-01")
+    expected = _results(csv_file, engine=engine, start_date="2025-03-01")
+
+    approximation = results.pop('approximation')
+    assert approximation['blocks_sampled'] == approximation['blocks_total']
+    assert approximation['sampled_fraction'] == 1.0
+    low, high = approximation['total_global_revenue_interval']
+    assert low == high == results['total_global_revenue']
+    assert approximation['best_selling_probability'] == 1.0
+    assert results['revenue_per_product'] == expected['revenue_per_product']
+    results.pop('files'), expected.pop('files')
+    assert results == expected
+
+
+def test_estimates_cover_the_true_total(csv_file):
+    exact = _results(csv_file)['total_global_revenue']
+    covered = 0
+    for seed in range(40):
+        results = _results(csv_file, fraction=0.25, seed=seed, block_size=500)
+        approximation = results['approximation']
+        assert approximation['blocks_sampled'] < approximation['blocks_total']
+        low, high = approximation['total_global_revenue_interval']
+        assert low <= results['total_global_revenue'] <= high
+        covered += low <= exact <= high
+        assert results['best_selling_product']['product'] == "Camiseta"
+        assert approximation['best_selling_probability'] > 0.99
+    # Intervalos de 95%: com 40 sorteios, espera-se cerca de 38 coberturas.
+    assert covered >= 32
+
+
+def test_time_budget_stops_after_minimum_blocks(csv_file):
+    results = _results(csv_file, time_budget=1e-9, block_size=500)
+
+    assert results['approximation']['blocks_sampled'] == MIN_SAMPLED_BLOCKS
+    assert results['rows']['read'] < 4000
+
+
+def test_best_seller_probability():
+    sample = BlockSample(4)
+    assert sample.best_seller_probability("A") == 0.0
+    for quantities in ({"A": 10, "B": 9}, {"A": 8, "B": 9}):
+        sample.add({}, quantities, 0.0, 1)
+    assert 0.0 < sample.best_seller_probability("A") < 1.0
+    assert sample.best_seller_probability("B") < 1.0
+    assert normal_cdf(0.0) == 0.5
+
+
+def test_invalid_options(csv_file, tmp_path):
+    for fraction, time_budget in ((0, None), (1.5, None), (None, 0), (float('nan'), None), (None, float('nan'))):
+        with pytest.raises(ValueError):
+            BlockSampler(fraction, time_budget)
+
+    compressed = tmp_path / "vendas.csv.gz"
+    compressed.write_bytes(gzip.compress(csv_file.read_bytes()))
+    with pytest.raises(SystemExit):
+        _results(compressed, fraction=0.5)
+
+    processor = CSVProcessor()
+    processor.set_file_paths([str(csv_file)])
+    processor.set_approx(0.5)
+    processor.set_rollup(True)
+    with pytest.raises(SystemExit):
+        processor.process_data()
+    processor.set_approx(None)
+    assert processor.approx is None
+
+
+def test_parse_helpers():
+    assert parse_sample_fraction("0.25") == 0.25
+    assert parse_sample_fraction("1") == 1.0
+    assert parse_positive_float("2.5") == 2.5
+    for invalid in ("0", "1.5", "-0.1", "nan", "um"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_sample_fraction(invalid)
+    for invalid in ("0", "-1", "nan", "dez"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_positive_float(invalid)
+
+
+def test_conflicting_options_are_reported(csv_file, tmp_path, caplog):
+    compressed = tmp_path / "vendas.csv.gz"
+    compressed.write_bytes(gzip.compress(csv_file.read_bytes()))
+    with pytest.raises(SystemExit):
+        _results(compressed, fraction=0.5)
+    assert "Error: --approx requires uncompressed files" in caplog.text
+    assert "Date format is incorrect" not in caplog.text
+
+
+def test_report_shows_intervals(csv_file):
+    results = _results(csv_file, fraction=0.5, engine='cents', block_size=500)
+    stream = io.StringIO()
+    report = SalesReport()
+    report.set_output(stream)
+    data = report.generate(data=results, report_format='text')
+
+    low, high = data['approximation']['total_global_revenue_interval']
+    assert low < data['total_global_revenue'] < high
+    output = stream.getvalue()
+    assert "## Modo Aproximado (Amostragem de Blocos)" in output
+    assert f"Total Geral: R$ {low:.2f} a R$ {high:.2f} (95% de confiança)" in output
+    camiseta = next(line for line in output.splitlines() if line.startswith("- Camiseta"))
+    assert camiseta.count("R$ ") == 3
+
+
+def test_cli_approx(csv_file, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--approx", "--seed", "3", "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    results = json.loads(capsys.readouterr().out)
+    assert results['approximation']['method'] == "block-sampling"
+    assert results['approximation']['blocks_total'] == 1
+
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), "--backend", "sqlite", "--time-budget", "1"])
+    with pytest.raises(SystemExit):
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    for option in (["--approx", "0"], ["--approx", "2"], ["--time-budget", "-1"]):
+        monkeypatch.setattr(sys, "argv", ["cli.py", str(csv_file), *option])
+        with pytest.raises(SystemExit):
+            CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+        assert "inválid" in capsys.readouterr().err
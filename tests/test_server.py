@@ -0,0 +1,216 @@
+import json
+import os
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.server import SalesStore, make_server, parse_report_query
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Camiseta,1,49.9,2025-02-07\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+def _expected(*paths, start_date=None, end_date=None, top=None):
+    processor = CSVProcessor()
+    processor.set_file_paths([str(path) for path in paths])
+    processor.set_date_filters(start_date, end_date)
+    processor.set_top(top)
+    results = processor.process_data()
+    results.pop('report_date')
+    return results
+
+
+def _query(store, **filters):
+    results = store.query(**filters)
+    results.pop('report_date')
+    return results
+
+
+def _append(path, text):
+    with open(path, 'a', encoding='utf-8') as handle:
+        handle.write(text)
+    # Garante um mtime diferente mesmo em sistemas de arquivos com pouca resolução.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def server(csv_file):
+    store = SalesStore([str(csv_file)])
+    httpd = make_server(store, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d" % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_query_matches_cli_results(csv_file, tmp_path):
+    other = tmp_path / "outro.csv"
+    other.write_text(CSV_CONTENT, encoding='utf-8')
+    store = SalesStore([str(csv_file), str(other)])
+
+    assert _query(store) == _expected(csv_file, other)
+    assert _query(store, start_date="2025-01-05", end_date="2025-01-31", top=1) == \
+        _expected(csv_file, other, start_date="2025-01-05", end_date="2025-01-31", top=1)
+    assert store.version == 1
+
+
+def test_appended_lines_are_read_incrementally(csv_file):
+    store = SalesStore([str(csv_file)])
+    _query(store)
+    offset = store.files[0].offset
+
+    _append(csv_file, "Boné,4,25.0,2025-03-01\nMeia,1,9.9,2025-03-")
+    results = _query(store)
+    assert store.files[0].offset > offset
+    assert results['rows']['read'] == 5
+    assert {"product": "Boné", "revenue": 100.0} in results['revenue_per_product']
+    assert all(item['product'] != "Meia" for item in results['revenue_per_product'])
+
+    _append(csv_file, "02\n")
+    assert _query(store) == _expected(csv_file)
+    assert store.version == 3
+
+
+def test_rewritten_file_is_reloaded(csv_file):
+    store = SalesStore([str(csv_file)])
+    _query(store)
+    columns = store.files[0].columns
+
+    csv_file.write_text("produto,quantidade,preco_unitario,data_venda\nBoné,1,10.0,2025-01-01\n", encoding='utf-8')
+    results = _query(store)
+    assert results['total_global_revenue'] == 10.0
+    assert len(columns) == 3
+
+    os.remove(csv_file)
+    assert _query(store)['total_global_revenue'] == 10.0
+
+
+def test_compressed_file_is_served(csv_file, tmp_path):
+    import gzip
+    compressed = tmp_path / "vendas.csv.gz"
+    compressed.write_bytes(gzip.compress(CSV_CONTENT.encode('utf-8')))
+    store = SalesStore([str(compressed)])
+
+    assert _query(store)['total_global_revenue'] == _expected(csv_file)['total_global_revenue']
+    assert store.files[0].offset is None
+
+
+def test_parse_report_query():
+    assert parse_report_query("data_inicio=2025-01-01&top=3&format=csv") == ("2025-01-01", None, 3, 'csv')
+    assert parse_report_query("") == (None, None, None, 'json')
+    for query in ("data_fim=2025-13-01", "top=0", "top=x", "format=xml"):
+        with pytest.raises(ValueError):
+            parse_report_query(query)
+
+
+def test_http_report(server, csv_file):
+    with urlopen(server + "/report?data_inicio=2025-01-05&top=2") as response:
+        assert response.headers['Content-Type'].startswith('application/json')
+        results = json.loads(response.read())
+    results.pop('report_date')
+    assert results == _expected(csv_file, start_date="2025-01-05", top=2)
+
+    with urlopen(server + "/report?format=csv") as response:
+        assert response.read().decode('utf-8').splitlines()[0] == "produto,receita"
+    with urlopen(server + "/status") as response:
+        assert json.loads(response.read())['files'][0]['rows'] == 4
+
+    for path, status in (("/report?data_inicio=ontem", 400), ("/outro", 404)):
+        with pytest.raises(HTTPError) as error:
+            urlopen(server + path)
+        assert error.value.code == status
+        assert 'error' in json.loads(error.value.read())
+
+
+def test_http_concurrent_clients(server):
+    def fetch(_):
+        with urlopen(server + "/report?format=text") as response:
+            return response.read()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        bodies = list(executor.map(fetch, range(16)))
+    assert b"RELAT\xc3\x93RIO DE VENDAS" in bodies[0]
+    assert all(body.split(b"\n", 3)[3:] == bodies[0].split(b"\n", 3)[3:] for body in bodies)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requer sockets Unix")
+def test_unix_socket(csv_file, tmp_path):
+    socket_path = str(tmp_path / "vendas.sock")
+    httpd = make_server(SalesStore([str(csv_file)]), socket_path=socket_path)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(b"GET /report?format=ndjson HTTP/1.0\r\n\r\n")
+            response = b"".join(iter(lambda: client.recv(65536), b""))
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.0 200")
+    assert json.loads(body.splitlines()[1])["product"] == "Calça"
+
+    # O socket que sobrou da execução anterior é substituído.
+    make_server(SalesStore([str(csv_file)]), socket_path=socket_path).server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="requer sockets Unix")
+def test_socket_path_never_removes_other_files(csv_file, monkeypatch):
+    original = csv_file.read_bytes()
+    with pytest.raises(FileExistsError):
+        make_server(SalesStore([str(csv_file)]), socket_path=str(csv_file))
+    assert csv_file.read_bytes() == original
+
+    monkeypatch.setattr(sys, "argv", ["cli.py", "serve", str(csv_file), "--socket", str(csv_file)])
+    with pytest.raises(SystemExit) as exit_info:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exit_info.value.code == 1
+    assert csv_file.read_bytes() == original
+
+
+def test_cli_file_named_serve_is_not_subcommand(csv_file, monkeypatch, capsys):
+    os.rename(csv_file, csv_file.parent / "serve")
+    monkeypatch.chdir(csv_file.parent)
+    monkeypatch.setattr(sys, "argv", ["cli.py", "--format", "json", "./serve"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    assert json.loads(capsys.readouterr().out)["best_selling_product"]["product"] == "Camiseta"
+
+
+def test_cli_serve(csv_file, monkeypatch):
+    calls = []
+    monkeypatch.setattr("core.server.serve", lambda *args: calls.append(args))
+    monkeypatch.setattr(sys, "argv", ["cli.py", "serve", str(csv_file), "--port", "9000"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    store, host, port, socket_path = calls[0]
+    assert [loaded.path for loaded in store.files] == [str(csv_file)]
+    assert (host, port, socket_path) == ('127.0.0.1', 9000, None)
+
+
+@pytest.mark.parametrize("path", ["-", "inexistente.csv"])
+def test_cli_serve_errors(path, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["cli.py", "serve", path, "--port", "0"])
+    with pytest.raises(SystemExit) as exit_info:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exit_info.value.code == 1
@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.sqlite_reader import SQLiteReader, iter_batches
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Boné,1,,2025-01-09\n"
+    "Meia,2,9.9,ontem\n"
+    "Bermuda,2\n"
+    "Camiseta,1,49.9,2025-02-07\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "vendas.csv"
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+def _results(reader_or_processor, *paths, start_date=None, end_date=None, top=None):
+    reader_or_processor.set_file_paths([str(path) for path in paths])
+    reader_or_processor.set_date_filters(start_date, end_date)
+    reader_or_processor.set_top(top)
+    results = reader_or_processor.process_data()
+    results.pop('report_date')
+    return results
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"start_date": "2025-01-05"},
+    {"end_date": "2025-01-07"},
+    {"start_date": "2025-01-02", "end_date": "2025-01-31", "top": 1},
+])
+def test_matches_csv_processor(csv_file, tmp_path, filters):
+    database = str(tmp_path / "vendas.db")
+    results = _results(SQLiteReader(database), csv_file, **filters)
+    expected = _results(CSVProcessor(), csv_file, **filters)
+
+    assert results == expected
+
+
+def test_ingests_once_and_reloads_changed_files(csv_file, tmp_path, caplog):
+    database = str(tmp_path / "vendas.db")
+    other = tmp_path / "outro.csv"
+    other.write_text(CSV_CONTENT, encoding='utf-8')
+    _results(SQLiteReader(database), csv_file)
+
+    caplog.clear()
+    with caplog.at_level('INFO'):
+        results = _results(SQLiteReader(database), csv_file, other)
+    assert [record.getMessage() for record in caplog.records if 'Loading' in record.getMessage()] == \
+        [f"Loading '{other}' into '{database}'."]
+    assert results == _results(CSVProcessor(), csv_file, other)
+
+    csv_file.write_text("produto,quantidade,preco_unitario,data_venda\nCamiseta,1,10.0,2025-01-01\n", encoding='utf-8')
+    results = _results(SQLiteReader(database), csv_file)
+    assert results['total_global_revenue'] == 10.0
+    assert results['rows'] == {"read": 1, "filtered": 0, "rejected": 0, "rejected_by_category": {}}
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM vendas").fetchone()[0] == 1 + 4
+        plan = " ".join(row[-1] for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(quantidade) FROM vendas WHERE data_venda >= 1"))
+    assert "vendas_data_venda" in plan
+
+
+def test_ties_follow_first_sale_in_range(tmp_path):
+    database = str(tmp_path / "vendas.db")
+    vendas = tmp_path / "vendas.csv"
+    outro = tmp_path / "outro.csv"
+    outro.write_text("produto,quantidade,preco_unitario,data_venda\nD,1,20.0,2025-01-07\n", encoding='utf-8')
+    vendas.write_text("produto,quantidade,preco_unitario,data_venda\nB,1,1.0,2025-01-01\nA,1,1.0,2025-01-01\n",
+                      encoding='utf-8')
+    _results(SQLiteReader(database), vendas, outro)
+
+    # B recebeu id antes de A, e vendas.csv, recarregado depois de outro.csv, fica com
+    # rowids maiores na tabela: nenhum dos dois define a ordem dos empates.
+    vendas.write_text(
+        "produto,quantidade,preco_unitario,data_venda\n"
+        "B,1,10.0,2025-01-01\n"
+        "C,1,5.0,ontem\n"
+        "A,2,10.0,2025-01-05\n"
+        "B,2,10.0,2025-01-06\n", encoding='utf-8')
+    results = _results(SQLiteReader(database), vendas, outro, start_date="2025-01-05")
+
+    assert results['best_selling_product'] == {"product": "A", "quantity": 2}
+    assert [item['product'] for item in results['revenue_per_product']] == ["A", "B", "D", "C"]
+    expected = _results(CSVProcessor(), vendas, outro, start_date="2025-01-05")
+    for key in ('rows', 'files'):
+        results.pop(key), expected.pop(key)
+    assert results == expected
+
+
+def test_cached_file_keeps_rejected_counts(csv_file, tmp_path):
+    database = str(tmp_path / "vendas.db")
+    first = _results(SQLiteReader(database), csv_file)
+    second = _results(SQLiteReader(database), csv_file)
+
+    assert first['rows'] == second['rows']
+    assert second['rows']['rejected_by_category'] == {"invalid_quantity": 1, "missing_fields": 1}
+
+    # As rejeitadas ficam no banco com a data: cada consulta conta apenas as do filtro.
+    in_range = _results(SQLiteReader(database), csv_file, start_date="2025-01-09")
+    assert in_range['rows'] == _results(CSVProcessor(), csv_file, start_date="2025-01-09")['rows']
+    assert in_range['rows']['rejected_by_category'] == {"missing_fields": 1}
+
+
+def test_iter_batches():
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_batches([], 2)) == []
+
+
+def test_errors_exit(csv_file, tmp_path):
+    reader = SQLiteReader(str(tmp_path / "vendas.db"))
+    reader.set_file_paths([str(tmp_path / "inexistente.csv")])
+    with pytest.raises(SystemExit):
+        reader.process_data()
+
+    reader = SQLiteReader(str(tmp_path / "vendas.db"))
+    reader.set_file_paths([str(csv_file)])
+    reader.set_max_errors(1)
+    with pytest.raises(SystemExit):
+        reader.process_data()
+
+    not_a_database = tmp_path / "texto.db"
+    not_a_database.write_text("isto não é um banco", encoding='utf-8')
+    reader = SQLiteReader(str(not_a_database))
+    reader.set_file_paths([str(csv_file)])
+    with pytest.raises(SystemExit):
+        reader.process_data()
+
+    with pytest.raises(ValueError):
+        SQLiteReader().set_top(0)
+    with pytest.raises(ValueError):
+        SQLiteReader().set_database("")
+
+
+def test_cli_sqlite_backend(csv_file, tmp_path, monkeypatch, capsys):
+    database = tmp_path / "vendas.db"
+    monkeypatch.setattr(sys, "argv", [
+        "cli.py", str(csv_file), "--backend", "sqlite", "--database", str(database),
+        "--data_inicio", "2025-01-05", "--format", "json"])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    results = json.loads(capsys.readouterr().out)
+    assert results['total_global_revenue'] == 269.5
+    assert os.path.exists(database)
+
+
+def test_cli_sqlite_backend_rejects_csv_options(csv_file, monkeypatch):
+    monkeypatch.setattr(sys, "argv", [
+        "cli.py", str(csv_file), "--backend", "sqlite", "--rollup", "--workers", "2"])
+    with pytest.raises(SystemExit) as exit_info:
+        CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+    assert exit_info.value.code == 1
@@ -0,0 +1,83 @@
+import argparse
+import json
+import sys
+import pytest
+from cli.parsers import CliParser
+from core.csv_processor import CSVProcessor
+from core.windows import load_windows_file, parse_window_spec
+from reports.sales_report import SalesReport
+
+CSV_CONTENT = (
+    "produto,quantidade,preco_unitario,data_venda\n"
+    "Camiseta,3,49.9,2025-01-01\n"
+    "Calça,2,99.9,2025-01-07\n"
+    "Camiseta,1,49.9,2025-01-07\n"
+    "Tênis,x,199.9,2025-01-08\n"
+    "Tênis,1,199.9,2025-01-10\n"
+    "Meia,7,0.1,data-invalida\n"
+    "Calça,1,99.9,2025-02-20\n"
+)
+
+WINDOWS = [
+    ("semana1", "2025-01-01", "2025-01-07"),
+    ("semana2", "2025-01-08", "2025-01-14"),
+    ("janeiro", "2025-01-01", "2025-01-31"),
+    ("tudo", None, None),
+]
+
+
+def _strip(result):
+    result = dict(result)
+    for key in ('report_date', 'files', 'window', 'rows'):
+        result.pop(key, None)
+    return result
+
+
+def test_windows_match_separate_runs(tmp_path):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+
+    processor = CSVProcessor(str(csv_file))
+    processor.set_windows(WINDOWS)
+    result = processor.process_data()
+
+    assert [window['window'] for window in result['windows']] == [name for name, _, _ in WINDOWS]
+    for (_, start, end), window in zip(WINDOWS, result['windows']):
+        expected = CSVProcessor(str(csv_file), start, end).process_data()
+        assert _strip(window) == _strip(expected)
+        assert window['files'][0]['rows'] == 7
+
+
+def test_parse_window_spec():
+    assert parse_window_spec("jan=2025-01-01:2025-01-31") == ("jan", "2025-01-01", "2025-01-31")
+    assert parse_window_spec("ate=:2025-01-31") == ("ate", None, "2025-01-31")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_window_spec("2025-01-01")
+
+
+def test_load_windows_file(tmp_path):
+    json_file = tmp_path / "janelas.json"
+    json_file.write_text(json.dumps({"jan": {"start": "2025-01-01", "end": "2025-01-31"}}), encoding='utf-8')
+    assert load_windows_file(str(json_file)) == [("jan", "2025-01-01", "2025-01-31")]
+
+    json_file.write_text(json.dumps([{"name": "fev", "start": "2025-02-01"}]), encoding='utf-8')
+    assert load_windows_file(str(json_file)) == [("fev", "2025-02-01", None)]
+
+    csv_file = tmp_path / "janelas.csv"
+    csv_file.write_text("name,start,end\nq1,2025-01-01,2025-03-31\n", encoding='utf-8')
+    assert load_windows_file(str(csv_file)) == [("q1", "2025-01-01", "2025-03-31")]
+
+
+def test_cli_windows(tmp_path, monkeypatch, capsys):
+    csv_file = tmp_path / "vendas.csv"
+    csv_file.write_text(CSV_CONTENT, encoding='utf-8')
+    windows_file = tmp_path / "janelas.csv"
+    windows_file.write_text("name,start,end\nfevereiro,2025-02-01,2025-02-28\n", encoding='utf-8')
+    monkeypatch.setattr(sys, "argv", [
+        "cli.py", str(csv_file), "--window", "semana1=2025-01-01:2025-01-07",
+        "--windows-file", str(windows_file)])
+    CliParser(csv_processor=CSVProcessor(), sales_report=SalesReport()).main()
+
+    output = capsys.readouterr().out
+    assert "# Janela: semana1" in output
+    assert "# Janela: fevereiro" in output